@@ -0,0 +1,135 @@
+"""
+Party cohesion: how united each party votes.
+
+For each party and voting round, cohesion is the share of the party's votes
+in the round that went with its largest bloc (yes, no, abstain or absent). A
+party's score is the average of those shares over the rounds it cast at least
+two votes in, as a percentage. A bill is often voted on several times (2nd
+reading, amendments, 3rd reading), and each round is measured on its own.
+
+The votes are counted with one grouped query into a party x round x vote
+matrix, and the scores are computed from it with NumPy.
+"""
+
+import numpy as np
+from django.db.models import Count
+
+from parliament.models import PoliticalParty, Vote
+
+VOTE_VALUES = [value for value, _ in Vote.VOTE_CHOICES]
+MIN_VOTES = 2
+
+
+def filter_votes(session_id=None, topic_id=None, party_id=None):
+    """Return the votes of a session, topic and/or party (all votes by default)."""
+    votes = Vote.objects.all()
+    if session_id:
+        votes = votes.filter(session_id=session_id)
+    if topic_id:
+        votes = votes.filter(bill__topics__id=topic_id)
+    if party_id:
+        votes = votes.filter(mp__party_id=party_id)
+    return votes
+
+
+def vote_count_matrix(votes):
+    """
+    Count votes per party, voting round and vote value with one grouped query.
+
+    Args:
+        votes: Vote queryset to count
+
+    Returns:
+        tuple: (party ids, counts) where counts[p, r, v] is the number of
+        votes by party_ids[p] in a voting round with value VOTE_VALUES[v]
+    """
+    rows = list(
+        votes.filter(mp__party__isnull=False, voting_round__isnull=False, vote__in=VOTE_VALUES)
+        .values_list('mp__party_id', 'voting_round_id', 'vote')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    if not rows:
+        return [], np.zeros((0, 0, len(VOTE_VALUES)), dtype=np.int64)
+
+    party_column, round_column, vote_column, count_column = zip(*rows)
+    party_ids, party_index = np.unique(party_column, return_inverse=True)
+    round_ids, round_index = np.unique(round_column, return_inverse=True)
+    vote_index = [VOTE_VALUES.index(vote) for vote in vote_column]
+
+    counts = np.zeros((len(party_ids), len(round_ids), len(VOTE_VALUES)), dtype=np.int64)
+    np.add.at(counts, (party_index, round_index, vote_index), count_column)
+    return [int(party_id) for party_id in party_ids], counts
+
+
+def cohesion_totals(votes, min_votes=MIN_VOTES):
+    """
+    Sum each party's largest-bloc shares from a queryset of votes.
+
+    The totals of disjoint sets of votes (e.g. one per session) can be
+    added up and turned into a score with cohesion_score.
+
+    Args:
+        votes: Vote queryset, e.g. from filter_votes
+        min_votes: Rounds in which a party cast fewer votes are left out
+
+    Returns:
+        dict: Party id -> {'share_sum': sum of largest-bloc shares, 'rounds':
+        number of voting rounds measured, 'votes': {vote value: count}};
+        parties without votes are not included
+    """
+    party_ids, counts = vote_count_matrix(votes)
+    if not party_ids:
+        return {}
+
+    totals = counts.sum(axis=2)
+    measured = totals >= min_votes
+    shares = np.where(measured, counts.max(axis=2) / np.maximum(totals, 1), 0.0)
+    share_sums = shares.sum(axis=1)
+    rounds_measured = measured.sum(axis=1)
+    vote_totals = counts.sum(axis=1)
+
+    return {
+        party_id: {
+            'share_sum': float(share_sums[i]),
+            'rounds': int(rounds_measured[i]),
+            'votes': dict(zip(VOTE_VALUES, (int(count) for count in vote_totals[i]))),
+        }
+        for i, party_id in enumerate(party_ids)
+    }
+
+
+def cohesion_score(share_sum, rounds):
+    """Average largest-bloc share as a percentage rounded to 0.1 (0 without rounds)."""
+    return round(share_sum / rounds * 100, 1) if rounds else 0
+
+
+def cohesion_scores(votes, min_votes=MIN_VOTES):
+    """
+    Compute each party's cohesion from a queryset of votes.
+
+    Returns:
+        dict: Party id -> {'cohesion': percentage rounded to 0.1, 'rounds':
+        number of voting rounds measured, 'votes': {vote value: count}};
+        parties without votes are not included
+    """
+    return {
+        party_id: {
+            'cohesion': cohesion_score(totals['share_sum'], totals['rounds']),
+            'rounds': totals['rounds'],
+            'votes': totals['votes'],
+        }
+        for party_id, totals in cohesion_totals(votes, min_votes).items()
+    }
+
+
+def party_cohesion(votes, min_votes=MIN_VOTES):
+    """
+    Return {party name: cohesion} for every party, with 0 for parties that
+    have no measured rounds (the dashboard's partyCohesion format).
+    """
+    scores = cohesion_scores(votes, min_votes)
+    return {
+        name: scores[party_id]['cohesion'] if party_id in scores else 0
+        for party_id, name in PoliticalParty.objects.values_list('pk', 'name')
+    }
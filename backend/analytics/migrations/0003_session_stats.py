@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0017_speech_text_compression'),
+        ('analytics', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_bills', models.IntegerField(default=0)),
+                ('passed_bills', models.IntegerField(default=0)),
+                ('active_members', models.IntegerField(default=0)),
+                ('total_parties', models.IntegerField(default=0)),
+                ('total_votes', models.IntegerField(default=0)),
+                ('processing_days', models.IntegerField(default=0, help_text='Days from introduction to vote, summed over resolved bills')),
+                ('processed_bills', models.IntegerField(default=0)),
+                ('voting_patterns', models.JSONField(default=dict, help_text='Party name -> {vote: count}')),
+                ('bill_pipeline', models.JSONField(default=dict, help_text='Bill status -> count')),
+                ('party_cohesion', models.JSONField(default=dict, help_text='Party id -> {name, share_sum, rounds}')),
+                ('passed_by_date', models.JSONField(default=dict, help_text='Introduction date -> bills passed')),
+                ('topic_counts', models.JSONField(default=dict, help_text='Topic name -> bill count')),
+                ('recent_activity', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('session', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='parliament.parliamentsession')),
+            ],
+            options={
+                'verbose_name_plural': 'Session stats',
+            },
+        ),
+    ]
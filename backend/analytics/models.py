@@ -97,4 +97,38 @@ class DataExport(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.name} ({self.data_type}) - {self.status}" 
\ No newline at end of file
+        return f"{self.name} ({self.data_type}) - {self.status}"
+
+
+class SessionStats(models.Model):
+    """
+    Precomputed dashboard numbers for one parliament session.
+    
+    The row without a session holds the totals over all sessions. Rows are
+    refreshed by analytics.session_stats after each scraper run.
+    """
+    
+    session = models.OneToOneField('parliament.ParliamentSession', on_delete=models.CASCADE, null=True, blank=True, related_name='stats')
+    total_bills = models.IntegerField(default=0)
+    passed_bills = models.IntegerField(default=0)
+    active_members = models.IntegerField(default=0)
+    total_parties = models.IntegerField(default=0)
+    total_votes = models.IntegerField(default=0)
+    
+    # Sum and count behind avgProcessingDays, so sessions can be added up
+    processing_days = models.IntegerField(default=0, help_text="Days from introduction to vote, summed over resolved bills")
+    processed_bills = models.IntegerField(default=0)
+    
+    voting_patterns = models.JSONField(default=dict, help_text="Party name -> {vote: count}")
+    bill_pipeline = models.JSONField(default=dict, help_text="Bill status -> count")
+    party_cohesion = models.JSONField(default=dict, help_text="Party id -> {name, share_sum, rounds}")
+    passed_by_date = models.JSONField(default=dict, help_text="Introduction date -> bills passed")
+    topic_counts = models.JSONField(default=dict, help_text="Topic name -> bill count")
+    recent_activity = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'Session stats'
+    
+    def __str__(self):
+        return f"Stats for {self.session or 'all sessions'}"
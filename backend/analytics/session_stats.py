@@ -0,0 +1,265 @@
+"""
+Per-session dashboard rollups.
+
+The dashboard numbers of each session are computed from the Bill, Vote and
+MP tables once, after a scraper run, and stored in SessionStats. The row for
+all sessions is added up from the session rows, so a run only recomputes the
+sessions it loaded, and a dashboard request is a single keyed read.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+import redis
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from parliament.models import Bill, MP, ParliamentSession, PoliticalParty, Vote
+
+from .cohesion import cohesion_score, cohesion_totals
+from .models import SessionStats
+
+logger = logging.getLogger(__name__)
+
+RECENT_ACTIVITY_SIZE = 5
+TOP_TOPICS = 10
+TIMELINE_DAYS = 365
+
+# How long a queued refresh of a missing row stops others from being queued
+REFRESH_QUEUED_SECONDS = 300
+
+COUNT_FIELDS = ['total_bills', 'passed_bills', 'total_votes', 'processing_days', 'processed_bills']
+
+
+def _grouped(queryset, field):
+    return {row[field]: row['count'] for row in queryset.values(field).annotate(count=Count('id')).order_by()}
+
+
+def _recent_activity(bills, votes):
+    """The latest bills and votes, newest first."""
+    activity = [
+        {'title': title, 'date': introduced.isoformat(), 'type': 'bill'}
+        for title, introduced in bills.filter(introduced_date__isnull=False)
+        .order_by('-introduced_date').values_list('title', 'introduced_date')[:RECENT_ACTIVITY_SIZE]
+    ]
+    activity += [
+        {'title': f"Vote on {title}", 'date': vote_date.isoformat(), 'type': 'vote'}
+        for title, vote_date in votes.filter(vote_date__isnull=False)
+        .order_by('-vote_date').values_list('bill__title', 'vote_date')[:RECENT_ACTIVITY_SIZE]
+    ]
+    activity.sort(key=lambda item: item['date'], reverse=True)
+    return activity[:RECENT_ACTIVITY_SIZE]
+
+
+def compute_session_stats(session_id):
+    """
+    Compute the dashboard numbers of one session from the raw tables.
+
+    Returns:
+        dict: SessionStats field values
+    """
+    bills = Bill.objects.filter(session_id=session_id)
+    votes = Vote.objects.filter(session_id=session_id)
+
+    processing_days = 0
+    processed_bills = 0
+    resolved = bills.filter(vote_date__isnull=False, introduced_date__isnull=False).exclude(status='introduced')
+    for introduced, voted in resolved.values_list('introduced_date', 'vote_date'):
+        days = (voted - introduced).days
+        if days >= 0:
+            processing_days += days
+            processed_bills += 1
+
+    voting_patterns = {}
+    for row in votes.filter(mp__party__isnull=False).values('mp__party__name', 'vote').annotate(count=Count('id')).order_by():
+        party = voting_patterns.setdefault(row['mp__party__name'], {'yes': 0, 'no': 0, 'abstain': 0, 'absent': 0})
+        if row['vote'] in party:
+            party[row['vote']] = row['count']
+
+    totals = cohesion_totals(votes)
+    party_cohesion = {
+        str(party_id): {
+            'name': name,
+            'share_sum': totals.get(party_id, {}).get('share_sum', 0.0),
+            'rounds': totals.get(party_id, {}).get('rounds', 0),
+        }
+        for party_id, name in PoliticalParty.objects.values_list('pk', 'name')
+    }
+
+    passed_by_date = {
+        introduced.isoformat(): count
+        for introduced, count in _grouped(bills.filter(status='passed', introduced_date__isnull=False), 'introduced_date').items()
+    }
+
+    topic_counts = {
+        row['topic__name']: row['count']
+        for row in Bill.topics.through.objects.filter(bill__session_id=session_id)
+        .values('topic__name').annotate(count=Count('id')).order_by()
+    }
+
+    return {
+        'total_bills': bills.count(),
+        'passed_bills': bills.filter(status='passed').count(),
+        'active_members': MP.objects.filter(sessions__id=session_id).distinct().count(),
+        'total_parties': len(party_cohesion),
+        'total_votes': votes.count(),
+        'processing_days': processing_days,
+        'processed_bills': processed_bills,
+        'voting_patterns': voting_patterns,
+        'bill_pipeline': _grouped(bills, 'status'),
+        'party_cohesion': party_cohesion,
+        'passed_by_date': passed_by_date,
+        'topic_counts': topic_counts,
+        'recent_activity': _recent_activity(bills, votes),
+    }
+
+
+def _add_counts(target, counts):
+    for key, count in counts.items():
+        target[key] = target.get(key, 0) + count
+
+
+def refresh_total_stats():
+    """Rebuild the all-sessions row by adding up the session rows."""
+    missing = ParliamentSession.objects.filter(stats__isnull=True).values_list('pk', flat=True)
+    for session_id in missing:
+        SessionStats.objects.update_or_create(session_id=session_id, defaults=compute_session_stats(session_id))
+
+    values = {field: 0 for field in COUNT_FIELDS}
+    voting_patterns = {}
+    bill_pipeline = {}
+    passed_by_date = {}
+    topic_counts = {}
+    recent_activity = []
+    party_cohesion = {
+        str(party_id): {'name': name, 'share_sum': 0.0, 'rounds': 0}
+        for party_id, name in PoliticalParty.objects.values_list('pk', 'name')
+    }
+
+    for stats in SessionStats.objects.filter(session__isnull=False):
+        for field in COUNT_FIELDS:
+            values[field] += getattr(stats, field)
+        for party, counts in stats.voting_patterns.items():
+            _add_counts(voting_patterns.setdefault(party, {}), counts)
+        _add_counts(bill_pipeline, stats.bill_pipeline)
+        _add_counts(passed_by_date, stats.passed_by_date)
+        _add_counts(topic_counts, stats.topic_counts)
+        recent_activity += stats.recent_activity
+        for party_id, totals in stats.party_cohesion.items():
+            if party_id in party_cohesion:
+                party_cohesion[party_id]['share_sum'] += totals['share_sum']
+                party_cohesion[party_id]['rounds'] += totals['rounds']
+
+    recent_activity.sort(key=lambda item: item['date'], reverse=True)
+    values.update({
+        'active_members': MP.objects.filter(active=True).count(),
+        'total_parties': len(party_cohesion),
+        'voting_patterns': voting_patterns,
+        'bill_pipeline': bill_pipeline,
+        'party_cohesion': party_cohesion,
+        'passed_by_date': passed_by_date,
+        'topic_counts': topic_counts,
+        'recent_activity': recent_activity[:RECENT_ACTIVITY_SIZE],
+    })
+    stats, _ = SessionStats.objects.update_or_create(session=None, defaults=values)
+    return stats
+
+
+def refresh_session_stats(session_numbers=None):
+    """
+    Recompute the rows of the given sessions and the all-sessions row.
+
+    Args:
+        session_numbers: Session numbers to recompute (default: every session)
+
+    Returns:
+        int: Number of session rows recomputed
+    """
+    sessions = ParliamentSession.objects.all()
+    if session_numbers is not None:
+        sessions = sessions.filter(session_number__in=session_numbers)
+
+    with transaction.atomic():
+        session_ids = list(sessions.values_list('pk', flat=True))
+        for session_id in session_ids:
+            SessionStats.objects.update_or_create(session_id=session_id, defaults=compute_session_stats(session_id))
+        refresh_total_stats()
+
+    return len(session_ids)
+
+
+def get_session_stats(session_id=None):
+    """
+    Return the SessionStats of a session (or of all sessions if None).
+
+    A request never computes a rollup: a session that has no row yet gets an
+    empty, unsaved row and a refresh is queued on the Celery workers. Its
+    record_run bumps the data version, so cached responses are replaced once
+    the row exists. An unknown session id gets an empty, unsaved row.
+    """
+    stats = SessionStats.objects.filter(session_id=session_id).first()
+    if stats is not None:
+        return stats
+
+    if session_id is None:
+        _queue_refresh(None)
+        return SessionStats()
+
+    session_number = ParliamentSession.objects.filter(pk=session_id).values_list('session_number', flat=True).first()
+    if session_number is not None:
+        _queue_refresh(session_number)
+    return SessionStats(session_id=session_id)
+
+
+def _queue_refresh(session_number):
+    """
+    Queue one refresh of a missing row, however many requests ask for it.
+
+    The dashboard only needs the database: if the cache or the broker is
+    down, the refresh is logged and skipped.
+    """
+    from parliament.tasks import refresh_session_stats_stage
+
+    try:
+        if cache.add(f'session-stats-refresh:{session_number}', True, REFRESH_QUEUED_SECONDS):
+            refresh_session_stats_stage.delay(session_number)
+    except (redis.RedisError, OperationalError):
+        logger.exception("Could not queue a dashboard stats refresh for session %s", session_number)
+
+
+def dashboard_data(stats):
+    """Render a SessionStats row in the dashboard's response format."""
+    timeline_start = (timezone.now() - timedelta(days=TIMELINE_DAYS)).date().isoformat()
+    passed_by_month = {}
+    for introduced, count in stats.passed_by_date.items():
+        if introduced >= timeline_start:
+            passed_by_month[introduced[:7]] = passed_by_month.get(introduced[:7], 0) + count
+    months = sorted(passed_by_month)
+    topics = sorted(stats.topic_counts.items(), key=lambda item: -item[1])[:TOP_TOPICS]
+    parties = sorted(stats.party_cohesion.values(), key=lambda party: party['name'])
+
+    return {
+        'parliamentaryActivity': {
+            'totalBills': stats.total_bills,
+            'passedBills': stats.passed_bills,
+            'activeMembers': stats.active_members,
+            'totalParties': stats.total_parties,
+            'totalVotes': stats.total_votes,
+            'avgProcessingDays': round(stats.processing_days / stats.processed_bills) if stats.processed_bills else 0,
+        },
+        'recentActivity': stats.recent_activity,
+        'votingPatterns': {party: stats.voting_patterns[party] for party in sorted(stats.voting_patterns)},
+        'billPipeline': {status: stats.bill_pipeline[status] for status in sorted(stats.bill_pipeline)},
+        'partyCohesion': {party['name']: cohesion_score(party['share_sum'], party['rounds']) for party in parties},
+        'efficiencyTimeline': {
+            'labels': [datetime.strptime(month, '%Y-%m').strftime('%b %Y') for month in months],
+            'counts': [passed_by_month[month] for month in months],
+        },
+        'topicTrends': {
+            'labels': [name for name, _ in topics],
+            'bill_counts': [count for _, count in topics],
+        },
+    }
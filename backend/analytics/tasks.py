@@ -11,8 +11,9 @@ from datetime import datetime
 from django.core.files.base import ContentFile
 from django.utils import timezone
 from celery import shared_task
+from .cohesion import cohesion_scores, filter_votes
 from .models import DataExport, AnalyticsReport
-from parliament.models import Bill, Vote, MP, Speech
+from parliament.models import Bill, Vote, MP, Speech, PoliticalParty
 
 
 @shared_task
@@ -208,5 +209,17 @@ def generate_topic_trends_report(parameters):
 
 
 def generate_party_comparison_report(parameters):
-    """Generate party comparison report data."""
-    return {} 
\ No newline at end of file
+    """Generate party comparison report data: cohesion and vote totals per party."""
+    votes = filter_votes(
+        session_id=parameters.get('session_id'),
+        topic_id=parameters.get('topic_id'),
+    )
+    scores = cohesion_scores(votes)
+    
+    parties = PoliticalParty.objects.filter(pk__in=scores).values_list('pk', 'name')
+    return {
+        'parties': [
+            {'id': party_id, 'name': name, **scores[party_id]}
+            for party_id, name in parties
+        ]
+    } 
\ No newline at end of file
@@ -6,8 +6,8 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils import timezone
 from django.db.models import Count, Avg, Q, Sum
+import logging
 from .models import (
     DashboardConfiguration,
     SavedSearch,
@@ -20,22 +20,26 @@ from .serializers import (
     AnalyticsReportSerializer,
     DataExportSerializer
 )
+from parliament.caching import CachedResponseMixin
 from parliament.models import (
-    Bill,
     Vote,
     MP,
     Speech,
     PoliticalParty,
     Topic
 )
+from . import cohesion, session_stats
 from .tasks import generate_data_export
 
+logger = logging.getLogger(__name__)
 
-class DashboardConfigurationViewSet(viewsets.ModelViewSet):
+
+class DashboardConfigurationViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for dashboard configurations."""
     
     serializer_class = DashboardConfigurationSerializer
     permission_classes = []  # Allow public access
+    cached_actions = ['list']
     
     def get_queryset(self):
         """Return all dashboard configurations."""
@@ -55,206 +59,14 @@ class DashboardConfigurationViewSet(viewsets.ModelViewSet):
                 except (ValueError, TypeError):
                     session_id = None
             
-            # Base querysets
-            bills_queryset = Bill.objects.all()
-            votes_queryset = Vote.objects.all()
-            speeches_queryset = Speech.objects.all()
-            
-            # Apply session filter if provided
-            if session_id:
-                bills_queryset = bills_queryset.filter(session_id=session_id)
-                votes_queryset = votes_queryset.filter(session_id=session_id)
-                speeches_queryset = speeches_queryset.filter(session_id=session_id)
-            
-            # Get parliamentary activity data
-            total_bills = bills_queryset.count()
-            passed_bills = bills_queryset.filter(status='passed').count()
-            
-            # Count active members - if session is filtered, count MPs in that session
-            if session_id:
-                # Count MPs who are in this session
-                active_members = MP.objects.filter(sessions__id=session_id).distinct().count()
-            else:
-                # If no session filter, count all active MPs
-                active_members = MP.objects.filter(active=True).count()
-            
-            total_parties = PoliticalParty.objects.count()
-            total_votes = votes_queryset.count()
-            
-            # Calculate average bill processing time
-            from django.db.models import F, ExpressionWrapper, fields
-            from datetime import timedelta
-            
-            resolved_bills = bills_queryset.filter(
-                vote_date__isnull=False,
-                introduced_date__isnull=False
-            ).exclude(status='introduced')
-            
-            if resolved_bills.count() > 0:
-                total_days = 0
-                count = 0
-                for bill in resolved_bills:
-                    days_diff = (bill.vote_date - bill.introduced_date).days
-                    if days_diff >= 0:  # Only count positive values
-                        total_days += days_diff
-                        count += 1
-                avg_processing_days = round(total_days / count) if count > 0 else 0
-            else:
-                avg_processing_days = 0
-
-            # Get recent activity
-            recent_bills = bills_queryset.order_by('-introduced_date')[:5]
-            recent_votes = votes_queryset.order_by('-vote_date')[:5]
-
-            # Combine and sort recent activity
-            recent_activity = []
-            
-            for bill in recent_bills:
-                recent_activity.append({
-                    'title': bill.title,
-                    'date': bill.introduced_date.isoformat() if bill.introduced_date else None,
-                    'type': 'bill'
-                })
-            
-            for vote in recent_votes:
-                if vote.bill:  # Only add if there's an associated bill
-                    recent_activity.append({
-                        'title': f"Vote on {vote.bill.title}",
-                        'date': vote.vote_date.isoformat() if vote.vote_date else None,
-                        'type': 'vote'
-                    })
-            
-            # Sort combined activity by date
-            recent_activity = [a for a in recent_activity if a['date']]  # Filter out items with no date
-            recent_activity.sort(key=lambda x: x['date'], reverse=True)
-            recent_activity = recent_activity[:5]  # Keep only 5 most recent
-
-            # Get voting patterns
-            party_votes = votes_queryset.values(
-                'mp__party__name', 
-                'vote'
-            ).filter(
-                mp__party__isnull=False  # Only include votes where MP has a party
-            ).annotate(
-                count=Count('id')
-            ).order_by('mp__party__name', 'vote')
-
-            voting_patterns = {}
-            for vote in party_votes:
-                party = vote['mp__party__name']
-                if party:  # Only process if party name exists
-                    if party not in voting_patterns:
-                        voting_patterns[party] = {'yes': 0, 'no': 0, 'abstain': 0, 'absent': 0}
-                    vote_type = vote['vote']
-                    if vote_type in voting_patterns[party]:
-                        voting_patterns[party][vote_type] = vote['count']
-
-            # Get Bill Progress Pipeline - distribution of bills by status
-            # Only include statuses that have at least one bill
-            bill_statuses = bills_queryset.values('status').annotate(
-                count=Count('id')
-            ).filter(count__gt=0).order_by('status')
-            
-            bill_pipeline = {}
-            for status_item in bill_statuses:
-                bill_pipeline[status_item['status']] = status_item['count']
-
-            # Get Party Cohesion Scores - voting unity per party
-            party_cohesion = {}
-            parties = PoliticalParty.objects.all()
-            
-            for party in parties:
-                # Get all votes by this party's MPs
-                party_votes = votes_queryset.filter(mp__party=party)
-                
-                if party_votes.count() > 0:
-                    # Group votes by bill to calculate cohesion
-                    bills_voted = party_votes.values('bill_id').distinct()
-                    cohesion_scores = []
-                    
-                    for bill in bills_voted:
-                        bill_id = bill['bill_id']
-                        votes_on_bill = party_votes.filter(bill_id=bill_id)
-                        total_votes = votes_on_bill.count()
-                        
-                        if total_votes > 1:  # Need at least 2 votes to measure cohesion
-                            # Count the most common vote
-                            vote_counts = votes_on_bill.values('vote').annotate(
-                                count=Count('id')
-                            ).order_by('-count')
-                            
-                            if vote_counts:
-                                max_agreement = vote_counts[0]['count']
-                                cohesion = (max_agreement / total_votes) * 100
-                                cohesion_scores.append(cohesion)
-                    
-                    # Calculate average cohesion for the party
-                    if cohesion_scores:
-                        party_cohesion[party.name] = round(sum(cohesion_scores) / len(cohesion_scores), 1)
-                    else:
-                        party_cohesion[party.name] = 0
-                else:
-                    party_cohesion[party.name] = 0
-
-            # Get Legislative Efficiency Timeline - bills passed over time
-            from datetime import datetime, timedelta
-            from django.db.models.functions import TruncMonth
-            
-            # Get bills passed in the last 12 months, grouped by month
-            twelve_months_ago = timezone.now() - timedelta(days=365)
-            efficiency_timeline = bills_queryset.filter(
-                status='passed',
-                introduced_date__gte=twelve_months_ago
-            ).annotate(
-                month=TruncMonth('introduced_date')
-            ).values('month').annotate(
-                count=Count('id')
-            ).order_by('month')
-            
-            timeline_data = {
-                'labels': [item['month'].strftime('%b %Y') if item['month'] else 'Unknown' for item in efficiency_timeline],
-                'counts': [item['count'] for item in efficiency_timeline]
-            }
-
-            # Get topic trends (filtered by session if provided)
-            if session_id:
-                top_topics = Topic.objects.filter(
-                    bills__session_id=session_id
-                ).annotate(
-                    bill_count=Count('bills', filter=Q(bills__session_id=session_id))
-                ).filter(bill_count__gt=0).order_by('-bill_count')[:10]
-            else:
-                top_topics = Topic.objects.annotate(
-                    bill_count=Count('bills')
-                ).filter(bill_count__gt=0).order_by('-bill_count')[:10]
-
-            topic_trends = {
-                'labels': [topic.name for topic in top_topics],
-                'bill_counts': [topic.bill_count for topic in top_topics]
-            }
-
-            # Combine all data
-            response_data = {
-                'parliamentaryActivity': {
-                    'totalBills': total_bills,
-                    'passedBills': passed_bills,
-                    'activeMembers': active_members,
-                    'totalParties': total_parties,
-                    'totalVotes': total_votes,
-                    'avgProcessingDays': avg_processing_days
-                },
-                'recentActivity': recent_activity,
-                'votingPatterns': voting_patterns,
-                'billPipeline': bill_pipeline,
-                'partyCohesion': party_cohesion,
-                'efficiencyTimeline': timeline_data,
-                'topicTrends': topic_trends
-            }
+            # Precomputed after each scraper run (analytics.session_stats)
+            stats = session_stats.get_session_stats(session_id)
+            response_data = session_stats.dashboard_data(stats)
 
             return Response(response_data)
 
         except Exception as e:
-            print(f"Error in dashboard data: {str(e)}")  # Add debug print
+            logger.exception("Error in dashboard data")
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -279,7 +91,7 @@ class SavedSearchViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class AnalyticsReportViewSet(viewsets.ModelViewSet):
+class AnalyticsReportViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for analytics reports."""
     
     serializer_class = AnalyticsReportSerializer
@@ -289,9 +101,13 @@ class AnalyticsReportViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'updated_at']
     
+    # Public, read-only analytics actions; their responses are the same for every user
+    public_actions = ['voting_patterns', 'party_cohesion', 'mp_activity', 'topic_trends', 'top_speakers']
+    cached_actions = public_actions
+    
     def get_permissions(self):
         """Allow public access to read-only analytics actions."""
-        if self.action in ['voting_patterns', 'mp_activity', 'topic_trends', 'top_speakers']:
+        if self.action in self.public_actions:
             return []
         return super().get_permissions()
     
@@ -350,6 +166,40 @@ class AnalyticsReportViewSet(viewsets.ModelViewSet):
         
         return Response(result)
     
+    @action(detail=False, methods=['get'])
+    def party_cohesion(self, request):
+        """Generate party cohesion report."""
+        # Get parameters from request
+        topic_id = request.query_params.get('topic_id')
+        session_id_param = request.query_params.get('session_id')
+        
+        # Convert session_id to integer if provided
+        session_id = None
+        if session_id_param:
+            try:
+                session_id = int(session_id_param)
+            except (ValueError, TypeError):
+                session_id = None
+        
+        if topic_id:
+            try:
+                topic_id = int(topic_id)
+            except (ValueError, TypeError):
+                return Response(
+                    {"detail": "topic_id must be an integer."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        votes = cohesion.filter_votes(session_id=session_id, topic_id=topic_id)
+        scores = cohesion.cohesion_scores(votes)
+        
+        # Format data for visualization
+        result = {}
+        for party_id, name in PoliticalParty.objects.filter(pk__in=scores).values_list('pk', 'name'):
+            result[name] = scores[party_id]
+        
+        return Response(result)
+    
     @action(detail=False, methods=['get'])
     def mp_activity(self, request):
         """Generate MP activity report."""
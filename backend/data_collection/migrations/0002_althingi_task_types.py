@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_collection', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='datacollectiontask',
+            name='task_type',
+            field=models.CharField(choices=[('mp_data', 'MP Data'), ('bill_data', 'Bill Data'), ('vote_data', 'Vote Data'), ('speech_data', 'Speech Data'), ('party_data', 'Party Data'), ('interest_data', 'Interest Data'), ('topic_data', 'Topic Data'), ('news_data', 'News Data')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_collection', '0002_althingi_task_types'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datacollectionrun',
+            name='cursor',
+            field=models.JSONField(blank=True, default=dict, help_text='Last item committed by the run, e.g. {"bill": 412}'),
+        ),
+        migrations.AddField(
+            model_name='datacollectionrun',
+            name='session_number',
+            field=models.IntegerField(blank=True, help_text='Parliament session the run covered', null=True),
+        ),
+    ]
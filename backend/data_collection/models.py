@@ -56,6 +56,8 @@ class DataCollectionTask(models.Model):
         ('vote_data', 'Vote Data'),
         ('speech_data', 'Speech Data'),
         ('party_data', 'Party Data'),
+        ('interest_data', 'Interest Data'),
+        ('topic_data', 'Topic Data'),
         ('news_data', 'News Data'),
     ]
     
@@ -115,6 +117,10 @@ class DataCollectionRun(models.Model):
     log = models.TextField(blank=True)
     error_message = models.TextField(blank=True)
     
+    # Resume point for the next run if this one does not complete
+    session_number = models.IntegerField(null=True, blank=True, help_text="Parliament session the run covered")
+    cursor = models.JSONField(default=dict, blank=True, help_text="Last item committed by the run, e.g. {\"bill\": 412}")
+    
     class Meta:
         ordering = ['-start_time']
     
@@ -0,0 +1,126 @@
+"""
+Recording of Alþingi pipeline stages as data collection runs.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.utils import timezone
+
+from parliament.caching import bump_data_version
+
+from .models import DataSource, DataCollectionTask, DataCollectionRun
+
+
+ALTHINGI_SOURCE_NAME = 'Alþingi XML API'
+ALTHINGI_SOURCE_URL = 'https://www.althingi.is/altext/xml/'
+
+# Persist the cursor after this many items
+CHECKPOINT_INTERVAL = 25
+
+
+def get_althingi_task(task_type, name):
+    """Get or create the DataCollectionTask that pipeline runs of `name` are recorded against."""
+    source, _ = DataSource.objects.get_or_create(
+        name=ALTHINGI_SOURCE_NAME,
+        defaults={
+            'source_type': 'api',
+            'url': ALTHINGI_SOURCE_URL,
+            'description': 'Open XML API of the Icelandic parliament',
+        }
+    )
+    task, _ = DataCollectionTask.objects.get_or_create(
+        name=name,
+        source=source,
+        defaults={'task_type': task_type}
+    )
+    return task
+
+
+def resume_cursor(task, session_number=None):
+    """
+    Cursor to resume from: that of the latest run of `task` for the session,
+    unless it completed. Runs killed mid-way stay 'running' and are resumed too.
+    """
+    previous = DataCollectionRun.objects.filter(task=task, session_number=session_number).first()
+    if previous is None or previous.status == 'completed':
+        return {}
+    return previous.cursor or {}
+
+
+class RunCheckpoint:
+    """
+    Durable progress cursor of a pipeline stage.
+
+    Scrapers read where to resume from with `get` and call `advance` after
+    each item is committed. The cursor is written to the DataCollectionRun
+    every `interval` items and again when the run ends.
+    """
+
+    def __init__(self, run, interval=CHECKPOINT_INTERVAL):
+        self.run = run
+        self.interval = interval
+        self._pending = 0
+
+    def get(self, key, default=None):
+        return self.run.cursor.get(key, default)
+
+    def advance(self, key, value):
+        self.run.cursor[key] = value
+        self.run.items_processed += 1
+        self._pending += 1
+        if self._pending >= self.interval:
+            self.save()
+
+    def save(self):
+        DataCollectionRun.objects.filter(pk=self.run.pk).update(
+            cursor=self.run.cursor,
+            items_processed=self.run.items_processed,
+        )
+        self._pending = 0
+
+
+@contextmanager
+def record_run(task_type, name, session_number=None):
+    """
+    Record a pipeline stage as a DataCollectionRun.
+
+    The run is created as running, and marked completed or failed with its
+    end time and duration when the block exits. Exceptions are re-raised.
+
+    If the previous run of the stage for the same session did not complete,
+    the new run starts from its cursor; pass `RunCheckpoint(run)` to the
+    scraper to resume from and advance it.
+    """
+    task = get_althingi_task(task_type, name)
+    run = DataCollectionRun.objects.create(
+        task=task,
+        status='running',
+        start_time=timezone.now(),
+        session_number=session_number,
+        cursor=resume_cursor(task, session_number),
+    )
+    DataCollectionTask.objects.filter(pk=task.pk).update(status='running', last_run=run.start_time)
+
+    started = time.monotonic()
+    label = f'{name} (session {session_number})' if session_number else name
+    if run.cursor:
+        print(f'{label}: resuming from {run.cursor}')
+
+    try:
+        yield run
+    except Exception as e:
+        run.status = 'failed'
+        run.error_message = str(e)
+        raise
+    else:
+        run.status = 'completed'
+    finally:
+        elapsed = time.monotonic() - started
+        run.end_time = timezone.now()
+        run.log = f'{run.log}{label} {run.status} in {elapsed:.1f}s\n'
+        run.save()
+        DataCollectionTask.objects.filter(pk=task.pk).update(status=run.status)
+        print(f'{label} {run.status} in {elapsed:.1f}s')
+        # Even a failed stage may have committed some of its batches
+        bump_data_version()
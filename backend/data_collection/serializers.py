@@ -42,7 +42,7 @@ class DataCollectionRunSerializer(serializers.ModelSerializer):
         model = DataCollectionRun
         fields = ('id', 'task', 'task_name', 'status', 'start_time', 'end_time',
                   'items_processed', 'items_created', 'items_updated', 'items_failed',
-                  'log', 'error_message')
+                  'log', 'error_message', 'session_number', 'cursor')
         read_only_fields = ('id', 'start_time', 'end_time', 'items_processed',
                            'items_created', 'items_updated', 'items_failed',
-                           'log', 'error_message') 
\ No newline at end of file
+                           'log', 'error_message', 'session_number', 'cursor') 
\ No newline at end of file
@@ -0,0 +1,654 @@
+"""
+Shared HTTP client for the Alþingi XML API.
+
+All scrapers fetch through `get`, which provides:
+- keep-alive connection pooling via one shared requests.Session
+- a per-host rate limit, shared across Celery workers through Redis
+- retries with jittered exponential backoff
+- ETag/Last-Modified revalidation backed by an on-disk response cache
+- a compressed, content-addressed archive of every document fetched, which
+  can be replayed instead of the network (ALTHINGI_REPLAY)
+"""
+
+import copy
+import gzip
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import redis
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+
+ALTHINGI_ORIGIN = 'https://www.althingi.is'
+
+# Default politeness settings for althingi.is
+DEFAULT_REQUESTS_PER_SECOND = 8
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30
+
+# Retry settings
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class HostRateLimiter:
+    """
+    Thread-safe rate limiter that spaces out requests per host.
+
+    Each host gets its own schedule, so a burst of requests from a worker
+    pool to althingi.is is smoothed out to at most `rate` requests per second.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Block until a request to the host of `url` is allowed."""
+        if not self.rate:
+            return
+
+        host = urlsplit(url).netloc
+        interval = 1.0 / self.rate
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SharedRateLimiter:
+    """
+    Rate limiter shared by several processes.
+
+    The request schedule lives in shared memory, so worker processes that
+    are handed the same limiter (e.g. through a pool initializer) stay
+    within one global budget of `rate` requests per second to the API.
+    `context` must be the multiprocessing context the pool is created with.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND, context=None):
+        context = context or multiprocessing.get_context()
+        self.rate = rate
+        self._lock = context.Lock()
+        self._next_slot = context.Value('d', 0.0, lock=False)
+
+    def wait(self, url):
+        """Block until the next request is allowed."""
+        if not self.rate:
+            return
+
+        interval = 1.0 / self.rate
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RedisRateLimiter:
+    """
+    Rate limiter shared by every process that uses the same Redis.
+
+    Each host's next free slot is kept in Redis and claimed with one atomic
+    script, so Celery workers running stages in parallel stay within one
+    budget of `rate` requests per second. If Redis cannot be reached the
+    limiter falls back to a per-process HostRateLimiter.
+    """
+
+    KEY_PREFIX = 'althingi:rate:'
+
+    # Claims the host's next slot on the Redis clock; returns the wait in seconds
+    SCRIPT = """
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local slot = math.max(now, tonumber(redis.call('GET', KEYS[1]) or '0'))
+    redis.call('SET', KEYS[1], string.format('%.6f', slot + tonumber(ARGV[1])), 'EX', 60)
+    return string.format('%.6f', slot - now)
+    """
+
+    def __init__(self, client, rate=DEFAULT_REQUESTS_PER_SECOND):
+        self._client = client
+        self._claim = client.register_script(self.SCRIPT)
+        self._fallback = HostRateLimiter(rate)
+
+    @property
+    def rate(self):
+        return self._fallback.rate
+
+    @rate.setter
+    def rate(self, value):
+        self._fallback.rate = value
+
+    def wait(self, url):
+        """Block until a request to the host of `url` is allowed."""
+        if not self.rate:
+            return
+
+        host = urlsplit(url).netloc
+        try:
+            delay = float(self._claim(keys=[self.KEY_PREFIX + host], args=[1.0 / self.rate]))
+        except redis.RedisError:
+            self._fallback.wait(url)
+            return
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AlthingiResponse:
+    """
+    Minimal response object returned by `get`.
+
+    Mirrors the parts of requests.Response the scrapers use. A revalidated
+    response (HTTP 304) is returned as a 200 with the cached body and
+    `not_modified` set, so callers can skip re-processing unchanged XML.
+    """
+
+    def __init__(self, url, status_code, content=b'', headers=None, from_cache=False, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def raise_for_status(self):
+        """Raise requests.HTTPError for 4xx/5xx responses."""
+        if not self.ok:
+            raise requests.HTTPError(f'HTTP {self.status_code} for url: {self.url}', response=self)
+
+
+class ResponseCache:
+    """
+    On-disk cache of response bodies and their validators.
+
+    Each URL is stored as a body file plus a small JSON metadata file with
+    the ETag, Last-Modified, fetch time and body digest. With an archive,
+    bodies are read from it by digest instead, so a document is stored only
+    once. Writes go through a temporary file and os.replace, so concurrent
+    scraper processes can share it.
+    """
+
+    def __init__(self, directory, archive=None):
+        self.directory = directory
+        self.archive = archive
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f'{base}.json', f'{base}.xml'
+
+    def load(self, url):
+        """Return (metadata, body) for `url`, or (None, None) if not cached."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+
+        body = self.archive.read(meta['digest']) if self.archive and meta.get('digest') else None
+        if body is None:
+            try:
+                with open(body_path, 'rb') as f:
+                    body = f.read()
+            except OSError:
+                return None, None
+        return meta, body
+
+    def store(self, url, meta, body=None):
+        """
+        Write metadata (and optionally the body) for `url`.
+
+        With an archive the body is not written; it must already be
+        archived under meta['digest'].
+        """
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        if body is not None and self.archive is None:
+            _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+
+class ResponseArchive:
+    """
+    Compressed, content-addressed archive of fetched documents.
+
+    Bodies are stored once per SHA-256 under objects/ as gzip files. Each URL
+    has an append-only JSON lines index under urls/ recording which body was
+    fetched when, so a URL can be looked up as it was at any point in time.
+    A new index entry is only written when the body changes.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], f'{digest}.xml.gz')
+
+    def _index_path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'urls', key[:2], f'{key}.jsonl')
+
+    def _entries(self, url):
+        try:
+            with open(self._index_path(url), 'r', encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+    def record(self, url, body, digest=None, fetched_at=None):
+        """Archive `body` as the current version of `url` if it differs from the last one."""
+        digest = digest or hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        index_path = self._index_path(url)
+
+        with self._lock:
+            entries = self._entries(url)
+            if entries and entries[-1]['sha256'] == digest:
+                return
+
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                _atomic_write(object_path, gzip.compress(body, mtime=0))
+
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            entry = {'url': url, 'fetched_at': fetched_at or time.time(), 'sha256': digest}
+            with open(index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def read(self, digest):
+        """Return the archived body with SHA-256 `digest`, or None if it is not archived."""
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return gzip.decompress(f.read())
+        except OSError:
+            return None
+
+    def lookup(self, url, at=None):
+        """
+        Return the archived body of `url`, or None if it was never archived.
+
+        Args:
+            at: Unix time; return the version that was current then
+                (default: the latest version)
+        """
+        entries = self._entries(url)
+        if at is not None:
+            entries = [entry for entry in entries if entry['fetched_at'] <= at]
+        if not entries:
+            return None
+        return self.read(entries[-1]['sha256'])
+
+
+def _atomic_write(path, data):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+rate_limiter = HostRateLimiter()
+
+_session = None
+_session_lock = threading.Lock()
+_cache = None
+_archive = None
+_replay = None
+
+
+def get_session():
+    """Return the shared, connection-pooled requests.Session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=DEFAULT_WORKERS * 2)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def get_cache():
+    """
+    Return the response cache, or None if ALTHINGI_CACHE_DIR is not set.
+
+    When the archive is on, the cache reads bodies from it.
+    """
+    global _cache
+    if _cache is None:
+        directory = getattr(settings, 'ALTHINGI_CACHE_DIR', None)
+        if not directory:
+            return None
+        _cache = ResponseCache(directory, get_archive())
+    return _cache
+
+
+def get_archive():
+    """Return the response archive, or None if ALTHINGI_ARCHIVE_DIR is not set."""
+    global _archive
+    if _archive is None:
+        directory = getattr(settings, 'ALTHINGI_ARCHIVE_DIR', None)
+        if not directory:
+            return None
+        _archive = ResponseArchive(directory)
+    return _archive
+
+
+def parse_replay(value):
+    """
+    Parse an ALTHINGI_REPLAY value.
+
+    Returns:
+        None if replay is off, 0 to replay the latest archived versions, or
+        a Unix time to replay the archive as it was at that time
+    """
+    if value in (None, '', False) or str(value).lower() in ('0', 'false', 'no', 'off'):
+        return None
+    if value is True or str(value).lower() in ('1', 'true', 'yes', 'on', 'latest'):
+        return 0
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+def set_replay(value):
+    """Turn replay mode on or off for this process (see parse_replay)."""
+    global _replay
+    _replay = parse_replay(value)
+    if _replay is None:
+        _replay = False
+
+
+def get_replay():
+    """Return the replay setting: None (off), 0 (latest) or a Unix time."""
+    global _replay
+    if _replay is None:
+        _replay = parse_replay(getattr(settings, 'ALTHINGI_REPLAY', None))
+        if _replay is None:
+            _replay = False
+    return None if _replay is False else _replay
+
+
+def set_rate_limit(requests_per_second):
+    """Change the per-host request rate used by `get`."""
+    rate_limiter.rate = requests_per_second
+
+
+def set_rate_limiter(limiter):
+    """Replace the rate limiter used by `get`, e.g. with a SharedRateLimiter or RedisRateLimiter."""
+    global rate_limiter
+    rate_limiter = limiter
+
+
+def _backoff(attempt):
+    """Exponential backoff with jitter for retry number `attempt` (0-based)."""
+    return BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE)
+
+
+def api_url(url):
+    """Point an althingi.is URL at ALTHINGI_API_ROOT (e.g. a local stand-in server), if set."""
+    root = getattr(settings, 'ALTHINGI_API_ROOT', '')
+    if root and url.startswith(ALTHINGI_ORIGIN):
+        return root.rstrip('/') + url[len(ALTHINGI_ORIGIN):]
+    return url
+
+
+def _request(url, headers, timeout):
+    """Perform a GET with retries. Raises requests.RequestException when all attempts fail."""
+    url = api_url(url)
+    session = get_session()
+    for attempt in range(MAX_RETRIES):
+        rate_limiter.wait(url)
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            print(f'  Warning: Request failed ({attempt + 1}/{MAX_RETRIES}): {str(e)}')
+            time.sleep(_backoff(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES - 1:
+            print(f'  Warning: HTTP {response.status_code} from {url} ({attempt + 1}/{MAX_RETRIES})')
+            time.sleep(_backoff(attempt))
+            continue
+
+        return response
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, max_age=0):
+    """
+    GET a document from the Alþingi API.
+
+    Args:
+        url: Document URL
+        timeout: Per-attempt timeout in seconds
+        max_age: Serve a cached copy without any request if it was fetched
+            or revalidated less than this many seconds ago
+
+    In replay mode, documents are read from the archive only and a URL
+    that was never archived returns a 404.
+
+    Returns:
+        AlthingiResponse
+
+    Raises:
+        requests.RequestException: if the request fails after all retries
+    """
+    replay = get_replay()
+    if replay is not None:
+        archive = get_archive()
+        body = archive.lookup(url, replay or None) if archive else None
+        if body is None:
+            return AlthingiResponse(url, 404, b'', from_cache=True)
+        return AlthingiResponse(url, 200, body, from_cache=True)
+
+    cache = get_cache()
+    archive = get_archive()
+    meta, body = cache.load(url) if cache else (None, None)
+
+    if meta is not None and max_age and time.time() - meta.get('fetched_at', 0) < max_age:
+        if archive:
+            archive.record(url, body, meta.get('digest'))
+        return AlthingiResponse(url, 200, body, from_cache=True, not_modified=True)
+
+    headers = {}
+    if meta is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = _request(url, headers, timeout)
+
+    if response.status_code == 304 and meta is not None:
+        meta['fetched_at'] = time.time()
+        cache.store(url, meta)
+        if archive:
+            archive.record(url, body, meta.get('digest'))
+        return AlthingiResponse(url, 200, body, response.headers, from_cache=True, not_modified=True)
+
+    if response.status_code != 200:
+        return AlthingiResponse(url, response.status_code, response.content, response.headers)
+
+    content = response.content
+    digest = hashlib.sha256(content).hexdigest()
+    not_modified = meta is not None and meta.get('digest') == digest
+
+    # Archive first: a cache backed by the archive reads the body from it
+    if archive:
+        archive.record(url, content, digest)
+
+    if cache:
+        cache.store(url, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'digest': digest,
+        }, None if not_modified else content)
+
+    return AlthingiResponse(url, 200, content, response.headers, not_modified=not_modified)
+
+
+def _cursor_path(name):
+    directory = getattr(settings, 'ALTHINGI_STATE_DIR', None)
+    if not directory:
+        return None
+    return os.path.join(directory, f'{name}.json')
+
+
+def read_cursor(name):
+    """Return the value of a local scraper cursor, or None if it is not set."""
+    path = _cursor_path(name)
+    if path is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('value')
+    except (OSError, ValueError):
+        return None
+
+
+def write_cursor(name, value):
+    """Record the value of a local scraper cursor."""
+    path = _cursor_path(name)
+    if path is None:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_write(path, json.dumps({'value': value, 'updated_at': time.time()}).encode('utf-8'))
+
+
+def element_digest(element):
+    """Return a SHA-256 digest of an XML element's serialized form."""
+    return hashlib.sha256(ET.tostring(element, encoding='utf-8')).hexdigest()
+
+
+def source_digest(*parts):
+    """
+    Return a SHA-256 digest of an entity's normalized source documents.
+
+    Elements are canonicalized (C14N with whitespace-only text stripped), so
+    formatting and attribute order do not count as changes. Other values
+    (e.g. ids resolved from other tables) are hashed as strings; None is
+    hashed as empty.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            data = b''
+        elif isinstance(part, ET.Element):
+            data = ET.canonicalize(ET.tostring(part, encoding='unicode'), strip_text=True).encode('utf-8')
+        else:
+            data = str(part).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def iter_elements(source, tag):
+    """
+    Stream the `tag` elements of an XML document one at a time.
+
+    Each element is yielded once it is complete, then detached from its
+    parent and cleared, so the parsed tree never holds more than the
+    element being processed, however large the document is. Keep what you
+    need from an element before asking for the next one.
+
+    Args:
+        source: Document bytes or a binary file object
+        tag: Tag of the elements to yield, e.g. 'ræða'
+
+    Raises:
+        xml.etree.ElementTree.ParseError: on malformed XML
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    parents = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if elem.tag == tag:
+            yield elem
+            if parents:
+                parents[-1].remove(elem)
+            elem.clear()
+
+
+def parse_bill_number(mal_elem):
+    """Get the bill number (málsnúmer) from a <mál> element in a bill list."""
+    bill_number = mal_elem.get('málsnúmer')
+    if bill_number:
+        return int(bill_number)
+
+    # Older lists only carry the number in the HTML link
+    html_elem = mal_elem.find('html')
+    if html_elem is not None and html_elem.text:
+        url_match = re.search(r'mnr=(\d+)', html_elem.text)
+        if url_match:
+            return int(url_match.group(1))
+
+    return None
+
+
+def fetch_bill_index(session_number):
+    """
+    Fetch the session-wide bill list (thingmalalisti).
+
+    Returns:
+        list: (bill_number, <mál> element) tuples sorted by bill number,
+        or None if the list could not be fetched
+    """
+    url = f'https://www.althingi.is/altext/xml/thingmalalisti/?lthing={session_number}'
+
+    bills = {}
+    try:
+        response = get(url)
+        if response.status_code != 200:
+            print(f'Error fetching bill list: HTTP {response.status_code}')
+            return None
+        for mal_elem in iter_elements(response.content, 'mál'):
+            bill_number = parse_bill_number(mal_elem)
+            if bill_number is not None:
+                # Keep a detached copy; iter_elements clears the original
+                bills[bill_number] = copy.deepcopy(mal_elem)
+    except requests.RequestException as e:
+        print(f'Error fetching bill list: {str(e)}')
+        return None
+    except ET.ParseError as e:
+        print(f'Error parsing bill list XML: {str(e)}')
+        return None
+
+    return sorted(bills.items())
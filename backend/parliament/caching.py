@@ -0,0 +1,239 @@
+"""
+Response cache for the read-only API.
+
+GET responses are stored in the shared cache under a key made of the data
+version, the path, the sorted query parameters and the Accept header. The
+data only changes when the scrapers run, so instead of invalidating keys
+one by one the scrapers bump the data version when they finish, and every
+key from before the bump stops being used (and expires on its own).
+
+A cache miss is computed by one worker only: it holds a short lock while
+the others wait for its result instead of running the same queries.
+
+Responses also carry an ETag and Last-Modified derived from the data version
+(or from a view's own stamp, see CachedResponseMixin.get_validators), and a
+conditional GET that matches them gets a 304 without running the view.
+"""
+
+import hashlib
+import time
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import permissions
+
+DATA_VERSION_KEY = 'parliament:data-version'
+
+# Permissions that let anyone read, so a response can be shared between users
+PUBLIC_PERMISSIONS = (permissions.AllowAny, permissions.IsAuthenticatedOrReadOnly)
+DEFAULT_TIMEOUT = 24 * 60 * 60
+
+# Single-flight lock: how long a computing worker may hold it, and how long
+# the others wait for its result before computing the response themselves
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+
+def cache_enabled():
+    return getattr(settings, 'API_CACHE_ENABLED', False)
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def _cache_set(key, value, timeout):
+    try:
+        cache.set(key, value, timeout)
+    except Exception:
+        pass
+
+
+def _cache_add(key, value, timeout):
+    try:
+        return cache.add(key, value, timeout)
+    except Exception:
+        # Without a working cache every worker computes its own response
+        return True
+
+
+def _cache_delete(key):
+    try:
+        cache.delete(key)
+    except Exception:
+        pass
+
+
+def data_version():
+    """Return the current data version stamp."""
+    version = _cache_get(DATA_VERSION_KEY)
+    if version is None:
+        _cache_add(DATA_VERSION_KEY, str(time.time_ns()), None)
+        version = _cache_get(DATA_VERSION_KEY) or '0'
+    return version
+
+
+def bump_data_version():
+    """Start a new data version, so cached responses are recomputed on their next request."""
+    _cache_set(DATA_VERSION_KEY, str(time.time_ns()), None)
+
+
+def response_cache_key(request):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    accept = request.META.get('HTTP_ACCEPT', '')
+    digest = hashlib.sha256(f'{request.path}?{query}|{accept}'.encode('utf-8')).hexdigest()
+    return f'api-response:{data_version()}:{digest}'
+
+
+def make_validators(request, stamp, last_modified):
+    """
+    Return (ETag, Last-Modified timestamp) for a response version.
+
+    Args:
+        stamp: Identifies the version of the resource, e.g. the data version
+        last_modified: Unix timestamp of that version
+    """
+    accept = hashlib.sha256(request.META.get('HTTP_ACCEPT', '').encode('utf-8')).hexdigest()[:8]
+    return f'"{stamp}-{accept}"', int(last_modified)
+
+
+def data_version_validators(request):
+    """ETag and Last-Modified from the data version (a time_ns stamp)."""
+    version = data_version()
+    try:
+        last_modified = int(version) / 1e9
+    except ValueError:
+        last_modified = 0
+    return make_validators(request, f'v{version}', last_modified)
+
+
+def add_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+# Headers of the original response that a cached copy keeps
+CACHED_HEADERS = ['Vary', 'Content-Language']
+
+
+def _from_entry(entry, state):
+    response = HttpResponse(entry['content'], status=entry['status'], content_type=entry['content_type'])
+    for header, value in entry.get('headers', {}).items():
+        response[header] = value
+    response['X-Cache'] = state
+    return response
+
+
+def _compute(key, view):
+    """Render the view's response and cache it if it is a 200 JSON response."""
+    response = view()
+    if hasattr(response, 'render'):
+        response.render()
+    renderer = getattr(response, 'accepted_renderer', None)
+    if response.status_code != 200 or getattr(renderer, 'format', None) != 'json':
+        return response
+
+    entry = {
+        'status': response.status_code,
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'headers': {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+    }
+    _cache_set(key, entry, getattr(settings, 'API_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+    return _from_entry(entry, 'MISS')
+
+
+def cached_response(request, view):
+    """
+    Return the cached response for a GET request, computing it with view() on a miss.
+
+    Only one worker computes a missing key at a time; the others wait up to
+    WAIT_TIMEOUT seconds for its result.
+    """
+    key = response_cache_key(request)
+    entry = _cache_get(key)
+    if entry is not None:
+        return _from_entry(entry, 'HIT')
+
+    lock = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if _cache_add(lock, token, LOCK_TIMEOUT):
+        try:
+            return _compute(key, view)
+        finally:
+            if _cache_get(lock) == token:
+                _cache_delete(lock)
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = _cache_get(key)
+        if entry is not None:
+            return _from_entry(entry, 'HIT')
+        # The worker holding the lock gave up without caching (e.g. an error)
+        if _cache_get(lock) is None:
+            break
+    return _compute(key, view)
+
+
+class CachedResponseMixin:
+    """
+    Serve a viewset's GET responses from the response cache, with validators.
+
+    Set `cached_actions` to the names of the actions to cache; by default
+    every GET action is cached. Only use it for responses that are the same
+    for every user. Actions whose permissions do not let anonymous users
+    read are never shared.
+
+    A request whose If-None-Match or If-Modified-Since matches the validators
+    gets a 304 without running the view. Override get_validators for views
+    that have a cheaper or longer-lived stamp than the data version.
+
+    Both happen in the GET handler, after authentication, permission and
+    throttle checks have passed.
+    """
+
+    cached_actions = None
+
+    def get_validators(self, request, action, **kwargs):
+        """Return (ETag, Last-Modified timestamp) of the response to `request`."""
+        return data_version_validators(request)
+
+    def shares_response(self, request):
+        """Return True if the response to `request` is the same for every user."""
+        if request.method != 'GET':
+            return False
+        if self.cached_actions is not None and self.action not in self.cached_actions:
+            return False
+        return all(isinstance(permission, PUBLIC_PERMISSIONS) for permission in self.get_permissions())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.shares_response(request):
+            handler = self.get
+            self.get = lambda request, *args, **kwargs: self.shared_response(handler, request, *args, **kwargs)
+
+    def shared_response(self, handler, request, *args, **kwargs):
+        """Answer with a 304 or a cached response, running `handler` only when needed."""
+        etag, last_modified = self.get_validators(request, self.action, **kwargs)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return add_validators(not_modified, etag, last_modified)
+
+        def view():
+            return self.finalize_response(request, handler(request, *args, **kwargs), *args, **kwargs)
+
+        response = cached_response(request, view) if cache_enabled() else view()
+        return add_validators(response, etag, last_modified)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0010_mp_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bill',
+            name='index_digest',
+            field=models.CharField(blank=True, help_text="Digest of the bill's entry in the session bill list (thingmalalisti)", max_length=64),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:20
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_speeches(apps, schema_editor):
+    """Keep only the newest row for each (mp, start_time) before adding the constraint."""
+    Speech = apps.get_model('parliament', 'Speech')
+    duplicates = (
+        Speech.objects.filter(start_time__isnull=False)
+        .values('mp_id', 'start_time')
+        .annotate(count=Count('id'), keep_id=Max('id'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        Speech.objects.filter(
+            mp_id=duplicate['mp_id'],
+            start_time=duplicate['start_time'],
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0011_bill_index_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_speeches, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='speech',
+            constraint=models.UniqueConstraint(fields=('mp', 'start_time'), name='unique_speech_mp_start_time'),
+        ),
+    ]
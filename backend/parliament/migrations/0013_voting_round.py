@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0012_speech_unique_mp_start_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VotingRound',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('althingi_voting_id', models.CharField(blank=True, help_text='Voting session ID from Alþingi', max_length=20, null=True, unique=True)),
+                ('vote_date', models.DateField()),
+                ('time', models.DateTimeField(blank=True, null=True)),
+                ('vote_type', models.CharField(blank=True, help_text='What was voted on (e.g. frumvarpið í heild, brtt.)', max_length=255)),
+                ('result', models.CharField(blank=True, help_text='Outcome as reported by Alþingi', max_length=100)),
+                ('yes_count', models.IntegerField(default=0)),
+                ('no_count', models.IntegerField(default=0)),
+                ('abstain_count', models.IntegerField(default=0)),
+                ('absent_count', models.IntegerField(default=0)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='voting_rounds', to='parliament.bill')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='voting_rounds', to='parliament.parliamentsession')),
+            ],
+            options={
+                'ordering': ['-vote_date', '-time'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='vote',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='voting_round',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='parliament.votinground'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:40
+
+from django.db import migrations
+
+
+VOTE_COUNT_FIELDS = {
+    'yes': 'yes_count',
+    'no': 'no_count',
+    'abstain': 'abstain_count',
+    'absent': 'absent_count',
+}
+
+
+def create_voting_rounds(apps, schema_editor):
+    """Create a voting round for each group of existing votes and attach the votes to it."""
+    Vote = apps.get_model('parliament', 'Vote')
+    VotingRound = apps.get_model('parliament', 'VotingRound')
+
+    groups = {}
+    for vote in Vote.objects.all().only('id', 'bill_id', 'session_id', 'vote', 'vote_date', 'althingi_voting_id'):
+        key = (vote.bill_id, vote.althingi_voting_id or f'session_{vote.vote_date}')
+        groups.setdefault(key, []).append(vote)
+
+    for (bill_id, _), votes in groups.items():
+        first = votes[0]
+        counts = {field: 0 for field in VOTE_COUNT_FIELDS.values()}
+        for vote in votes:
+            if vote.vote in VOTE_COUNT_FIELDS:
+                counts[VOTE_COUNT_FIELDS[vote.vote]] += 1
+
+        voting_round = VotingRound.objects.create(
+            bill_id=bill_id,
+            session_id=first.session_id,
+            althingi_voting_id=first.althingi_voting_id,
+            vote_date=first.vote_date,
+            **counts
+        )
+        Vote.objects.filter(id__in=[vote.id for vote in votes]).update(voting_round=voting_round)
+
+
+# Kept apart from the schema changes in 0013 and 0015: on PostgreSQL the updates
+# leave deferred foreign key checks pending, and an ALTER TABLE on parliament_vote
+# in the same transaction would fail.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0013_voting_round'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_voting_rounds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0014_voting_round_data'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='vote',
+            unique_together={('voting_round', 'mp')},
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0015_vote_unique_voting_round'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bill',
+            name='source_digest',
+            field=models.CharField(blank=True, help_text='Digest of the normalized bill and þingskjal XML it was last saved from', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='mp',
+            name='source_digest',
+            field=models.CharField(blank=True, help_text='Digest of the normalized MP XML documents it was last saved from', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='mpinterest',
+            name='source_digest',
+            field=models.CharField(blank=True, help_text='Digest of the normalized interests XML it was last saved from', max_length=64),
+        ),
+    ]
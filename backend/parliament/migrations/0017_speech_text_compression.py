@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+def set_text_compression(method):
+    def apply(apps, schema_editor):
+        """Compress Speech.text with `method` (PostgreSQL 14+ only; other databases are left as they are)."""
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql' or connection.pg_version < 140000:
+            return
+        # lz4 is a build option of the server
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT %s = ANY(enumvals) FROM pg_settings WHERE name = 'default_toast_compression'",
+                [method],
+            )
+            row = cursor.fetchone()
+        if not row or not row[0]:
+            return
+        Speech = apps.get_model('parliament', 'Speech')
+        schema_editor.execute(
+            'ALTER TABLE %s ALTER COLUMN %s SET COMPRESSION %s' % (
+                schema_editor.quote_name(Speech._meta.db_table),
+                schema_editor.quote_name(Speech._meta.get_field('text').column),
+                method,
+            )
+        )
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parliament', '0016_source_digest'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='speech',
+            name='text',
+            field=models.TextField(blank=True, help_text='Plain-text transcript, filled in by fetch_transcripts.py'),
+        ),
+        migrations.RunPython(set_text_compression('lz4'), set_text_compression('pglz')),
+    ]
@@ -99,6 +99,7 @@ class MP(models.Model):
     total_speaking_time = models.IntegerField(default=0, help_text="Total speaking time in seconds")
     
     image_url = models.URLField(blank=True, help_text="URL to MP's image on Althingi website")
+    source_digest = models.CharField(max_length=64, blank=True, help_text="Digest of the normalized MP XML documents it was last saved from")
     
     class Meta:
         ordering = ['last_name', 'first_name']
@@ -144,6 +145,7 @@ class MPInterest(models.Model):
     
     # The URL for the interests page
     source_url = models.URLField(blank=True, help_text="URL to the interests declaration on the Althingi website")
+    source_digest = models.CharField(max_length=64, blank=True, help_text="Digest of the normalized interests XML it was last saved from")
     
     class Meta:
         verbose_name = "MP's Interest Declaration"
@@ -195,6 +197,10 @@ class Bill(models.Model):
     topics = models.ManyToManyField(Topic, related_name='bills', blank=True)
     sponsors = models.ManyToManyField('MP', related_name='sponsored_bills', blank=True)
     cosponsors = models.ManyToManyField('MP', related_name='cosponsored_bills', blank=True)
+    index_digest = models.CharField(max_length=64, blank=True, help_text="Digest of the bill's entry in the session bill list (thingmalalisti)")
+    source_digest = models.CharField(max_length=64, blank=True, help_text="Digest of the normalized bill and þingskjal XML it was last saved from")
+    
+    FINAL_STATUSES = ('passed', 'rejected', 'withdrawn', 'question_answered')
     
     class Meta:
         unique_together = ('althingi_id', 'session')
@@ -230,6 +236,34 @@ class Amendment(models.Model):
         return f"Amendment to {self.bill.title}"
 
 
+class VotingRound(models.Model):
+    """Model for a single voting round (atkvæðagreiðsla) on a bill."""
+    
+    bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name='voting_rounds')
+    session = models.ForeignKey(ParliamentSession, on_delete=models.CASCADE, related_name='voting_rounds')
+    althingi_voting_id = models.CharField(max_length=20, unique=True, null=True, blank=True, help_text="Voting session ID from Alþingi")
+    vote_date = models.DateField()
+    time = models.DateTimeField(null=True, blank=True)
+    vote_type = models.CharField(max_length=255, blank=True, help_text="What was voted on (e.g. frumvarpið í heild, brtt.)")
+    result = models.CharField(max_length=100, blank=True, help_text="Outcome as reported by Alþingi")
+    
+    # Tallies, stored so bill pages don't have to count individual votes
+    yes_count = models.IntegerField(default=0)
+    no_count = models.IntegerField(default=0)
+    abstain_count = models.IntegerField(default=0)
+    absent_count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-vote_date', '-time']
+    
+    def __str__(self):
+        return f"Voting round {self.althingi_voting_id} on {self.bill.title}"
+    
+    @property
+    def total_count(self):
+        return self.yes_count + self.no_count + self.abstain_count + self.absent_count
+
+
 class Vote(models.Model):
     """Model for parliamentary votes."""
     
@@ -245,11 +279,12 @@ class Vote(models.Model):
     vote = models.CharField(max_length=10, choices=VOTE_CHOICES)
     vote_date = models.DateField()
     session = models.ForeignKey(ParliamentSession, on_delete=models.CASCADE, related_name='votes')
+    voting_round = models.ForeignKey(VotingRound, on_delete=models.CASCADE, related_name='votes', null=True, blank=True)
     althingi_voting_id = models.CharField(max_length=20, null=True, blank=True, help_text="Voting session ID from Alþingi (nnafnak)")
     
     class Meta:
         ordering = ['-vote_date']
-        unique_together = ('bill', 'mp')
+        unique_together = ('voting_round', 'mp')
     
     def __str__(self):
         return f"{self.mp} voted {self.vote} on {self.bill.title}"
@@ -263,7 +298,8 @@ class Speech(models.Model):
     session = models.ForeignKey(ParliamentSession, on_delete=models.CASCADE, related_name='speeches')
     date = models.DateField()
     title = models.CharField(max_length=255, blank=True)
-    text = models.TextField(blank=True)
+    # Large; stored lz4-compressed on PostgreSQL and deferred by the API
+    text = models.TextField(blank=True, help_text="Plain-text transcript, filled in by fetch_transcripts.py")
     
     # New fields for Alþingi data
     mp_althingi_id = models.IntegerField(null=True, blank=True, help_text="MP ID from the Alþingi database")
@@ -287,6 +323,9 @@ class Speech(models.Model):
     class Meta:
         ordering = ['-date', '-start_time']
         verbose_name_plural = 'Speeches'
+        constraints = [
+            models.UniqueConstraint(fields=['mp', 'start_time'], name='unique_speech_mp_start_time'),
+        ]
     
     def __str__(self):
         return f"{self.mp} speech on {self.date} ({self.speech_type})" 
\ No newline at end of file
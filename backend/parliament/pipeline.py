@@ -0,0 +1,232 @@
+"""
+Producer/consumer ingest pipeline for the scrapers.
+
+    items -> fetch (thread pool) -> [queue] -> parse (threads) -> [queue] -> write (caller)
+
+Fetch workers do the network I/O and hand raw documents to the parse
+workers through a bounded queue, so downloads keep going while documents
+are parsed and written. Results reach the writer in input order and are
+written in batches from the calling thread, which keeps all database work
+on one connection. Each stage records its item latency and the depth of
+its input queue, so a run shows where the bottleneck is.
+"""
+
+import heapq
+import queue
+import threading
+import time
+
+from .althingi import DEFAULT_WORKERS
+
+DEFAULT_PARSE_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_BATCH_SIZE = 25
+
+# Marks the end of a queue
+_DONE = object()
+
+
+class StageStats:
+    """Item count, latency and input queue depth of one pipeline stage."""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.max_latency = 0.0
+        self.queue_samples = 0
+        self.queue_total = 0
+        self.queue_max = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.items += 1
+            self.errors += int(error)
+            self.busy += seconds
+            self.max_latency = max(self.max_latency, seconds)
+
+    def sample_queue(self, depth):
+        with self._lock:
+            self.queue_samples += 1
+            self.queue_total += depth
+            self.queue_max = max(self.queue_max, depth)
+
+    @property
+    def avg_latency(self):
+        return self.busy / self.items if self.items else 0.0
+
+    @property
+    def avg_queue(self):
+        return self.queue_total / self.queue_samples if self.queue_samples else 0.0
+
+    def utilization(self, wall):
+        """Share of the run the stage's workers were busy (1.0 = always)."""
+        return self.busy / (wall * self.workers) if wall else 0.0
+
+
+class Pipeline:
+    """
+    Run items through fetch, parse and write stages.
+
+    Args:
+        name: Label for the report
+        fetch: fetch(item) -> raw value; runs in `fetch_workers` threads
+        parse: parse(item, raw) -> parsed value; runs in `parse_workers` threads
+        write: write(batch) with a list of (item, parsed) tuples in input
+            order; runs in the calling thread
+        queue_size: Bound of each queue between stages
+        batch_size: Items per write call
+
+    An exception in fetch or parse is printed and the item is passed on
+    with a value of None. An exception in write stops the pipeline and is
+    re-raised from `run`.
+    """
+
+    def __init__(self, name, fetch, parse, write, fetch_workers=DEFAULT_WORKERS,
+                 parse_workers=DEFAULT_PARSE_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        self.name = name
+        self.fetch = fetch
+        self.parse = parse
+        self.write = write
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.stats = {}
+        self.wall = 0.0
+
+    def run(self, items):
+        """
+        Process `items` and return the stage stats.
+
+        Returns:
+            dict: Stage name -> StageStats
+        """
+        items = list(items)
+        stop = threading.Event()
+        inbox = queue.Queue()
+        fetched = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        self.stats = {
+            'fetch': StageStats('fetch', self.fetch_workers),
+            'parse': StageStats('parse', self.parse_workers),
+            'write': StageStats('write', 1),
+        }
+
+        for seq, item in enumerate(items):
+            inbox.put((seq, item, None))
+
+        def put(target, value):
+            while not stop.is_set():
+                try:
+                    target.put(value, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def get(source, stats):
+            # The inbox is filled up front, so an empty inbox means no more items
+            while not stop.is_set():
+                try:
+                    entry = source.get_nowait() if source is inbox else source.get(timeout=0.1)
+                except queue.Empty:
+                    if source is inbox:
+                        return _DONE
+                    continue
+                if entry is not _DONE:
+                    stats.sample_queue(source.qsize() + 1)
+                return entry
+            return _DONE
+
+        def worker(source, target, stats, step):
+            while True:
+                entry = get(source, stats)
+                if entry is _DONE:
+                    return
+                seq, item, value = entry
+                started = time.monotonic()
+                error = False
+                try:
+                    value = step(item, value)
+                except Exception as e:
+                    print(f'  ✗ {self.name} {stats.name} failed for {item}: {str(e)}')
+                    value = None
+                    error = True
+                stats.record(time.monotonic() - started, error)
+                put(target, (seq, item, value))
+
+        def start(count, source, target, stats, step, then):
+            threads = [
+                threading.Thread(target=worker, args=(source, target, stats, step), daemon=True)
+                for _ in range(count)
+            ]
+            for thread in threads:
+                thread.start()
+
+            def close():
+                for thread in threads:
+                    thread.join()
+                for _ in range(then):
+                    put(target, _DONE)
+
+            threading.Thread(target=close, daemon=True).start()
+
+        started = time.monotonic()
+        start(self.fetch_workers, inbox, fetched, self.stats['fetch'], lambda item, _: self.fetch(item), self.parse_workers)
+        start(self.parse_workers, fetched, parsed, self.stats['parse'], self.parse, 1)
+
+        try:
+            self._write_in_order(parsed, len(items), get)
+        finally:
+            stop.set()
+            self.wall = time.monotonic() - started
+
+        return self.stats
+
+    def _write_in_order(self, parsed, total, get):
+        """Reorder parsed items by input position and write them in batches."""
+        stats = self.stats['write']
+        waiting = []
+        next_seq = 0
+        batch = []
+
+        def flush():
+            if not batch:
+                return
+            started = time.monotonic()
+            self.write(list(batch))
+            elapsed = time.monotonic() - started
+            for _ in batch:
+                stats.record(elapsed / len(batch))
+            batch.clear()
+
+        while next_seq < total:
+            entry = get(parsed, stats)
+            if entry is _DONE:
+                break
+            heapq.heappush(waiting, (entry[0], id(entry), entry))
+            while waiting and waiting[0][0] == next_seq:
+                _, _, (_, item, value) = heapq.heappop(waiting)
+                batch.append((item, value))
+                next_seq += 1
+                if len(batch) >= self.batch_size:
+                    flush()
+        flush()
+
+    def print_report(self):
+        """Print per-stage latency and queue depth, and name the busiest stage."""
+        if not self.stats:
+            return
+        print(f'\n=== {self.name} pipeline ===')
+        header = f'{"stage":<6} {"workers":>7} {"items":>6} {"errors":>6} {"avg ms":>7} {"max ms":>7} {"queue avg":>9} {"queue max":>9} {"busy":>5}'
+        print(header)
+        print('-' * len(header))
+        for stats in self.stats.values():
+            print(f'{stats.name:<6} {stats.workers:>7} {stats.items:>6} {stats.errors:>6} '
+                  f'{stats.avg_latency * 1000:>7.1f} {stats.max_latency * 1000:>7.1f} '
+                  f'{stats.avg_queue:>9.1f} {stats.queue_max:>9} {stats.utilization(self.wall):>5.0%}')
+        busiest = max(self.stats.values(), key=lambda stats: stats.utilization(self.wall))
+        print(f'Wall time: {self.wall:.2f}s, busiest stage: {busiest.name}')
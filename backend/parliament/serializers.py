@@ -2,6 +2,7 @@
 Serializers for parliamentary data.
 """
 
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import (
     PoliticalParty, 
@@ -16,7 +17,29 @@ from .models import (
 )
 
 
-class PoliticalPartySerializer(serializers.ModelSerializer):
+class EagerLoadingMixin:
+    """
+    Declare the related objects a serializer reads.
+    
+    Views pass their querysets through prepare_queryset, so the nested
+    objects are loaded with a fixed number of queries instead of one or
+    more queries per row.
+    """
+    
+    select_related = ()
+    prefetch_related = ()
+    
+    @classmethod
+    def prepare_queryset(cls, queryset, request=None):
+        """Return the queryset with this serializer's related objects loaded."""
+        if cls.select_related:
+            queryset = queryset.select_related(*cls.select_related)
+        if cls.prefetch_related:
+            queryset = queryset.prefetch_related(*cls.prefetch_related)
+        return queryset
+
+
+class PoliticalPartySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for political party objects."""
     
     class Meta:
@@ -24,7 +47,7 @@ class PoliticalPartySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class TopicSerializer(serializers.ModelSerializer):
+class TopicSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for policy topic objects."""
     
     class Meta:
@@ -32,7 +55,7 @@ class TopicSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ParliamentSessionSerializer(serializers.ModelSerializer):
+class ParliamentSessionSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for parliamentary session objects."""
     
     class Meta:
@@ -40,73 +63,114 @@ class ParliamentSessionSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class MPListSerializer(serializers.ModelSerializer):
+class MPListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for listing MP objects."""
     
     party = PoliticalPartySerializer(read_only=True)
     full_name = serializers.CharField(read_only=True)
     
+    select_related = ('party',)
+    
     class Meta:
         model = MP
         fields = ('id', 'first_name', 'last_name', 'full_name', 'slug', 'party', 
                   'constituency', 'photo', 'active', 'image_url')
 
 
-class MPDetailSerializer(serializers.ModelSerializer):
+class MPDetailSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for detailed MP objects."""
     
     party = PoliticalPartySerializer(read_only=True)
     
+    select_related = ('party',)
+    
     class Meta:
         model = MP
         fields = '__all__'
 
 
-class AmendmentSerializer(serializers.ModelSerializer):
+class AmendmentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for amendment objects."""
     
     proposed_by = MPListSerializer(many=True, read_only=True)
     
+    prefetch_related = (Prefetch('proposed_by', queryset=MPListSerializer.prepare_queryset(MP.objects.all())),)
+    
     class Meta:
         model = Amendment
         fields = '__all__'
 
 
-class BillListSerializer(serializers.ModelSerializer):
+class BillListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for listing bill objects."""
     
     topics = TopicSerializer(many=True, read_only=True)
     session = ParliamentSessionSerializer(read_only=True)
     
+    select_related = ('session',)
+    prefetch_related = ('topics',)
+    
     class Meta:
         model = Bill
         fields = ('id', 'title', 'slug', 'status', 'introduced_date', 'topics', 'url', 'description', 'althingi_id', 'session', 'vote_date')
 
 
-class VoteSerializer(serializers.ModelSerializer):
+class VoteSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for vote objects."""
     
     mp = MPListSerializer(read_only=True)
     bill = BillListSerializer(read_only=True)
     session = ParliamentSessionSerializer(read_only=True)
     
+    select_related = ('mp__party', 'bill__session', 'session')
+    prefetch_related = ('bill__topics',)
+    
     class Meta:
         model = Vote
         fields = '__all__'
 
 
-class SpeechSerializer(serializers.ModelSerializer):
-    """Serializer for speech objects."""
+class SpeechSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    """
+    Serializer for speech objects.
+    
+    The transcript text is only included when the request asks for it
+    with ?include=text.
+    """
     
     mp = MPListSerializer(read_only=True)
     bill = BillListSerializer(read_only=True)
     
+    select_related = ('mp__party', 'bill__session')
+    prefetch_related = ('bill__topics',)
+    
     class Meta:
         model = Speech
         fields = '__all__'
-
-
-class BillDetailSerializer(serializers.ModelSerializer):
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.includes_text(self.context.get('request')):
+            self.fields.pop('text', None)
+    
+    @staticmethod
+    def includes_text(request):
+        """Return True if the request asked for speech text (?include=text)."""
+        if request is None:
+            return False
+        include = request.query_params.get('include', '')
+        return 'text' in [part.strip() for part in include.split(',')]
+    
+    @classmethod
+    def prepare_queryset(cls, queryset, request=None):
+        """Load the related objects and defer the text column unless the request asked for it."""
+        queryset = super().prepare_queryset(queryset, request)
+        if cls.includes_text(request):
+            return queryset
+        return queryset.defer('text')
+
+
+class BillDetailSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for detailed bill objects."""
     
     sponsors = MPListSerializer(many=True, read_only=True)
@@ -115,79 +179,70 @@ class BillDetailSerializer(serializers.ModelSerializer):
     amendments = AmendmentSerializer(many=True, read_only=True)
     votes = serializers.SerializerMethodField()
     
+    prefetch_related = (
+        Prefetch('sponsors', queryset=MPListSerializer.prepare_queryset(MP.objects.all())),
+        Prefetch('cosponsors', queryset=MPListSerializer.prepare_queryset(MP.objects.all())),
+        'topics',
+        Prefetch('amendments', queryset=AmendmentSerializer.prepare_queryset(Amendment.objects.all())),
+    )
+    
     class Meta:
         model = Bill
         fields = '__all__'
     
     def get_votes(self, obj):
-        """Return vote statistics grouped by voting session with individual MP votes."""
-        votes = obj.votes.all().select_related('mp', 'mp__party')
-        
-        if not votes.exists():
-            return []
+        """Return vote statistics per voting round with individual MP votes."""
+        voting_rounds = obj.voting_rounds.prefetch_related(
+            Prefetch('votes', queryset=Vote.objects.select_related('mp', 'mp__party'))
+        )
         
-        # Group votes by voting session (using althingi_voting_id and vote_date)
-        voting_sessions = {}
-        for vote in votes:
-            session_key = vote.althingi_voting_id or f"session_{vote.vote_date}"
-            if session_key not in voting_sessions:
-                voting_sessions[session_key] = {
-                    'id': session_key,
-                    'title': f"Atkvæðagreiðsla {vote.vote_date.strftime('%d/%m/%Y')}",
-                    'vote_date': vote.vote_date,
-                    'althingi_voting_id': vote.althingi_voting_id,
-                    'votes': []
-                }
-            voting_sessions[session_key]['votes'].append(vote)
+        # Create MP vote details
+        def format_mp_vote(vote):
+            return {
+                'mp_id': vote.mp.id,
+                'mp_name': vote.mp.full_name,
+                'mp_slug': vote.mp.slug,
+                'party': vote.mp.party.abbreviation if vote.mp.party else 'Óháður',
+                'party_name': vote.mp.party.name if vote.mp.party else 'Óháður',
+                'party_color': vote.mp.party.color if vote.mp.party else '#808080',
+                'vote': vote.vote,
+                'image_url': vote.mp.image_url
+            }
         
-        # Calculate statistics for each voting session and sort by date
         result = []
-        for session_data in sorted(voting_sessions.values(), key=lambda x: x['vote_date'], reverse=True):
-            session_votes = session_data['votes']
-            
-            # Count votes by type
-            yes_votes = [v for v in session_votes if v.vote == 'yes']
-            no_votes = [v for v in session_votes if v.vote == 'no']
-            abstain_votes = [v for v in session_votes if v.vote == 'abstain']
-            absent_votes = [v for v in session_votes if v.vote == 'absent']
-            
-            # Create MP vote details
-            def format_mp_vote(vote):
-                return {
-                    'mp_id': vote.mp.id,
-                    'mp_name': vote.mp.full_name,
-                    'mp_slug': vote.mp.slug,
-                    'party': vote.mp.party.abbreviation if vote.mp.party else 'Óháður',
-                    'party_name': vote.mp.party.name if vote.mp.party else 'Óháður',
-                    'party_color': vote.mp.party.color if vote.mp.party else '#808080',
-                    'vote': vote.vote,
-                    'image_url': vote.mp.image_url
-                }
+        for voting_round in voting_rounds:
+            votes_by_type = {'yes': [], 'no': [], 'abstain': [], 'absent': []}
+            for vote in voting_round.votes.all():
+                votes_by_type.setdefault(vote.vote, []).append(format_mp_vote(vote))
             
             result.append({
-                'id': session_data['id'],
-                'title': session_data['title'],
-                'vote_date': session_data['vote_date'].isoformat() if session_data['vote_date'] else None,
-                'althingi_voting_id': session_data['althingi_voting_id'],
-                'yes_count': len(yes_votes),
-                'no_count': len(no_votes),
-                'abstain_count': len(abstain_votes),
-                'absent_count': len(absent_votes),
-                'total_count': len(session_votes),
-                'yes_votes': [format_mp_vote(v) for v in yes_votes],
-                'no_votes': [format_mp_vote(v) for v in no_votes],
-                'abstain_votes': [format_mp_vote(v) for v in abstain_votes],
-                'absent_votes': [format_mp_vote(v) for v in absent_votes]
+                'id': voting_round.althingi_voting_id or f"session_{voting_round.vote_date}",
+                'title': f"Atkvæðagreiðsla {voting_round.vote_date.strftime('%d/%m/%Y')}",
+                'vote_date': voting_round.vote_date.isoformat(),
+                'althingi_voting_id': voting_round.althingi_voting_id,
+                'vote_type': voting_round.vote_type,
+                'result': voting_round.result,
+                'yes_count': voting_round.yes_count,
+                'no_count': voting_round.no_count,
+                'abstain_count': voting_round.abstain_count,
+                'absent_count': voting_round.absent_count,
+                'total_count': voting_round.total_count,
+                'yes_votes': votes_by_type['yes'],
+                'no_votes': votes_by_type['no'],
+                'abstain_votes': votes_by_type['abstain'],
+                'absent_votes': votes_by_type['absent']
             })
         
         return result 
 
 
-class MPInterestSerializer(serializers.ModelSerializer):
+class MPInterestSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for MP interest objects."""
     
     mp = MPListSerializer(read_only=True)
     
+    select_related = ('mp__party',)
+    
     class Meta:
         model = MPInterest
         fields = '__all__' 
\ No newline at end of file
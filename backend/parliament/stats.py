@@ -0,0 +1,63 @@
+"""
+Set-based recount of denormalized MP statistics.
+"""
+
+from django.db.models import Count, Sum
+
+from .models import Bill, MP, Speech
+
+
+MP_STATISTIC_FIELDS = ['bills_sponsored', 'bills_cosponsored', 'speech_count', 'total_speaking_time']
+
+
+def _grouped_counts(queryset):
+    return dict(queryset.values('mp_id').annotate(count=Count('mp_id')).values_list('mp_id', 'count'))
+
+
+def refresh_mp_statistics(mp_ids=None):
+    """
+    Recompute bills_sponsored, bills_cosponsored, speech_count and total_speaking_time.
+
+    Uses one grouped aggregate query per statistic and a single bulk update
+    of the MPs whose numbers changed.
+
+    Args:
+        mp_ids: MP primary keys to refresh (default: every MP)
+
+    Returns:
+        int: Number of MPs updated
+    """
+    if mp_ids is not None:
+        mp_ids = list(mp_ids)
+        if not mp_ids:
+            return 0
+
+    def scoped(queryset, field='mp_id'):
+        return queryset if mp_ids is None else queryset.filter(**{f'{field}__in': mp_ids})
+
+    sponsored = _grouped_counts(scoped(Bill.sponsors.through.objects.all()))
+    cosponsored = _grouped_counts(scoped(Bill.cosponsors.through.objects.all()))
+    speeches = {
+        row['mp_id']: (row['count'], row['total_time'] or 0)
+        for row in scoped(Speech.objects.all()).values('mp_id').annotate(
+            count=Count('id'),
+            total_time=Sum('duration'),
+        )
+    }
+
+    changed = []
+    for mp in scoped(MP.objects.all(), 'pk').only('pk', *MP_STATISTIC_FIELDS):
+        speech_count, total_time = speeches.get(mp.pk, (0, 0))
+        values = {
+            'bills_sponsored': sponsored.get(mp.pk, 0),
+            'bills_cosponsored': cosponsored.get(mp.pk, 0),
+            'speech_count': speech_count,
+            'total_speaking_time': total_time,
+        }
+        if any(getattr(mp, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(mp, field, value)
+            changed.append(mp)
+
+    MP.objects.bulk_update(changed, MP_STATISTIC_FIELDS, batch_size=500)
+    return len(changed)
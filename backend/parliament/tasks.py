@@ -1,97 +1,226 @@
-from celery import shared_task
-import os
-import sys
-import subprocess
-from parliament.models import ParliamentSession
+"""
+Celery tasks for fetching data from the Alþingi API.
+
+The scrapers run in-process as a dependency graph:
+
+    parties -> MPs -> bills -> (speeches -> transcripts | interests | votes | topics) -> finalize
+
+MP statistics are recounted once, set-based, in the finalize step, which
+also refreshes the session's dashboard rollup (analytics.SessionStats).
+
+Each stage is recorded as a DataCollectionRun, and a Redis lock keeps two
+pipeline runs (or a pipeline run and a standalone voting records fetch) from
+overlapping. Requests to althingi.is from every worker share one Redis-backed
+rate limit, so the parallel stages together stay within
+althingi.DEFAULT_REQUESTS_PER_SECOND. The bill, vote and interest stages store a
+progress cursor on their run, so a stage that fails is resumed where it
+stopped by the next run for the same session.
+"""
+
+import time
+import uuid
+
+import redis
+from celery import chain, chord, group, shared_task
+from celery.signals import task_prerun
+from django.conf import settings
+
+from data_collection.runs import RunCheckpoint, record_run
+from parliament import althingi
+from parliament.stats import refresh_mp_statistics
 from parliament.utils import get_active_session_number
 
-def _run_scraper_script(script_name, session_number):
-    """Run a scraper script as a subprocess"""
-    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    scraper_path = os.path.join(backend_dir, 'scrapers', f'{script_name}.py')
-    
-    if not os.path.exists(scraper_path):
-        raise FileNotFoundError(f"Scraper script not found: {scraper_path}")
-    
-    # Run the scraper script
-    result = subprocess.run(
-        [sys.executable, scraper_path, str(session_number)],
-        cwd=backend_dir,
-        capture_output=True,
-        text=True,
-        timeout=3600  # 1 hour timeout
-    )
-    
-    if result.returncode != 0:
-        raise RuntimeError(f"Scraper {script_name} failed: {result.stderr}")
-    
-    return result.stdout
+# The lock expires on its own if a worker dies mid-run
+PIPELINE_LOCK_KEY = 'althingi:pipeline-lock'
+PIPELINE_LOCK_TIMEOUT = 6 * 60 * 60
+
+
+def _get_redis():
+    return redis.Redis.from_url(settings.CELERY_BROKER_URL)
+
+
+def _acquire_pipeline_lock():
+    """Take the pipeline lock. Returns its token, or None if a run holds it."""
+    token = uuid.uuid4().hex
+    if _get_redis().set(PIPELINE_LOCK_KEY, token, nx=True, ex=PIPELINE_LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def _release_pipeline_lock(token):
+    """Release the pipeline lock if it is still held with `token`."""
+    client = _get_redis()
+    if client.get(PIPELINE_LOCK_KEY) == token.encode():
+        client.delete(PIPELINE_LOCK_KEY)
+
+
+@task_prerun.connect
+def _share_rate_limit(**kwargs):
+    """Make the worker process draw from the rate limit shared through Redis."""
+    if not isinstance(althingi.rate_limiter, althingi.RedisRateLimiter):
+        althingi.set_rate_limiter(althingi.RedisRateLimiter(_get_redis(), althingi.rate_limiter.rate))
+
+
+def _resolve_session_number(session_number):
+    """Fall back to the active session from the Alþingi API."""
+    if session_number is None:
+        session_number = get_active_session_number()
+        if session_number is not None:
+            print(f"Using active session from Alþingi API: {session_number}")
+    return session_number
+
+
+@shared_task
+def fetch_parties_stage(session_number):
+    from scrapers.fetch_parties import fetch_parties
+    with record_run('party_data', 'Alþingi: parties', session_number):
+        fetch_parties(session_number)
+
+
+@shared_task
+def fetch_mps_stage(session_number):
+    from scrapers.fetch_mps import fetch_mps
+    with record_run('mp_data', 'Alþingi: MPs', session_number):
+        fetch_mps(session_number)
+
+
+@shared_task
+def fetch_bills_stage(session_number):
+    from scrapers.fetch_bills import fetch_bills
+    with record_run('bill_data', 'Alþingi: bills', session_number) as run:
+        fetch_bills(session_number, with_topics=False, update_statistics=False, checkpoint=RunCheckpoint(run))
+
+
+@shared_task
+def assign_topics_stage(session_number):
+    from scrapers.assign_topics import assign_topics
+    with record_run('topic_data', 'Alþingi: topics', session_number):
+        assign_topics(clear_existing=False, session=session_number)
+
+
+@shared_task
+def fetch_speeches_stage(session_number):
+    from scrapers.fetch_speeches import fetch_session_speeches
+    with record_run('speech_data', 'Alþingi: speeches', session_number):
+        fetch_session_speeches(session_number, update_statistics=False)
+
+
+@shared_task
+def fetch_transcripts_stage(session_number):
+    from scrapers.fetch_transcripts import fetch_transcripts
+    with record_run('speech_data', 'Alþingi: speech transcripts', session_number):
+        fetch_transcripts(session_number)
+
+
+@shared_task
+def fetch_interests_stage(session_number):
+    from scrapers.fetch_interests import fetch_all_mp_interests
+    with record_run('interest_data', 'Alþingi: interests', session_number) as run:
+        fetch_all_mp_interests(checkpoint=RunCheckpoint(run))
+
+
+@shared_task
+def fetch_votes_stage(session_number):
+    from scrapers.fetch_voting_records import fetch_all_voting_records
+    with record_run('vote_data', 'Alþingi: votes', session_number) as run:
+        fetch_all_voting_records(session_number, checkpoint=RunCheckpoint(run))
+
+
+@shared_task
+def refresh_statistics_stage(session_number):
+    with record_run('mp_data', 'Alþingi: MP statistics', session_number):
+        updated = refresh_mp_statistics()
+        print(f"Refreshed statistics for {updated} MPs")
+
+
+@shared_task
+def refresh_session_stats_stage(session_number):
+    from analytics.session_stats import refresh_session_stats
+    with record_run('bill_data', 'Alþingi: dashboard stats', session_number):
+        refresh_session_stats(None if session_number is None else [session_number])
+
+
+@shared_task
+def finalize_althingi_data(results, session_number, lock_token, started_at):
+    """Chord callback: runs once every fan-out stage has finished."""
+    try:
+        refresh_statistics_stage(session_number)
+        refresh_session_stats_stage(session_number)
+    finally:
+        _release_pipeline_lock(lock_token)
+    elapsed = time.time() - started_at
+    message = f"Data fetch completed for session {session_number} in {elapsed:.1f}s"
+    print(message)
+    return message
+
+
+@shared_task
+def release_pipeline_lock(lock_token):
+    """Error callback: release the lock when a stage fails."""
+    _release_pipeline_lock(lock_token)
+
 
 @shared_task
 def fetch_althingi_data(session_number=None):
     """
     Fetch all data from Althingi API
-    
+
     Args:
         session_number: Parliament session number. If None, fetches the active session from Alþingi API.
     """
-    # Get active session from Alþingi API if not specified
+    session_number = _resolve_session_number(session_number)
     if session_number is None:
-        session_number = get_active_session_number()
-        if session_number is None:
-            return "Error: Could not determine active session from Alþingi API. Please specify a session number."
-        print(f"Using active session from Alþingi API: {session_number}")
-    
+        return "Error: Could not determine active session from Alþingi API. Please specify a session number."
+
+    lock_token = _acquire_pipeline_lock()
+    if lock_token is None:
+        return "Skipped: an Alþingi data fetch is already running"
+
+    workflow = chain(
+        fetch_parties_stage.si(session_number),
+        fetch_mps_stage.si(session_number),
+        fetch_bills_stage.si(session_number),
+        chord(
+            group(
+                chain(fetch_speeches_stage.si(session_number), fetch_transcripts_stage.si(session_number)),
+                fetch_interests_stage.si(session_number),
+                fetch_votes_stage.si(session_number),
+                assign_topics_stage.si(session_number),
+            ),
+            finalize_althingi_data.s(session_number, lock_token, time.time()),
+        ),
+    )
+
     try:
-        # Fetch parties first as they are needed for MPs
-        print("Fetching parties...")
-        _run_scraper_script('fetch_parties', session_number)
-        
-        # Fetch MPs
-        print("Fetching MPs...")
-        _run_scraper_script('fetch_mps', session_number)
-        
-        # Fetch bills
-        print("Fetching bills...")
-        _run_scraper_script('fetch_bills', session_number)
-        
-        # Fetch speeches
-        print("Fetching speeches...")
-        _run_scraper_script('fetch_speeches', session_number)
-        
-        return f"Data fetch completed successfully for session {session_number}"
-    except Exception as e:
-        error_msg = f"Error fetching data for session {session_number}: {str(e)}"
-        print(error_msg)
-        import traceback
-        traceback.print_exc()
-        return error_msg
+        workflow.apply_async(link_error=release_pipeline_lock.si(lock_token))
+    except Exception:
+        _release_pipeline_lock(lock_token)
+        raise
+
+    return f"Data fetch started for session {session_number}"
+
 
 @shared_task
 def fetch_voting_records(session_number=None):
     """
     Fetch voting records for the current session
-    
+
+    Voting records are part of fetch_althingi_data; this task refreshes them on their own.
+
     Args:
         session_number: Parliament session number. If None, fetches the active session from Alþingi API.
     """
-    # Get active session from Alþingi API if not specified
+    session_number = _resolve_session_number(session_number)
     if session_number is None:
-        session_number = get_active_session_number()
-        if session_number is None:
-            return "Error: Could not determine active session from Alþingi API. Please specify a session number."
-        print(f"Using active session from Alþingi API: {session_number}")
-    
+        return "Error: Could not determine active session from Alþingi API. Please specify a session number."
+
+    lock_token = _acquire_pipeline_lock()
+    if lock_token is None:
+        return "Skipped: an Alþingi data fetch is already running"
+
     try:
-        session = ParliamentSession.objects.get(session_number=session_number)
-        # Run the scraper script as a subprocess
-        _run_scraper_script('fetch_voting_records', session_number)
-        return f"Voting records fetch completed for session {session_number}"
-    except ParliamentSession.DoesNotExist:
-        return f"Session {session_number} not found"
-    except Exception as e:
-        error_msg = f"Error fetching voting records for session {session_number}: {str(e)}"
-        print(error_msg)
-        import traceback
-        traceback.print_exc()
-        return error_msg 
\ No newline at end of file
+        fetch_votes_stage(session_number)
+        refresh_session_stats_stage(session_number)
+    finally:
+        _release_pipeline_lock(lock_token)
+    return f"Voting records fetch completed for session {session_number}"
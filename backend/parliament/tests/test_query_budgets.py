@@ -0,0 +1,177 @@
+"""
+Query budgets of the read API.
+
+Every endpoint is requested against a full page of related rows and must
+run a fixed number of queries: the count, the page and one per prefetch.
+A serializer that loads related objects row by row breaks its budget.
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from analytics.session_stats import refresh_session_stats
+from parliament.models import (
+    PoliticalParty,
+    Topic,
+    ParliamentSession,
+    MP,
+    Bill,
+    Amendment,
+    VotingRound,
+    Vote,
+    Speech,
+    MPInterest
+)
+
+API_ROOT = '/api/v1/parliament'
+
+# More rows than a page (PAGE_SIZE = 20) on every list endpoint
+MPS = 30
+BILLS = 30
+SPEECHES = 60
+
+
+@override_settings(
+    API_CACHE_ENABLED=False,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class QueryBudgetTests(TestCase):
+    """Number of queries per API endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.session = ParliamentSession.objects.create(session_number=157, start_date=today, is_active=True)
+        cls.parties = [
+            PoliticalParty.objects.create(name=f'Party {i}', abbreviation=f'P{i}')
+            for i in range(3)
+        ]
+        cls.topics = [
+            Topic.objects.create(name=f'Topic {i}', slug=f'topic-{i}')
+            for i in range(4)
+        ]
+
+        cls.mps = []
+        for i in range(MPS):
+            mp = MP.objects.create(
+                first_name='MP',
+                last_name=str(i),
+                slug=f'mp-{i}',
+                althingi_id=1000 + i,
+                party=cls.parties[i % len(cls.parties)] if i % 5 else None,
+            )
+            mp.sessions.add(cls.session)
+            MPInterest.objects.create(mp=mp, paid_work='Work')
+            cls.mps.append(mp)
+
+        cls.bills = []
+        for i in range(BILLS):
+            bill = Bill.objects.create(
+                althingi_id=i + 1,
+                session=cls.session,
+                title=f'Bill {i}',
+                introduced_date=today - timedelta(days=i),
+                url='https://example.com/',
+                slug=f'157-{i + 1}',
+            )
+            bill.topics.set(cls.topics[:1 + i % len(cls.topics)])
+            bill.sponsors.set(cls.mps[:3])
+            bill.cosponsors.set(cls.mps[3:6])
+            amendment = Amendment.objects.create(bill=bill, title=f'Amendment {i}', text='Text', date_proposed=today)
+            amendment.proposed_by.set(cls.mps[:2])
+
+            voting_round = VotingRound.objects.create(bill=bill, session=cls.session, vote_date=today)
+            Vote.objects.bulk_create([
+                Vote(bill=bill, mp=mp, vote='yes' if j % 4 else 'no', vote_date=today, session=cls.session,
+                     voting_round=voting_round)
+                for j, mp in enumerate(cls.mps)
+            ])
+            cls.bills.append(bill)
+
+        start = timezone.make_aware(datetime(today.year, today.month, today.day))
+        Speech.objects.bulk_create([
+            Speech(
+                mp=cls.mps[i % 2],
+                bill=cls.bills[i % BILLS] if i % 3 else cls.bills[0],
+                session=cls.session,
+                date=today,
+                title=f'Speech {i}',
+                text='Text',
+                start_time=start + timedelta(minutes=i),
+            )
+            for i in range(SPEECHES)
+        ])
+
+        # The dashboard reads the rollups the scrapers refresh after a run
+        refresh_session_stats()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def assertQueries(self, path, budget):
+        with self.assertNumQueries(budget):
+            response = self.client.get(path, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200, path)
+
+    def test_parties(self):
+        self.assertQueries(f'{API_ROOT}/parties/', 2)
+        self.assertQueries(f'{API_ROOT}/parties/{self.parties[0].pk}/', 1)
+
+    def test_topics(self):
+        topic = self.topics[0].pk
+        self.assertQueries(f'{API_ROOT}/topics/', 2)
+        self.assertQueries(f'{API_ROOT}/topics/{topic}/', 1)
+        self.assertQueries(f'{API_ROOT}/topics/{topic}/bills/', 4)
+
+    def test_sessions(self):
+        session = self.session.pk
+        self.assertQueries(f'{API_ROOT}/sessions/', 2)
+        self.assertQueries(f'{API_ROOT}/sessions/{session}/', 1)
+        self.assertQueries(f'{API_ROOT}/sessions/{session}/bills/', 4)
+
+    def test_mps(self):
+        mp = self.mps[0].slug
+        self.assertQueries(f'{API_ROOT}/mps/', 2)
+        self.assertQueries(f'{API_ROOT}/mps/?session={self.session.pk}', 2)
+        self.assertQueries(f'{API_ROOT}/mps/{mp}/', 2)
+        self.assertQueries(f'{API_ROOT}/mps/{mp}/speeches/', 4)
+        self.assertQueries(f'{API_ROOT}/mps/{mp}/bills/', 4)
+        self.assertQueries(f'{API_ROOT}/mps/{mp}/voting_record/', 4)
+        self.assertQueries(f'{API_ROOT}/mps/{mp}/interests/', 2)
+
+    def test_bills(self):
+        bill = self.bills[0].pk
+        self.assertQueries(f'{API_ROOT}/bills/', 3)
+        self.assertQueries(f'{API_ROOT}/bills/{bill}/', 9)
+        self.assertQueries(f'{API_ROOT}/bills/statistics/', 5)
+        self.assertQueries(f'{API_ROOT}/bills/{bill}/amendments/', 4)
+        self.assertQueries(f'{API_ROOT}/bills/{bill}/speeches/', 4)
+        self.assertQueries(f'{API_ROOT}/bills/{bill}/votes/', 4)
+
+    def test_amendments(self):
+        self.assertQueries(f'{API_ROOT}/amendments/', 3)
+        self.assertQueries(f'{API_ROOT}/amendments/{Amendment.objects.first().pk}/', 2)
+
+    def test_votes(self):
+        self.assertQueries(f'{API_ROOT}/votes/', 3)
+        self.assertQueries(f'{API_ROOT}/votes/{Vote.objects.first().pk}/', 2)
+
+    def test_speeches(self):
+        self.assertQueries(f'{API_ROOT}/speeches/', 3)
+        self.assertQueries(f'{API_ROOT}/speeches/?include=text', 3)
+        self.assertQueries(f'{API_ROOT}/speeches/{Speech.objects.first().pk}/', 2)
+
+    def test_mp_interests(self):
+        self.assertQueries(f'{API_ROOT}/mp-interests/', 2)
+        self.assertQueries(f'{API_ROOT}/mp-interests/{MPInterest.objects.first().pk}/', 1)
+
+    def test_dashboard(self):
+        self.assertQueries('/api/v1/analytics/dashboard/', 1)
+        self.assertQueries(f'/api/v1/analytics/dashboard/?session={self.session.pk}', 1)
+
+    def test_party_cohesion(self):
+        self.assertQueries('/api/v1/analytics/reports/party_cohesion/', 2)
+        self.assertQueries(f'/api/v1/analytics/reports/party_cohesion/?session_id={self.session.pk}', 2)
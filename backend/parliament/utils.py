@@ -1,11 +1,17 @@
 """
 Utility functions for parliament app.
 """
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from .models import ParliamentSession
+from . import althingi
+from .models import Amendment, Bill, MP, ParliamentSession, Vote
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# Session metadata changes a few times a year; every scraper stage asks for it
+SESSION_METADATA_TIMEOUT = 15 * 60
 
 
 def parse_date(date_string):
@@ -18,6 +24,74 @@ def parse_date(date_string):
         return None
 
 
+def _cache_key(name):
+    # Keyed by API root so a stand-in server never shares entries with althingi.is
+    return f'althingi:{name}:{althingi.api_url(althingi.ALTHINGI_ORIGIN)}'
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def _cache_set(key, value):
+    try:
+        cache.set(key, value, SESSION_METADATA_TIMEOUT)
+    except Exception:
+        pass
+
+
+def fetch_session_dates():
+    """
+    Fetch the start and end dates of every session from the Alþingi API.
+    
+    The result is cached for SESSION_METADATA_TIMEOUT seconds in the shared
+    cache, so all scraper stages and workers reuse one request.
+    
+    Returns:
+        dict: Session number -> {'start_date', 'end_date'}, or None on failure
+    """
+    key = _cache_key('session-dates')
+    sessions = _cache_get(key)
+    if sessions is not None:
+        return sessions
+    
+    url = 'https://www.althingi.is/altext/xml/loggjafarthing/'
+    response = althingi.get(url, timeout=10)
+    if response.status_code != 200:
+        return None
+    
+    root = ET.fromstring(response.content)
+    sessions = {}
+    for thing_elem in root.iter('þing'):
+        try:
+            number = int(thing_elem.get('númer'))
+        except (TypeError, ValueError):
+            continue
+        
+        # Get start date (þingsetning)
+        start_date_str = None
+        thingsetning_elem = thing_elem.find('þingsetning')
+        if thingsetning_elem is not None and thingsetning_elem.text:
+            start_date_str = thingsetning_elem.text.strip()
+        
+        # Get end date (þinglok) - may not exist for current session
+        end_date_str = None
+        thinglok_elem = thing_elem.find('þinglok')
+        if thinglok_elem is not None and thinglok_elem.text:
+            end_date_str = thinglok_elem.text.strip()
+        
+        sessions[number] = {
+            'start_date': parse_date(start_date_str),
+            'end_date': parse_date(end_date_str) if end_date_str else None
+        }
+    
+    _cache_set(key, sessions)
+    return sessions
+
+
 def get_session_info_from_api(session_number):
     """
     Fetch session information (start_date, end_date) from Alþingi API.
@@ -29,36 +103,10 @@ def get_session_info_from_api(session_number):
         dict: Dictionary with 'start_date' and 'end_date' keys, or None if not found
     """
     try:
-        url = 'https://www.althingi.is/altext/xml/loggjafarthing/'
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
+        sessions = fetch_session_dates()
+        if sessions is None:
             return None
-        
-        root = ET.fromstring(response.content)
-        # Find the specific session
-        thing_elem = root.find(f".//þing[@númer='{session_number}']")
-        
-        if thing_elem is not None:
-            start_date_str = None
-            end_date_str = None
-            
-            # Get start date (þingsetning)
-            thingsetning_elem = thing_elem.find('þingsetning')
-            if thingsetning_elem is not None and thingsetning_elem.text:
-                start_date_str = thingsetning_elem.text.strip()
-            
-            # Get end date (þinglok) - may not exist for current session
-            thinglok_elem = thing_elem.find('þinglok')
-            if thinglok_elem is not None and thinglok_elem.text:
-                end_date_str = thinglok_elem.text.strip()
-            
-            return {
-                'start_date': parse_date(start_date_str),
-                'end_date': parse_date(end_date_str) if end_date_str else None
-            }
-        
-        return None
+        return sessions.get(int(session_number))
     except Exception as e:
         print(f'Error fetching session info for {session_number}: {str(e)}')
         return None
@@ -68,12 +116,19 @@ def get_active_session_number():
     """
     Fetch the currently active session number from Alþingi API.
     
+    The answer is cached for SESSION_METADATA_TIMEOUT seconds in the shared cache.
+    
     Returns:
         int: The session number of the currently active session, or None if not found
     """
+    key = _cache_key('active-session')
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    
     try:
         url = 'https://www.althingi.is/altext/xml/loggjafarthing/yfirstandandi/'
-        response = requests.get(url, timeout=10)
+        response = althingi.get(url, timeout=10)
         
         if response.status_code != 200:
             return None
@@ -86,9 +141,11 @@ def get_active_session_number():
             session_number = thing_elem.get('númer') or thing_elem.get('nummer')
             if session_number:
                 try:
-                    return int(session_number)
+                    session_number = int(session_number)
                 except (ValueError, TypeError):
-                    pass
+                    return None
+                _cache_set(key, session_number)
+                return session_number
         
         return None
     except Exception as e:
@@ -100,6 +157,9 @@ def update_active_session_status():
     """
     Update the is_active status for all sessions based on the Alþingi API.
     Only the session returned by the API will be marked as active.
+    
+    Nothing is written when the database already marks exactly that session
+    as active, which is the case for every call after the first one.
     """
     active_session_number = get_active_session_number()
     
@@ -107,20 +167,25 @@ def update_active_session_status():
         print('Warning: Could not determine active session from Alþingi API')
         return None
     
+    active_sessions = list(ParliamentSession.objects.filter(is_active=True))
+    if len(active_sessions) == 1 and active_sessions[0].session_number == active_session_number:
+        return active_sessions[0]
+    
     with transaction.atomic():
-        # Set all sessions to inactive
-        ParliamentSession.objects.all().update(is_active=False)
+        # Set the other sessions to inactive
+        ParliamentSession.objects.filter(is_active=True).exclude(
+            session_number=active_session_number
+        ).update(is_active=False)
         
         # Set the active session
-        try:
-            active_session = ParliamentSession.objects.get(session_number=active_session_number)
-            active_session.is_active = True
-            active_session.save()
-            print(f'Updated active session to: {active_session_number}')
-            return active_session
-        except ParliamentSession.DoesNotExist:
-            print(f'Warning: Session {active_session_number} not found in database')
-            return None
+        updated = ParliamentSession.objects.filter(session_number=active_session_number).update(is_active=True)
+    
+    if not updated:
+        print(f'Warning: Session {active_session_number} not found in database')
+        return None
+    
+    print(f'Updated active session to: {active_session_number}')
+    return ParliamentSession.objects.filter(session_number=active_session_number).first()
 
 
 def get_or_create_session(session_number, update_active_status=True):
@@ -174,3 +239,31 @@ def get_or_create_session(session_number, update_active_status=True):
             is_active=is_active
         )
         return session
+
+
+def touch_bills(mp_ids=(), party_ids=(), topic_ids=()):
+    """
+    Move last_update of the bills whose detail response embeds these MPs,
+    parties or topics, so the bills' ETags change with them.
+    
+    A bill embeds its sponsors, cosponsors, amendment proposers and voters
+    (each with their party) and its topics.
+    
+    Returns:
+        int: Number of bills touched
+    """
+    if not (mp_ids or party_ids or topic_ids):
+        return 0
+    
+    condition = Q(topics__in=list(topic_ids))
+    if mp_ids or party_ids:
+        mps = MP.objects.filter(Q(pk__in=list(mp_ids)) | Q(party_id__in=list(party_ids))).values('pk')
+        condition |= (
+            Q(sponsors__in=mps)
+            | Q(cosponsors__in=mps)
+            | Q(pk__in=Vote.objects.filter(mp__in=mps).values('bill_id'))
+            | Q(pk__in=Amendment.objects.filter(proposed_by__in=mps).values('bill_id'))
+        )
+    
+    bills = Bill.objects.filter(condition).values('pk')
+    return Bill.objects.filter(pk__in=bills).update(last_update=timezone.now())
@@ -6,6 +6,7 @@ from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from .caching import CachedResponseMixin, make_validators
 from .models import (
     PoliticalParty, 
     Topic, 
@@ -32,7 +33,22 @@ from .serializers import (
 )
 
 
-class PoliticalPartyViewSet(viewsets.ReadOnlyModelViewSet):
+class EagerLoadingViewSetMixin:
+    """
+    Load the related objects that the viewset's serializer declares.
+    
+    Applies to the list and retrieve actions; extra actions serialize other
+    models and prepare their querysets with that serializer themselves.
+    """
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = self.get_serializer_class().prepare_queryset(queryset, self.request)
+        return queryset
+
+
+class PoliticalPartyViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing political parties."""
     
     queryset = PoliticalParty.objects.all()
@@ -43,7 +59,7 @@ class PoliticalPartyViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['name']
 
 
-class TopicViewSet(viewsets.ReadOnlyModelViewSet):
+class TopicViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing policy topics."""
     
     queryset = Topic.objects.all()
@@ -57,7 +73,7 @@ class TopicViewSet(viewsets.ReadOnlyModelViewSet):
     def bills(self, request, pk=None):
         """Return bills related to this topic."""
         topic = self.get_object()
-        bills = topic.bills.all()
+        bills = BillListSerializer.prepare_queryset(topic.bills.all())
         page = self.paginate_queryset(bills)
         if page is not None:
             serializer = BillListSerializer(page, many=True)
@@ -66,7 +82,7 @@ class TopicViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class ParliamentSessionViewSet(viewsets.ReadOnlyModelViewSet):
+class ParliamentSessionViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing parliamentary sessions."""
     
     queryset = ParliamentSession.objects.all()
@@ -80,7 +96,7 @@ class ParliamentSessionViewSet(viewsets.ReadOnlyModelViewSet):
     def bills(self, request, pk=None):
         """Return bills in this session."""
         session = self.get_object()
-        bills = session.bills.all()
+        bills = BillListSerializer.prepare_queryset(session.bills.all())
         page = self.paginate_queryset(bills)
         if page is not None:
             serializer = BillListSerializer(page, many=True)
@@ -89,7 +105,7 @@ class ParliamentSessionViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class MPViewSet(viewsets.ReadOnlyModelViewSet):
+class MPViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing MPs."""
     
     queryset = MP.objects.all()
@@ -121,7 +137,7 @@ class MPViewSet(viewsets.ReadOnlyModelViewSet):
     def speeches(self, request, slug=None):
         """Return speeches made by this MP."""
         mp = self.get_object()
-        speeches = mp.speeches.all()
+        speeches = SpeechSerializer.prepare_queryset(mp.speeches.all(), request)
         
         # Filter by session if provided
         session_id = request.query_params.get('session', None)
@@ -130,16 +146,16 @@ class MPViewSet(viewsets.ReadOnlyModelViewSet):
         
         page = self.paginate_queryset(speeches)
         if page is not None:
-            serializer = SpeechSerializer(page, many=True)
+            serializer = SpeechSerializer(page, many=True, context=self.get_serializer_context())
             return self.get_paginated_response(serializer.data)
-        serializer = SpeechSerializer(speeches, many=True)
+        serializer = SpeechSerializer(speeches, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def bills(self, request, slug=None):
         """Return bills sponsored by this MP."""
         mp = self.get_object()
-        bills = mp.sponsored_bills.all()
+        bills = BillListSerializer.prepare_queryset(mp.sponsored_bills.all())
         
         # Filter by session if provided
         session_id = request.query_params.get('session', None)
@@ -157,7 +173,7 @@ class MPViewSet(viewsets.ReadOnlyModelViewSet):
     def voting_record(self, request, slug=None):
         """Return voting record for this MP."""
         mp = self.get_object()
-        votes = mp.voting_record.all()
+        votes = VoteSerializer.prepare_queryset(mp.voting_record.all())
         
         # Filter by session if provided
         session_id = request.query_params.get('session', None)
@@ -176,14 +192,14 @@ class MPViewSet(viewsets.ReadOnlyModelViewSet):
         """Return interests for this MP."""
         mp = self.get_object()
         try:
-            interest = MPInterest.objects.get(mp=mp)
+            interest = MPInterestSerializer.prepare_queryset(MPInterest.objects.all()).get(mp=mp)
             serializer = MPInterestSerializer(interest)
             return Response(serializer.data)
         except MPInterest.DoesNotExist:
             return Response({'detail': 'No interests found for this MP.'}, status=404)
 
 
-class BillViewSet(viewsets.ReadOnlyModelViewSet):
+class BillViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing bills."""
     
     queryset = Bill.objects.all()
@@ -210,6 +226,15 @@ class BillViewSet(viewsets.ReadOnlyModelViewSet):
             return BillDetailSerializer
         return BillListSerializer
     
+    def get_validators(self, request, action, **kwargs):
+        """Validate a bill detail by its last_update, so it survives unrelated scraper runs."""
+        pk = str(kwargs.get(self.lookup_url_kwarg or self.lookup_field, ''))
+        if action == 'retrieve' and pk.isdigit():
+            last_update = Bill.objects.filter(pk=pk).values_list('last_update', flat=True).first()
+            if last_update is not None:
+                return make_validators(request, f'bill-{pk}-{last_update.timestamp():.6f}', last_update.timestamp())
+        return super().get_validators(request, action, **kwargs)
+    
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Return bill statistics grouped by status."""
@@ -265,7 +290,7 @@ class BillViewSet(viewsets.ReadOnlyModelViewSet):
     def amendments(self, request, pk=None):
         """Return amendments for this bill."""
         bill = self.get_object()
-        amendments = bill.amendments.all()
+        amendments = AmendmentSerializer.prepare_queryset(bill.amendments.all())
         page = self.paginate_queryset(amendments)
         if page is not None:
             serializer = AmendmentSerializer(page, many=True)
@@ -277,19 +302,19 @@ class BillViewSet(viewsets.ReadOnlyModelViewSet):
     def speeches(self, request, pk=None):
         """Return speeches related to this bill."""
         bill = self.get_object()
-        speeches = bill.speeches.all()
+        speeches = SpeechSerializer.prepare_queryset(bill.speeches.all(), request)
         page = self.paginate_queryset(speeches)
         if page is not None:
-            serializer = SpeechSerializer(page, many=True)
+            serializer = SpeechSerializer(page, many=True, context=self.get_serializer_context())
             return self.get_paginated_response(serializer.data)
-        serializer = SpeechSerializer(speeches, many=True)
+        serializer = SpeechSerializer(speeches, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def votes(self, request, pk=None):
         """Return votes for this bill."""
         bill = self.get_object()
-        votes = bill.votes.all()
+        votes = VoteSerializer.prepare_queryset(bill.votes.all())
         page = self.paginate_queryset(votes)
         if page is not None:
             serializer = VoteSerializer(page, many=True)
@@ -298,7 +323,7 @@ class BillViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class AmendmentViewSet(viewsets.ReadOnlyModelViewSet):
+class AmendmentViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing amendments."""
     
     queryset = Amendment.objects.all()
@@ -310,7 +335,7 @@ class AmendmentViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['date_proposed']
 
 
-class VoteViewSet(viewsets.ReadOnlyModelViewSet):
+class VoteViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing votes."""
     
     queryset = Vote.objects.all()
@@ -321,7 +346,7 @@ class VoteViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['vote_date']
 
 
-class SpeechViewSet(viewsets.ReadOnlyModelViewSet):
+class SpeechViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing speeches."""
     
     queryset = Speech.objects.all()
@@ -333,7 +358,7 @@ class SpeechViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['date', 'sentiment_score']
 
 
-class MPInterestViewSet(viewsets.ReadOnlyModelViewSet):
+class MPInterestViewSet(CachedResponseMixin, EagerLoadingViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing MP interests."""
     
     queryset = MPInterest.objects.all()
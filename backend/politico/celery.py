@@ -22,11 +22,7 @@ app.autodiscover_tasks()
 app.conf.beat_schedule = {
     'fetch-althingi-data-daily': {
         'task': 'parliament.tasks.fetch_althingi_data',
-        'schedule': crontab(minute=0, hour=5),  # Run daily at 05:00
-    },
-    'fetch-voting-records-daily': {
-        'task': 'parliament.tasks.fetch_voting_records',
-        'schedule': crontab(minute=15, hour=5),  # Run daily at 05:15 (after main fetch)
+        'schedule': crontab(minute=0, hour=5),  # Run daily at 05:00 (includes voting records)
     },
 }
 
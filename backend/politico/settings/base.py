@@ -128,6 +128,25 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Alþingi XML API client (parliament.althingi)
+# Responses are cached here and revalidated with ETag/Last-Modified
+ALTHINGI_CACHE_DIR = os.getenv('ALTHINGI_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'althingi'))
+# Local scraper cursors (e.g. the last ingested speech per session)
+ALTHINGI_STATE_DIR = os.getenv('ALTHINGI_STATE_DIR', os.path.join(BASE_DIR, 'cache', 'state'))
+# Compressed archive of every fetched document (set to an empty string to disable)
+ALTHINGI_ARCHIVE_DIR = os.getenv('ALTHINGI_ARCHIVE_DIR', os.path.join(BASE_DIR, 'cache', 'archive'))
+# Replay scrapers from the archive instead of the network: "1" for the latest
+# archived documents, or an ISO date/time to replay the archive as of then
+ALTHINGI_REPLAY = os.getenv('ALTHINGI_REPLAY', '')
+# Send requests for www.althingi.is to another server instead, e.g. the local
+# stand-in from scrapers/standin_server.py ("http://127.0.0.1:8765")
+ALTHINGI_API_ROOT = os.getenv('ALTHINGI_API_ROOT', '')
+
+# Cache GET responses of the read-only API (parliament.caching). Entries are
+# keyed on a data version that the scrapers bump when they finish
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', 'True') == 'True'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 24 * 60 * 60))
+
 # Celery common settings
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
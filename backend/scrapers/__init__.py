@@ -0,0 +1,6 @@
+"""
+Alþingi scrapers.
+
+Each module can be run as a script or imported, and its fetch functions
+called directly (parliament.tasks runs them as a Celery pipeline).
+"""
@@ -16,21 +16,30 @@ Usage:
     
     # Combine flags
     python assign_topics.py --session 157 --clear
+    
+    # Number of topic lists to fetch concurrently (default 8)
+    python assign_topics.py --workers 4
 """
 
 import os
 import sys
 import django
+from django.db import transaction
+from django.utils import timezone
 import requests
 import xml.etree.ElementTree as ET
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 django.setup()
 
+from parliament import althingi, caching
 from parliament.models import Bill, Topic
+from parliament.utils import touch_bills
+from analytics.session_stats import refresh_session_stats
+from scrapers.fetch_bills import parse_int_option
 
 
 def fetch_all_topics():
@@ -40,7 +49,7 @@ def fetch_all_topics():
     url = 'https://www.althingi.is/altext/xml/efnisflokkar/'
     
     try:
-        response = requests.get(url, timeout=30)
+        response = althingi.get(url)
         response.raise_for_status()
         
         root = ET.fromstring(response.content)
@@ -81,7 +90,8 @@ def fetch_bills_for_topic(topic_id, session=None):
         session: Optional parliament session number (e.g., 157). If None, fetches current session.
     
     Returns:
-        List of tuples (bill_number, session_number)
+        List of tuples (bill_number, session_number), or None if the list
+        could not be fetched
     """
     url = f'https://www.althingi.is/altext/xml/efnisflokkar/efnisflokkur/?efnisflokkur={topic_id}'
     
@@ -90,7 +100,7 @@ def fetch_bills_for_topic(topic_id, session=None):
         url += f'&lthing={session}'
     
     try:
-        response = requests.get(url, timeout=30)
+        response = althingi.get(url)
         response.raise_for_status()
         
         root = ET.fromstring(response.content)
@@ -113,15 +123,28 @@ def fetch_bills_for_topic(topic_id, session=None):
         
     except requests.RequestException as e:
         print(f'  ✗ Error fetching bills for topic {topic_id}: {e}')
-        return []
+        return None
+    except ET.ParseError as e:
+        print(f'  ✗ Error parsing bills for topic {topic_id}: {e}')
+        return None
 
 
 def create_or_update_topics(topics_data):
-    """Create or update topics in the database"""
+    """
+    Create or update topics in the database
+    
+    Returns:
+        dict: Topic name -> Topic pk
+    """
     print('\nCreating/updating topics in database...')
     
     created_count = 0
     updated_count = 0
+    changed_topics = []
+    stored = {
+        topic['name']: topic
+        for topic in Topic.objects.filter(name__in=[t['name'] for t in topics_data]).values('pk', 'name', 'description', 'keywords')
+    }
     
     for topic_data in topics_data:
         # Create a full description including parent category
@@ -137,6 +160,10 @@ def create_or_update_topics(topics_data):
             }
         )
         
+        previous = stored.get(topic.name)
+        if previous and (previous['description'] != full_description or previous['keywords'] != []):
+            changed_topics.append(topic.pk)
+        
         if created:
             created_count += 1
             print(f'  ✓ Created: {topic.name}')
@@ -145,14 +172,27 @@ def create_or_update_topics(topics_data):
             print(f'  ✓ Updated: {topic.name}')
     
     print(f'\n  Created: {created_count}, Updated: {updated_count}')
+    
+    # Bills embed their topics
+    if changed_topics:
+        touch_bills(topic_ids=changed_topics)
+    
+    return dict(Topic.objects.filter(name__in=[t['name'] for t in topics_data]).values_list('name', 'pk'))
 
 
-def assign_topics(clear_existing=False, session=None):
+def assign_topics(clear_existing=False, session=None, workers=althingi.DEFAULT_WORKERS):
     """Assign topics to bills using official Alþingi categorization
     
+    Topic bill lists are fetched concurrently. The wanted (bill, topic) pairs
+    are then diffed against the existing assignments and applied with one
+    bulk insert (and, with clear_existing, one bulk delete).
+    
     Args:
-        clear_existing: If True, clears existing topic assignments before assigning
+        clear_existing: If True, also removes assignments that the API no
+            longer lists. Only topics whose bill list was fetched
+            successfully are pruned.
         session: Optional parliament session number (e.g., 157). If None, processes all bills.
+        workers: Number of topic bill lists to fetch concurrently
     """
     if session:
         print(f'Starting topic assignment for session {session} from Alþingi API...\n')
@@ -166,101 +206,96 @@ def assign_topics(clear_existing=False, session=None):
         return
     
     # Create/update topics in database
-    create_or_update_topics(topics_data)
+    topic_map = create_or_update_topics(topics_data)
     
     # Filter bills by session if specified
     if session:
         bills_queryset = Bill.objects.filter(session__session_number=session)
-        session_bill_count = bills_queryset.count()
-        if session_bill_count == 0:
-            print(f'\n✗ No bills found for session {session} in database')
-            return
-        print(f'\n→ Filtering for session {session} ({session_bill_count} bills in database)')
     else:
         bills_queryset = Bill.objects.all()
     
-    if clear_existing:
-        print('\nClearing existing topic assignments...')
-        for bill in bills_queryset:
-            bill.topics.clear()
-        print('✓ Cleared existing assignments')
-    
-    # Process each topic and assign bills
-    print('\nAssigning topics to bills...\n')
+    # (althingi_id, session_number) -> bill pk
+    bill_map = {
+        (althingi_id, session_number): pk
+        for pk, althingi_id, session_number in bills_queryset.values_list('pk', 'althingi_id', 'session__session_number')
+    }
+    if session and not bill_map:
+        print(f'\n✗ No bills found for session {session} in database')
+        return
+    if session:
+        print(f'\n→ Filtering for session {session} ({len(bill_map)} bills in database)')
     
-    total_topics = len(topics_data)
-    topics_processed = 0
-    total_assignments = 0
-    bills_with_topics = set()
+    # Fetch the bill lists of all topics concurrently
+    print(f'\nFetching bill lists for {len(topics_data)} topics ({workers} workers)...\n')
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        bill_lists = list(executor.map(lambda t: fetch_bills_for_topic(t['id'], session), topics_data))
     
-    for topic_data in topics_data:
-        topics_processed += 1
-        topic_id = topic_data['id']
+    # Build the wanted (bill, topic) pairs
+    target = set()
+    fetched_topics = set()
+    for idx, (topic_data, bill_data) in enumerate(zip(topics_data, bill_lists), 1):
         topic_name = topic_data['name']
+        print(f'[{idx}/{len(topics_data)}] {topic_name} (ID: {topic_data["id"]})', end='')
         
-        print(f'[{topics_processed}/{total_topics}] Processing: {topic_name} (ID: {topic_id})')
-        
-        # Fetch bills for this topic (with optional session filter)
-        bill_data = fetch_bills_for_topic(topic_id, session)
-        
-        if not bill_data:
-            print(f'  → No bills found')
-            sleep(0.5)  # Rate limiting
+        topic_pk = topic_map.get(topic_name)
+        if topic_pk is None:
+            print(f'\n  ✗ Topic not found in database: {topic_name}')
             continue
-        
-        print(f'  → Found {len(bill_data)} bills in API')
-        
-        # Get the topic object
-        try:
-            topic = Topic.objects.get(name=topic_name)
-        except Topic.DoesNotExist:
-            print(f'  ✗ Topic not found in database: {topic_name}')
+        if bill_data is None:
+            print(' - could not fetch bill list, keeping existing assignments')
             continue
+        fetched_topics.add(topic_pk)
         
-        # Assign topic to bills
-        assignments = 0
-        not_found = 0
-        
-        for bill_number, session_number in bill_data:
-            try:
-                # Query by both althingi_id and session number
-                bill = Bill.objects.get(
-                    althingi_id=bill_number,
-                    session__session_number=session_number
-                )
-                
-                bill.topics.add(topic)
-                assignments += 1
-                bills_with_topics.add(f"{session_number}-{bill_number}")
-            except Bill.DoesNotExist:
-                not_found += 1
-        
-        total_assignments += assignments
-        
-        if assignments > 0:
-            print(f'  ✓ Assigned to {assignments} bills', end='')
-            if not_found > 0:
-                print(f' ({not_found} bills not in database)')
-            else:
-                print()
-        else:
-            print(f'  → No matching bills in database')
+        matched = 0
+        for key in bill_data:
+            bill_pk = bill_map.get(key)
+            if bill_pk is not None:
+                target.add((bill_pk, topic_pk))
+                matched += 1
         
-        # Rate limiting
-        sleep(0.5)
+        not_found = len(bill_data) - matched
+        print(f' - {len(bill_data)} bills in API, {matched} in database' + (f' ({not_found} not in database)' if not_found else ''))
+    
+    # Diff against the existing assignments
+    Through = Bill.topics.through
+    existing_rows = Through.objects.filter(bill_id__in=bills_queryset.values('pk')).values_list('pk', 'bill_id', 'topic_id')
+    existing = {(bill_id, topic_id): pk for pk, bill_id, topic_id in existing_rows}
+    
+    to_add = target - existing.keys()
+    removed_pairs = []
+    if clear_existing:
+        removed_pairs = [
+            pair for pair in existing
+            if pair not in target and pair[1] in fetched_topics
+        ]
+    to_remove = [existing[pair] for pair in removed_pairs]
+    changed_bills = {bill_pk for bill_pk, _ in to_add} | {bill_pk for bill_pk, _ in removed_pairs}
+    
+    with transaction.atomic():
+        Through.objects.bulk_create(
+            [Through(bill_id=bill_pk, topic_id=topic_pk) for bill_pk, topic_pk in to_add],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        if to_remove:
+            Through.objects.filter(pk__in=to_remove).delete()
+        # The bill detail lists its topics, so its ETag has to change
+        if changed_bills:
+            Bill.objects.filter(pk__in=changed_bills).update(last_update=timezone.now())
     
     # Summary
-    total_bills = bills_queryset.count()
-    bills_with_any_topic = len(bills_with_topics)
+    total_bills = len(bill_map)
+    bills_with_any_topic = len({bill_pk for bill_pk, _ in target})
     
     print(f'\n=== Summary ===')
     if session:
         print(f'Session: {session}')
-    print(f'Topics processed: {topics_processed}')
-    print(f'Total topic assignments: {total_assignments}')
+    print(f'Topics processed: {len(fetched_topics)}/{len(topics_data)}')
+    print(f'Total topic assignments: {len(target)}')
+    print(f'Assignments added: {len(to_add)}, removed: {len(to_remove)}, unchanged: {len(target) - len(to_add)}')
     print(f'Bills with at least one topic: {bills_with_any_topic}/{total_bills}')
-    if total_assignments > 0 and bills_with_any_topic > 0:
-        print(f'Average topics per bill (with topics): {total_assignments / bills_with_any_topic:.2f}')
+    if target and bills_with_any_topic > 0:
+        print(f'Average topics per bill (with topics): {len(target) / bills_with_any_topic:.2f}')
 
 
 if __name__ == '__main__':
@@ -284,6 +319,11 @@ if __name__ == '__main__':
     if session:
         print(f'Processing only session {session}\n')
     
-    assign_topics(clear_existing, session)
+    workers = max(1, parse_int_option(sys.argv, ['--workers', '-w'], althingi.DEFAULT_WORKERS))
+    
+    assign_topics(clear_existing, session, workers=workers)
     print('\n✓ Topic assignment completed!')
-
+    
+    # Refresh the dashboard rollups and serve the new data from the API
+    refresh_session_stats(None if session is None else [session])
+    caching.bump_data_version()
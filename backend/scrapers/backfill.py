@@ -0,0 +1,203 @@
+"""
+Backfill a range of parliament sessions from the Alþingi API
+Sessions are loaded in parallel worker processes that share one global request rate limit
+
+Usage:
+    python backfill.py <first_session> <last_session> [--processes N] [--rate N]
+
+Examples:
+    python backfill.py 120 157
+    python backfill.py 140 150 --processes 6 --rate 12
+
+Parties and MPs are loaded first, one session at a time in this process, because
+MPs are shared between sessions. Their profile documents come from the response
+cache after the first session that lists them. Bills, voting records and speeches
+belong to a single session and are loaded in the worker processes. Topics, MP
+statistics and the dashboard rollups are done last. Each stage is recorded as a
+DataCollectionRun and resumes from its cursor if a previous backfill stopped half-way.
+
+The output of each session is written to ALTHINGI_STATE_DIR/backfill/session-<N>.log.
+"""
+
+import contextlib
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import django
+
+# Setup Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
+django.setup()
+
+from django.conf import settings
+
+from parliament import althingi
+from parliament import tasks
+from parliament.models import Bill, Speech, Vote
+from scrapers.fetch_bills import parse_int_option
+
+DEFAULT_PROCESSES = 4
+
+# Per-session stages run in the worker processes, in this order
+SESSION_STAGES = [
+    ('bills', tasks.fetch_bills_stage),
+    ('votes', tasks.fetch_votes_stage),
+    ('speeches', tasks.fetch_speeches_stage),
+]
+
+
+def log_path(session_number):
+    directory = os.path.join(settings.ALTHINGI_STATE_DIR, 'backfill')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'session-{session_number}.log')
+
+
+@contextlib.contextmanager
+def session_log(session_number, mode='a'):
+    """Send everything printed in the block to the session's log file"""
+    with open(log_path(session_number), mode, encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        yield log
+
+
+def init_worker(rate_limiter):
+    """Process pool initializer: join the shared request budget"""
+    althingi.set_rate_limiter(rate_limiter)
+
+
+def backfill_session(session_number):
+    """
+    Load the bills, voting records and speeches of one session.
+    
+    Runs in a worker process.
+    
+    Returns:
+        dict: Session number, elapsed seconds, row counts and the error, if any
+    """
+    started = time.monotonic()
+    error = None
+    
+    with session_log(session_number) as log:
+        for name, stage in SESSION_STAGES:
+            try:
+                stage(session_number)
+            except Exception as e:
+                error = f'{name}: {str(e)}'
+                traceback.print_exc(file=log)
+                break
+    
+    return {
+        'session': session_number,
+        'seconds': time.monotonic() - started,
+        'error': error,
+        'bills': Bill.objects.filter(session__session_number=session_number).count(),
+        'votes': Vote.objects.filter(session__session_number=session_number).count(),
+        'speeches': Speech.objects.filter(session__session_number=session_number).count(),
+    }
+
+
+def print_progress(done, total, result):
+    rows = result['bills'] + result['votes'] + result['speeches']
+    status = f'✗ failed at {result["error"]}' if result['error'] else '✓'
+    print(f'[{done}/{total}] Session {result["session"]} {status} in {result["seconds"]:.0f}s: '
+          f'{result["bills"]} bills, {result["votes"]} votes, {result["speeches"]} speeches '
+          f'({rows / result["seconds"] if result["seconds"] else 0:.0f} rows/sec)')
+
+
+def backfill(first_session, last_session, processes=DEFAULT_PROCESSES, rate=althingi.DEFAULT_REQUESTS_PER_SECOND):
+    """
+    Load every session from first_session to last_session (inclusive).
+    
+    Args:
+        first_session: First session number
+        last_session: Last session number
+        processes: Number of sessions to load in parallel
+        rate: Requests per second to the API, shared by all processes
+    
+    Returns:
+        list: One result dict per session (see backfill_session)
+    """
+    sessions = list(range(min(first_session, last_session), max(first_session, last_session) + 1))
+    started = time.monotonic()
+    context = multiprocessing.get_context('spawn')
+    rate_limiter = althingi.SharedRateLimiter(rate, context)
+    althingi.set_rate_limiter(rate_limiter)
+    
+    print(f'Backfilling sessions {sessions[0]}-{sessions[-1]} ({processes} processes, {rate} req/s in total)')
+    print(f'Session logs: {os.path.dirname(log_path(sessions[0]))}')
+    
+    # MPs are shared between sessions, so they are loaded one session at a time
+    print('\n=== Parties and MPs ===')
+    for idx, session_number in enumerate(sessions, 1):
+        stage_started = time.monotonic()
+        try:
+            with session_log(session_number, mode='w'):
+                tasks.fetch_parties_stage(session_number)
+                tasks.fetch_mps_stage(session_number)
+        except Exception as e:
+            print(f'[{idx}/{len(sessions)}] ✗ Session {session_number} parties and MPs failed: {str(e)}')
+            continue
+        print(f'[{idx}/{len(sessions)}] Session {session_number} parties and MPs in {time.monotonic() - stage_started:.0f}s')
+    
+    print('\n=== Bills, voting records and speeches ===')
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=max(1, processes),
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(rate_limiter,),
+    ) as executor:
+        futures = [executor.submit(backfill_session, session_number) for session_number in sessions]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print_progress(len(results), len(sessions), result)
+    
+    print('\n=== Topics, statistics and dashboard rollups ===')
+    for session_number in sessions:
+        with session_log(session_number):
+            try:
+                tasks.assign_topics_stage(session_number)
+            except Exception as e:
+                print(f'Warning: Could not assign topics: {str(e)}')
+    tasks.refresh_statistics_stage(None)
+    tasks.refresh_session_stats_stage(None)
+    
+    results.sort(key=lambda result: result['session'])
+    elapsed = time.monotonic() - started
+    rows = sum(result['bills'] + result['votes'] + result['speeches'] for result in results)
+    failed = [result['session'] for result in results if result['error']]
+    
+    print(f'\n=== Summary ===')
+    print(f'{"session":>8} {"wall s":>8} {"bills":>7} {"votes":>8} {"speeches":>9} {"rows/s":>8}  status')
+    for result in results:
+        seconds = result['seconds'] or 1
+        rows_per_second = (result['bills'] + result['votes'] + result['speeches']) / seconds
+        print(f'{result["session"]:>8} {result["seconds"]:>8.0f} {result["bills"]:>7} {result["votes"]:>8} '
+              f'{result["speeches"]:>9} {rows_per_second:>8.0f}  {result["error"] or "ok"}')
+    print(f'Sessions: {len(sessions)}, failed: {len(failed)}' + (f' {failed}' if failed else ''))
+    print(f'Elapsed: {elapsed:.0f}s ({rows / elapsed if elapsed else 0:.0f} rows/sec overall)')
+    
+    return results
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        sys.exit(0)
+    if len(args) < 2:
+        print('Error: First and last session numbers are required')
+        print('Usage: python backfill.py <first_session> <last_session> [--processes N] [--rate N]')
+        print('Example: python backfill.py 120 157')
+        sys.exit(1)
+    
+    backfill(
+        int(args[0]),
+        int(args[1]),
+        processes=parse_int_option(args, ['--processes', '-p'], DEFAULT_PROCESSES),
+        rate=parse_int_option(args, ['--rate'], althingi.DEFAULT_REQUESTS_PER_SECOND),
+    )
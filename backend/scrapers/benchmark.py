@@ -0,0 +1,233 @@
+"""
+Benchmark the ingest pipeline against the local Alþingi stand-in server
+Runs every scraper stage on a throwaway test database and reports wall time, requests and DB queries per entity
+
+Usage:
+    python benchmark.py [--mps N] [--bills N] [--speeches N] [--latency MS] [--error-rate P]
+                        [--rate N] [--passes N] [--verbose]
+    python benchmark.py --memory [--speeches N]
+
+Examples:
+    python benchmark.py
+    python benchmark.py --bills 500 --latency 40 --error-rate 0.02 --passes 2
+    python benchmark.py --memory --speeches 50000
+
+--memory compares the peak memory of parsing a session speech list as one
+tree against streaming it with althingi.iter_elements, and measures the
+real session ingest (download, cache, archive, parse and batched writes)
+against the stand-in server on a test database.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+import django
+
+# Setup Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from parliament import althingi
+from parliament.models import Bill, MP, MPInterest, PoliticalParty, Speech, Vote
+from scrapers.standin_server import StandinServer, SyntheticAlthingi, parse_option
+
+
+def build_stages(session_number):
+    """(name, run, row count) for each pipeline stage, in dependency order"""
+    from scrapers.assign_topics import assign_topics
+    from scrapers.fetch_bills import fetch_bills
+    from scrapers.fetch_interests import fetch_all_mp_interests
+    from scrapers.fetch_mps import fetch_mps
+    from scrapers.fetch_parties import fetch_parties
+    from scrapers.fetch_speeches import fetch_session_speeches
+    from scrapers.fetch_transcripts import fetch_transcripts
+    from scrapers.fetch_voting_records import fetch_all_voting_records
+
+    return [
+        ('parties', lambda: fetch_parties(session_number), PoliticalParty.objects.count),
+        ('mps', lambda: fetch_mps(session_number), MP.objects.count),
+        ('bills', lambda: fetch_bills(session_number, with_topics=False), Bill.objects.count),
+        ('votes', lambda: fetch_all_voting_records(session_number), Vote.objects.count),
+        ('speeches', lambda: fetch_session_speeches(session_number), Speech.objects.count),
+        ('transcripts', lambda: fetch_transcripts(session_number), Speech.objects.exclude(text='').count),
+        ('interests', fetch_all_mp_interests, MPInterest.objects.count),
+        ('topics', lambda: assign_topics(session=session_number), Bill.topics.through.objects.count),
+    ]
+
+
+@contextlib.contextmanager
+def standin_environment(data, latency=0.0, error_rate=0.0, rate=0):
+    """
+    Serve `data` from a stand-in server and point the scrapers at it.
+
+    The real database, response cache and archive are left untouched: the
+    scrapers use Django's test database and temporary cache, archive and
+    cursor directories.
+    """
+    server = StandinServer(('127.0.0.1', 0), data=data, latency=latency, error_rate=error_rate).start()
+
+    scratch = tempfile.TemporaryDirectory(prefix='althingi-benchmark-')
+    settings.ALTHINGI_API_ROOT = server.root
+    settings.ALTHINGI_CACHE_DIR = os.path.join(scratch.name, 'cache')
+    settings.ALTHINGI_ARCHIVE_DIR = os.path.join(scratch.name, 'archive')
+    settings.ALTHINGI_STATE_DIR = os.path.join(scratch.name, 'state')
+    althingi.set_replay(None)
+    althingi.set_rate_limit(rate)
+
+    old_database_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield server
+    finally:
+        connection.creation.destroy_test_db(old_database_name, verbosity=0)
+        server.shutdown()
+        scratch.cleanup()
+
+
+def run_stage(server, name, run, count_rows, verbose=False):
+    """Run one stage and measure it"""
+    requests_before = server.requests
+    errors_before = server.errors
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    started = time.monotonic()
+    with output, CaptureQueriesContext(connection) as queries:
+        run()
+    elapsed = time.monotonic() - started
+
+    return {
+        'stage': name,
+        'seconds': elapsed,
+        'requests': server.requests - requests_before,
+        'errors': server.errors - errors_before,
+        'queries': len(queries.captured_queries),
+        'rows': count_rows(),
+    }
+
+
+def print_report(results):
+    header = f'{"stage":<11} {"wall s":>8} {"requests":>9} {"503s":>6} {"queries":>8} {"rows":>7} {"req/row":>8} {"q/row":>7}'
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        rows = r['rows'] or 1
+        print(f'{r["stage"]:<11} {r["seconds"]:>8.2f} {r["requests"]:>9} {r["errors"]:>6} {r["queries"]:>8} '
+              f'{r["rows"]:>7} {r["requests"] / rows:>8.2f} {r["queries"] / rows:>7.2f}')
+    total = sum(r['seconds'] for r in results)
+    print(f'{"total":<11} {total:>8.2f} {sum(r["requests"] for r in results):>9} '
+          f'{sum(r["errors"] for r in results):>6} {sum(r["queries"] for r in results):>8}')
+
+
+def benchmark(session_number=157, mps=63, bills=200, speeches=3000, latency=0.0, error_rate=0.0,
+              rate=0, passes=1, verbose=False):
+    """
+    Run the full ingest against a stand-in server on a fresh test database.
+
+    Returns:
+        list: One list of stage results per pass
+    """
+    data = SyntheticAlthingi(session_number=session_number, mps=mps, bills=bills, speeches=speeches)
+    all_results = []
+    with standin_environment(data, latency, error_rate, rate) as server:
+        for number in range(1, passes + 1):
+            print(f'\n=== Pass {number}/{passes} against {server.root} '
+                  f'({mps} MPs, {bills} bills, {speeches} speeches, {latency * 1000:.0f}ms latency, '
+                  f'{error_rate:.0%} errors) ===')
+            results = [
+                run_stage(server, name, run, count_rows, verbose)
+                for name, run, count_rows in build_stages(session_number)
+            ]
+            print_report(results)
+            all_results.append(results)
+
+    return all_results
+
+
+def measure_parse(name, parse):
+    """Run parse() and return (name, items parsed, seconds, peak traced bytes)"""
+    tracemalloc.start()
+    started = time.monotonic()
+    try:
+        count = parse()
+        elapsed = time.monotonic() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return name, count, elapsed, peak
+
+
+def memory_benchmark(speeches=20000):
+    """
+    Compare peak memory of tree and streaming parses of a session speech list.
+
+    The tree and stream runs parse every <ræða> with parse_speech and keep
+    nothing, so the difference is the memory held by the element tree. The
+    document is built before tracing starts, so their peaks exclude it. The
+    ingest run is fetch_session_speeches end to end: its peak includes the
+    downloaded body, the cache and archive writes and the batches of rows
+    written to the database.
+
+    Returns:
+        list: (name, items, seconds, peak bytes) per run
+    """
+    from scrapers.fetch_mps import fetch_mps
+    from scrapers.fetch_speeches import fetch_session_speeches, parse_speech
+
+    data = SyntheticAlthingi(mps=63, speeches=speeches)
+    document = data.speech_list({})
+    print(f'Speech list: {speeches} speeches, {len(document) / 1024 / 1024:.1f} MB of XML')
+
+    def tree():
+        root = ET.fromstring(document)
+        return sum(1 for elem in root.findall('.//ræða') if parse_speech(elem) is not None)
+
+    def stream():
+        return sum(1 for elem in althingi.iter_elements(document, 'ræða') if parse_speech(elem) is not None)
+
+    def ingest():
+        with contextlib.redirect_stdout(io.StringIO()):
+            fetch_session_speeches(data.session_number, full=True)
+        return Speech.objects.count()
+
+    results = [measure_parse('tree', tree), measure_parse('stream', stream)]
+    with standin_environment(data):
+        with contextlib.redirect_stdout(io.StringIO()):
+            fetch_mps(data.session_number)
+        results.append(measure_parse('ingest', ingest))
+
+    print(f'{"run":<8} {"speeches":>9} {"seconds":>8} {"peak MB":>8}')
+    for name, count, elapsed, peak in results:
+        print(f'{name:<8} {count:>9} {elapsed:>8.2f} {peak / 1024 / 1024:>8.1f}')
+    return results
+
+
+if __name__ == '__main__':
+    argv = sys.argv[1:]
+    if '--help' in argv or '-h' in argv:
+        print(__doc__)
+        sys.exit(0)
+
+    if '--memory' in argv:
+        memory_benchmark(speeches=parse_option(argv, '--speeches', 20000))
+        sys.exit(0)
+
+    benchmark(
+        session_number=parse_option(argv, '--session', 157),
+        mps=parse_option(argv, '--mps', 63),
+        bills=parse_option(argv, '--bills', 200),
+        speeches=parse_option(argv, '--speeches', 3000),
+        latency=parse_option(argv, '--latency', 0, float) / 1000,
+        error_rate=parse_option(argv, '--error-rate', 0.0, float),
+        rate=parse_option(argv, '--rate', 0),
+        passes=parse_option(argv, '--passes', 1),
+        verbose='--verbose' in argv,
+    )
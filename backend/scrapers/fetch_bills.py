@@ -8,6 +8,7 @@ import xml.etree.ElementTree as ET
 from datetime import datetime
 import os
 import sys
+import time
 import django
 from django.utils.text import slugify
 from django.db import transaction
@@ -18,8 +19,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 django.setup()
 
+from parliament import althingi, caching
+from parliament.pipeline import Pipeline
 from parliament.models import Bill, MP, ParliamentSession
+from parliament.stats import refresh_mp_statistics
 from parliament.utils import get_or_create_session
+from analytics.session_stats import refresh_session_stats
 
 
 def map_bill_status(status_text):
@@ -125,269 +130,487 @@ def determine_submitter_type_from_skjalategund(skjalategund):
         return 'member'
 
 
-def process_bill_sponsors(bill_obj, root, session):
-    """Process sponsors and co-sponsors for a bill"""
+def fetch_bill_documents(session_number, bill_number):
+    """
+    Download the XML for a bill and its first þingskjal.
+    
+    Runs in a worker thread, so it only fetches and parses - all database
+    work happens in the caller, in bill number order.
+    
+    Returns:
+        dict with 'bill_number', 'status_code', 'root', 'doc_root' and 'warnings'
+    """
+    result = {
+        'bill_number': bill_number,
+        'status_code': None,
+        'root': None,
+        'doc_root': None,
+        'warnings': [],
+    }
+    
+    url = f'https://www.althingi.is/altext/xml/thingmalalisti/thingmal/?lthing={session_number}&malnr={bill_number}'
+    try:
+        response = althingi.get(url)
+    except requests.RequestException as e:
+        result['warnings'].append(f'Warning: Error fetching bill {bill_number}: {str(e)}')
+        return result
+    
+    result['status_code'] = response.status_code
+    if response.status_code != 200:
+        return result
+    
+    try:
+        result['root'] = ET.fromstring(response.content)
+    except ET.ParseError as e:
+        result['warnings'].append(f'Warning: XML parsing error for bill {bill_number}: {str(e)}')
+        return result
+    
+    # Find the first document (þingskjal) which is usually the bill itself
+    first_doc = result['root'].find(".//þingskjöl/þingskjal")
+    doc_number = first_doc.get("skjalsnúmer") if first_doc is not None else None
+    if not doc_number:
+        return result
+    
+    doc_url = f'https://www.althingi.is/altext/xml/thingskjol/thingskjal/?lthing={session_number}&skjalnr={doc_number}'
+    try:
+        doc_response = althingi.get(doc_url)
+        if doc_response.status_code != 200:
+            result['warnings'].append(f'  Warning: Error fetching document {doc_number}: HTTP {doc_response.status_code}')
+        else:
+            result['doc_root'] = ET.fromstring(doc_response.content)
+    except requests.RequestException as e:
+        result['warnings'].append(f'  Warning: Error fetching document: {str(e)}')
+    except ET.ParseError as e:
+        result['warnings'].append(f'  Warning: Error parsing document XML: {str(e)}')
+    
+    return result
+
+
+def is_empty_bill(root):
+    """Check whether a bill XML document is an empty placeholder"""
+    if root.find(".//mál") is None:
+        return True
+    
+    required_empty_elements = [
+        ".//þingskjöl",
+        ".//atkvæðagreiðslur",
+        ".//umsagnabeiðnir[@frestur='']",
+        ".//erindaskrá",
+        ".//ræður"
+    ]
+    
+    for elem_path in required_empty_elements:
+        elem = root.find(elem_path)
+        if elem is not None and len(elem) > 0:
+            return False
+    
+    return True
+
+
+def process_bill_sponsors(bill_obj, doc_root, mp_map=None):
+    """
+    Set sponsors and co-sponsors for a bill from its þingskjal XML
+    
+    Only touches the M2M rows when the sponsor lists actually changed.
+    
+    Args:
+        mp_map: Preloaded althingi_id -> MP pk map (loaded here if not given)
+    
+    Returns:
+        set: pks of MPs added to or removed from the sponsor lists
+    """
+    changed_mps = set()
     try:
-        # Find the first document (þingskjal) which is usually the bill itself
-        first_doc = root.find(".//þingskjöl/þingskjal")
-        if first_doc is None:
-            return
+        if doc_root is None:
+            return changed_mps
         
-        # Get document number and fetch its details
-        doc_number = first_doc.get("skjalsnúmer")
-        if not doc_number:
-            return
+        # Find sponsors element
+        sponsors_elem = doc_root.find(".//flutningsmenn")
+        if sponsors_elem is None:
+            return changed_mps
         
-        # Fetch document details
-        url = f'https://www.althingi.is/altext/xml/thingskjol/thingskjal/?lthing={session.session_number}&skjalnr={doc_number}'
-        try:
-            response = requests.get(url)
-            if response.status_code != 200:
-                print(f'  Warning: Error fetching document {doc_number}: HTTP {response.status_code}')
-                return
-            
-            # Parse document XML
-            doc_root = ET.fromstring(response.content)
-            
-            # Find sponsors element
-            sponsors_elem = doc_root.find(".//flutningsmenn")
-            if sponsors_elem is None:
-                return
+        if mp_map is None:
+            mp_map = dict(MP.objects.values_list('althingi_id', 'pk'))
+        
+        # First sponsor is the main sponsor, others are co-sponsors
+        sponsor_ids = set()
+        cosponsor_ids = set()
+        for idx, sponsor_elem in enumerate(sponsors_elem.findall(".//flutningsmaður")):
+            mp_id = sponsor_elem.get("id")
+            if not mp_id:
+                continue
             
-            # Clear existing sponsors
-            bill_obj.sponsors.clear()
-            bill_obj.cosponsors.clear()
+            mp_pk = mp_map.get(int(mp_id))
+            if mp_pk is None:
+                print(f'  Warning: MP with ID {mp_id} not found')
+                continue
             
-            # Process each sponsor
-            for idx, sponsor_elem in enumerate(sponsors_elem.findall(".//flutningsmaður")):
-                mp_id = sponsor_elem.get("id")
-                if not mp_id:
-                    continue
-                
-                try:
-                    mp = MP.objects.get(althingi_id=mp_id)
-                    
-                    # First sponsor is the main sponsor, others are co-sponsors
-                    if idx == 0:
-                        bill_obj.sponsors.add(mp)
-                        # Update MP's sponsored bills count
-                        mp.bills_sponsored = Bill.objects.filter(sponsors=mp).count()
-                        mp.save(update_fields=['bills_sponsored'])
-                        print(f'  + Primary sponsor: {mp.full_name}')
-                    else:
-                        bill_obj.cosponsors.add(mp)
-                        # Update MP's co-sponsored bills count
-                        mp.bills_cosponsored = Bill.objects.filter(cosponsors=mp).count()
-                        mp.save(update_fields=['bills_cosponsored'])
-                        print(f'  + Co-sponsor: {mp.full_name}')
-                        
-                except MP.DoesNotExist:
-                    print(f'  Warning: MP with ID {mp_id} not found')
-                    continue
-                
-        except requests.RequestException as e:
-            print(f'  Warning: Error fetching document: {str(e)}')
-        except ET.ParseError as e:
-            print(f'  Warning: Error parsing document XML: {str(e)}')
+            if idx == 0:
+                sponsor_ids.add(mp_pk)
+            else:
+                cosponsor_ids.add(mp_pk)
+        
+        old_sponsor_ids = set(bill_obj.sponsors.values_list('pk', flat=True))
+        if old_sponsor_ids != sponsor_ids:
+            bill_obj.sponsors.set(sponsor_ids)
+            changed_mps |= old_sponsor_ids ^ sponsor_ids
+            print(f'  + Sponsors: {len(sponsor_ids)} primary')
+        
+        old_cosponsor_ids = set(bill_obj.cosponsors.values_list('pk', flat=True))
+        if old_cosponsor_ids != cosponsor_ids:
+            bill_obj.cosponsors.set(cosponsor_ids)
+            changed_mps |= old_cosponsor_ids ^ cosponsor_ids
+            print(f'  + Co-sponsors: {len(cosponsor_ids)}')
             
     except Exception as e:
         print(f'  Warning: Error processing bill sponsors: {str(e)}')
+    
+    return changed_mps
+
+
+def save_bill(session, bill_number, root, doc_root, index_digest='', source_digest='', mp_map=None, affected_mps=None):
+    """
+    Create or update a bill from its XML documents.
+    
+    MPs whose sponsor lists changed are added to `affected_mps`, if given,
+    so their statistics can be recounted once after the run.
+    
+    Returns:
+        True if the bill was created, False if updated, None if skipped
+    """
+    session_number = session.session_number
+    
+    # Extract basic bill information
+    title = root.find(".//málsheiti")
+    bill_type_elem = root.find(".//málstegund")
+    status = root.find(".//staðamáls")
+    
+    # Skip if no title
+    if title is None or not title.text:
+        print(f'  Warning: Skipping bill {bill_number} - No title found')
+        return None
+    
+    title_text = html.unescape(title.text.strip())
+    
+    # Extract bill type from the <heiti> child element of <málstegund>
+    bill_type_text = "Unknown"
+    if bill_type_elem is not None:
+        heiti = bill_type_elem.find("heiti")
+        if heiti is not None and heiti.text:
+            bill_type_text = html.unescape(heiti.text.strip())
+    
+    status_text = html.unescape(status.text.strip()) if status is not None and status.text else "Unknown"
+    
+    # Create a unique slug
+    base_slug = slugify(title_text)[:180]
+    slug = base_slug
+    counter = 1
+    while Bill.objects.filter(session=session, slug=slug).exclude(althingi_id=bill_number).exists():
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    
+    # Find document info for introduced date
+    doc_info = root.find(".//þingskjal")
+    introduced_date = None
+    if doc_info is not None:
+        distribution = doc_info.find("útbýting")
+        if distribution is not None and distribution.text:
+            try:
+                date_text = distribution.text.split()[0]
+                introduced_date = datetime.strptime(date_text, '%Y-%m-%d').date()
+            except (ValueError, IndexError):
+                pass
+    
+    # Extract vote date from the last voting record (final vote)
+    vote_date = None
+    voting_records = root.findall('.//atkvæðagreiðsla')
+    if voting_records:
+        # Get the last voting record (final vote)
+        last_vote = voting_records[-1]
+        vote_time = last_vote.find('tími')
+        if vote_time is not None and vote_time.text:
+            try:
+                # Extract date from datetime string (format: YYYY-MM-DDTHH:MM:SS)
+                date_text = vote_time.text.split('T')[0]
+                vote_date = datetime.strptime(date_text, '%Y-%m-%d').date()
+            except (ValueError, IndexError):
+                pass
+    
+    # Create or update the bill
+    with transaction.atomic():
+        # Extract submitter type from the first þingskjal's skjalategund child element
+        submitter_type = 'member'  # default
+        first_thingskjal = root.find(".//þingskjal")
+        if first_thingskjal is not None:
+            skjalategund_elem = first_thingskjal.find("skjalategund")
+            if skjalategund_elem is not None and skjalategund_elem.text:
+                skjalategund = html.unescape(skjalategund_elem.text.strip())
+                submitter_type = determine_submitter_type_from_skjalategund(skjalategund)
+        
+        bill, created = Bill.objects.update_or_create(
+            althingi_id=bill_number,
+            session=session,
+            defaults={
+                'title': title_text,
+                'slug': slug,
+                'description': f"{bill_type_text} - {status_text}",
+                'status': map_bill_status(status_text),
+                'bill_type': map_bill_type(bill_type_text),
+                'submitter_type': submitter_type,
+                'introduced_date': introduced_date or session.start_date,
+                'vote_date': vote_date,  # Add vote date
+                'index_digest': index_digest,
+                'source_digest': source_digest,
+                'url': f'https://www.althingi.is/thingstorf/thingmalalistar-eftir-thingum/ferill/?ltg={session_number}&mnr={bill_number}'
+            }
+        )
+        
+        # Process sponsors and co-sponsors
+        changed_mps = process_bill_sponsors(bill, doc_root, mp_map)
+        if affected_mps is not None:
+            affected_mps |= changed_mps
+    
+    if created:
+        print(f'✓ Created bill {bill_number}: {title_text[:60]}...')
+    else:
+        print(f'✓ Updated bill {bill_number}: {title_text[:60]}...')
+    
+    return created
 
 
-def fetch_bills(session_number):
-    """Fetch bills from Alþingi XML API"""
-    print(f'Fetching bills for session {session_number}...')
+def select_changed_bills(session, bill_index, refresh_all=False):
+    """
+    Pick the bills from the session bill list that need to be fetched.
+    
+    A bill is skipped when its list entry is unchanged since the last run
+    and it has reached a final status. Open bills are always refetched,
+    since new documents and votes do not show up in the list entry.
+    
+    Returns:
+        list: (bill_number, index_digest) tuples to fetch
+    """
+    known = {
+        althingi_id: (index_digest, status)
+        for althingi_id, index_digest, status in Bill.objects.filter(session=session).values_list(
+            'althingi_id', 'index_digest', 'status'
+        )
+    }
+    
+    selected = []
+    for bill_number, mal_elem in bill_index:
+        digest = althingi.element_digest(mal_elem)
+        stored_digest, status = known.get(bill_number, ('', None))
+        if not refresh_all and stored_digest == digest and status in Bill.FINAL_STATUSES:
+            continue
+        selected.append((bill_number, digest))
+    
+    return selected
+
+
+def digest_bill_documents(result):
+    """
+    Parse stage for fetched bill documents: flag empty bills and hash the
+    source XML, so the writer only has to compare digests.
+    """
+    root = result['root']
+    if result['status_code'] == 200 and root is not None and not is_empty_bill(root):
+        result['digest'] = althingi.source_digest(root, result['doc_root'])
+    return result
+
+
+def process_bill_result(session, result, index_digest, stored_digests, refresh_all, mp_map, affected_mps):
+    """
+    Save one downloaded bill.
+    
+    Returns:
+        'created', 'updated', 'skipped' (source XML unchanged), 'empty' (no
+        content yet), or None if the bill could not be fetched or saved
+    """
+    bill_number = result['bill_number']
+    
+    for warning in result['warnings']:
+        print(warning)
+    
+    root = result['root']
+    if result['status_code'] != 200 or root is None:
+        print(f'✗ Could not fetch bill {bill_number} (HTTP {result["status_code"]})')
+        return None
+    
+    if 'digest' not in result:
+        # Empty bill (see digest_bill_documents)
+        return 'empty'
+    
+    # Skip the write (and sponsor recounts) if the source XML is unchanged
+    digest = result['digest']
+    if not refresh_all and stored_digests.get(bill_number) == digest:
+        Bill.objects.filter(session=session, althingi_id=bill_number).exclude(
+            index_digest=index_digest
+        ).update(index_digest=index_digest)
+        return 'skipped'
+    
+    try:
+        with transaction.atomic():
+            created = save_bill(
+                session, bill_number, root, result['doc_root'], index_digest, digest, mp_map, affected_mps
+            )
+    except Exception as e:
+        print(f'✗ Error processing bill {bill_number}: {str(e)}')
+        return None
+    
+    if created is True:
+        return 'created'
+    if created is False:
+        return 'updated'
+    return None
+
+
+def fetch_bills(session_number, workers=althingi.DEFAULT_WORKERS, refresh_all=False, with_topics=True,
+                update_statistics=True, checkpoint=None):
+    """
+    Fetch bills from Alþingi XML API
+    
+    The bills to fetch come from the session bill list (thingmalalisti).
+    They run through a fetch -> parse -> write pipeline: bill and þingskjal
+    XML is downloaded concurrently (rate limited per host), hashed by
+    separate parse threads, and written here in bill number order, one
+    transaction per batch of bills.
+    
+    Args:
+        session_number: Parliament session number
+        workers: Number of concurrent downloads (1 fetches sequentially)
+        refresh_all: If True, refetch bills whose list entry is unchanged
+        with_topics: If True, assign topics to the session's bills afterwards
+        update_statistics: If True, recount sponsorship statistics of the MPs
+            whose sponsor lists changed (the Celery pipeline does this once
+            for all MPs at the end instead)
+        checkpoint: Optional RunCheckpoint; bills up to its 'bill' cursor
+            are skipped and the cursor advances as bills are written, up to
+            the first bill that could not be fetched or saved
+    """
+    print(f'Fetching bills for session {session_number} ({workers} workers, {althingi.rate_limiter.rate} req/s)...')
     
     # Get or create session (will update active status automatically)
     session = get_or_create_session(session_number, update_active_status=True)
     
-    bills_created = 0
-    bills_updated = 0
-    empty_bill_count = 0
-    bill_number = 1
-    
-    # Continue fetching until we find 8 consecutive empty bills
-    while empty_bill_count < 8:
-        try:
-            # Fetch individual bill data
-            url = f'https://www.althingi.is/altext/xml/thingmalalisti/thingmal/?lthing={session_number}&malnr={bill_number}'
-            response = requests.get(url)
-            
-            if response.status_code != 200:
-                empty_bill_count += 1
-                bill_number += 1
-                continue
-            
-            # Parse XML
-            try:
-                root = ET.fromstring(response.content)
-                
-                # Check if this is an empty bill
-                bill_element = root.find(".//mál")
-                if bill_element is None:
-                    empty_bill_count += 1
-                    bill_number += 1
-                    continue
-                
-                # Check for empty bill structure
-                is_empty = True
-                required_empty_elements = [
-                    ".//þingskjöl",
-                    ".//atkvæðagreiðslur",
-                    ".//umsagnabeiðnir[@frestur='']",
-                    ".//erindaskrá",
-                    ".//ræður"
-                ]
-                
-                for elem_path in required_empty_elements:
-                    elem = root.find(elem_path)
-                    if elem is not None and len(elem) > 0:
-                        is_empty = False
-                        break
-                
-                if is_empty:
-                    empty_bill_count += 1
-                    bill_number += 1
-                    continue
-                else:
-                    empty_bill_count = 0  # Reset counter when we find a valid bill
-                
-                # Extract basic bill information
-                title = root.find(".//málsheiti")
-                bill_type_elem = root.find(".//málstegund")
-                status = root.find(".//staðamáls")
-                
-                # Skip if no title
-                if title is None or not title.text:
-                    print(f'  Warning: Skipping bill {bill_number} - No title found')
-                    bill_number += 1
-                    continue
-                
-                title_text = html.unescape(title.text.strip())
-                
-                # Extract bill type from the <heiti> child element of <málstegund>
-                bill_type_text = "Unknown"
-                if bill_type_elem is not None:
-                    heiti = bill_type_elem.find("heiti")
-                    if heiti is not None and heiti.text:
-                        bill_type_text = html.unescape(heiti.text.strip())
-                
-                status_text = html.unescape(status.text.strip()) if status is not None and status.text else "Unknown"
-                
-                # Create a unique slug
-                base_slug = slugify(title_text)[:180]
-                slug = base_slug
-                counter = 1
-                while Bill.objects.filter(session=session, slug=slug).exists():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-                
-                # Find document info for introduced date
-                doc_info = root.find(".//þingskjal")
-                introduced_date = None
-                if doc_info is not None:
-                    distribution = doc_info.find("útbýting")
-                    if distribution is not None and distribution.text:
-                        try:
-                            date_text = distribution.text.split()[0]
-                            introduced_date = datetime.strptime(date_text, '%Y-%m-%d').date()
-                        except (ValueError, IndexError):
-                            pass
-                
-                # Extract vote date from the last voting record (final vote)
-                vote_date = None
-                voting_records = root.findall('.//atkvæðagreiðsla')
-                if voting_records:
-                    # Get the last voting record (final vote)
-                    last_vote = voting_records[-1]
-                    vote_time = last_vote.find('tími')
-                    if vote_time is not None and vote_time.text:
-                        try:
-                            # Extract date from datetime string (format: YYYY-MM-DDTHH:MM:SS)
-                            date_text = vote_time.text.split('T')[0]
-                            vote_date = datetime.strptime(date_text, '%Y-%m-%d').date()
-                        except (ValueError, IndexError):
-                            pass
-                
-                # Create or update the bill
-                with transaction.atomic():
-                    # Extract submitter type from the first þingskjal's skjalategund child element
-                    submitter_type = 'member'  # default
-                    first_thingskjal = root.find(".//þingskjal")
-                    if first_thingskjal is not None:
-                        skjalategund_elem = first_thingskjal.find("skjalategund")
-                        if skjalategund_elem is not None and skjalategund_elem.text:
-                            skjalategund = html.unescape(skjalategund_elem.text.strip())
-                            submitter_type = determine_submitter_type_from_skjalategund(skjalategund)
-                    
-                    bill, created = Bill.objects.update_or_create(
-                        althingi_id=bill_number,
-                        session=session,
-                        defaults={
-                            'title': title_text,
-                            'slug': slug,
-                            'description': f"{bill_type_text} - {status_text}",
-                            'status': map_bill_status(status_text),
-                            'bill_type': map_bill_type(bill_type_text),
-                            'submitter_type': submitter_type,
-                            'introduced_date': introduced_date or session.start_date,
-                            'vote_date': vote_date,  # Add vote date
-                            'url': f'https://www.althingi.is/thingstorf/thingmalalistar-eftir-thingum/ferill/?ltg={session_number}&mnr={bill_number}'
-                        }
+    bill_index = althingi.fetch_bill_index(session_number)
+    if bill_index is None:
+        print('Error: Could not fetch the bill list, aborting')
+        return
+    
+    to_fetch = sorted(select_changed_bills(session, bill_index, refresh_all))
+    digests = dict(to_fetch)
+    print(f'Found {len(bill_index)} bills in the bill list, {len(to_fetch)} new or changed')
+    
+    pending = to_fetch
+    resume_after = checkpoint.get('bill') if checkpoint else None
+    if resume_after is not None:
+        pending = [(bill_number, digest) for bill_number, digest in to_fetch if bill_number > resume_after]
+        print(f'Resuming after bill {resume_after} ({len(pending)} left)')
+    
+    # Digests of the documents each bill was last saved from
+    stored_digests = dict(Bill.objects.filter(session=session).values_list('althingi_id', 'source_digest'))
+    mp_map = dict(MP.objects.values_list('althingi_id', 'pk'))
+    
+    bills_unchanged = len(bill_index) - len(to_fetch)
+    affected_mps = set()
+    started = time.monotonic()
+    
+    outcomes = {'created': 0, 'updated': 0, 'skipped': 0}
+    cursor = {'blocked': False}
+    
+    def write(batch):
+        saved = []
+        with transaction.atomic():
+            for bill_number, result in batch:
+                outcome = None
+                if result is not None:
+                    outcome = process_bill_result(
+                        session, result, digests[bill_number], stored_digests, refresh_all, mp_map, affected_mps
                     )
-                    
-                    # Process sponsors and co-sponsors
-                    process_bill_sponsors(bill, root, session)
-                    
-                    if created:
-                        bills_created += 1
-                        print(f'✓ Created bill {bill_number}: {title_text[:60]}...')
-                    else:
-                        bills_updated += 1
-                        print(f'✓ Updated bill {bill_number}: {title_text[:60]}...')
-                
-                bill_number += 1
-            
-            except ET.ParseError as e:
-                print(f'Warning: XML parsing error for bill {bill_number}: {str(e)}')
-                bill_number += 1
-                continue
-                
-        except Exception as e:
-            print(f'✗ Error processing bill {bill_number}: {str(e)}')
-            bill_number += 1
-            continue
+                if outcome in outcomes:
+                    outcomes[outcome] += 1
+                saved.append((bill_number, outcome is not None))
+        
+        # Stop at the first bill that was not saved, so a resumed run retries it
+        if checkpoint:
+            for bill_number, ok in saved:
+                cursor['blocked'] = cursor['blocked'] or not ok
+                if not cursor['blocked']:
+                    checkpoint.advance('bill', bill_number)
+    
+    pipeline = Pipeline(
+        'Bills',
+        fetch=lambda bill_number: fetch_bill_documents(session_number, bill_number),
+        parse=lambda bill_number, result: digest_bill_documents(result),
+        write=write,
+        fetch_workers=workers,
+    )
+    try:
+        pipeline.run([bill_number for bill_number, _ in pending])
+    finally:
+        if checkpoint:
+            checkpoint.save()
+    
+    bills_created = outcomes['created']
+    bills_updated = outcomes['updated']
+    bills_skipped = outcomes['skipped']
+    
+    if update_statistics and affected_mps:
+        refresh_mp_statistics(affected_mps)
+    
+    elapsed = time.monotonic() - started
+    total = bills_created + bills_updated
     
     print(f'\n=== Summary ===')
     print(f'Bills created: {bills_created}')
     print(f'Bills updated: {bills_updated}')
-    print(f'Total: {bills_created + bills_updated}')
+    print(f'Bills unchanged (skipped): {bills_unchanged}')
+    print(f'Bills fetched but unchanged (not written): {bills_skipped}')
+    print(f'Total: {total}')
+    print(f'Elapsed: {elapsed:.1f}s ({total / elapsed if elapsed else 0:.2f} bills/sec)')
+    pipeline.print_report()
+    
+    if not with_topics:
+        return
     
     # Automatically assign topics after fetching bills
     print(f'\n=== Assigning Topics ===')
     try:
-        # Import assign_topics function from the same directory
-        import importlib.util
-        scrapers_dir = os.path.dirname(os.path.abspath(__file__))
-        assign_topics_path = os.path.join(scrapers_dir, 'assign_topics.py')
-        spec = importlib.util.spec_from_file_location("assign_topics", assign_topics_path)
-        assign_topics_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(assign_topics_module)
-        assign_topics_module.assign_topics(clear_existing=False, session=session_number)
+        from scrapers.assign_topics import assign_topics
+        assign_topics(clear_existing=False, session=session_number)
         print('✓ Topics assigned successfully')
     except Exception as e:
         print(f'Warning: Could not assign topics: {str(e)}')
         print(f'You can manually run: python scrapers/assign_topics.py --session {session_number}')
 
 
+def parse_int_option(argv, names, default):
+    """Read an integer option such as --workers 8 from the command line"""
+    for i, arg in enumerate(argv):
+        if arg in names and i + 1 < len(argv):
+            try:
+                return int(argv[i + 1])
+            except ValueError:
+                print(f'Error: Invalid value for {arg}: {argv[i + 1]}')
+                sys.exit(1)
+    return default
+
+
 if __name__ == '__main__':
     # Get session number from command line (required)
     if len(sys.argv) < 2:
         print('Error: Session number is required')
-        print('Usage: python fetch_bills.py <session_number>')
+        print('Usage: python fetch_bills.py <session_number> [--workers N] [--rate N] [--all]')
         print('Example: python fetch_bills.py 157')
+        print('Example: python fetch_bills.py 157 --workers 4 --rate 5')
         sys.exit(1)
     
     session = int(sys.argv[1])
-    fetch_bills(session)
-
+    workers = parse_int_option(sys.argv, ['--workers', '-w'], althingi.DEFAULT_WORKERS)
+    althingi.set_rate_limit(parse_int_option(sys.argv, ['--rate', '-r'], althingi.DEFAULT_REQUESTS_PER_SECOND))
+    refresh_all = '--all' in sys.argv
+    fetch_bills(session, workers=workers, refresh_all=refresh_all)
+    
+    # Refresh the dashboard rollups and serve the new data from the API
+    refresh_session_stats([session])
+    caching.bump_data_version()
@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 django.setup()
 
+from parliament import althingi, caching
 from parliament.models import MP, MPInterest
 
 
@@ -68,23 +69,34 @@ def get_text_from_element(root, tag_name):
         return ""
 
 
-def fetch_mp_interests(mp_id):
-    """Fetch financial interests for a specific MP from Alþingi XML API"""
+def fetch_mp_interests(mp_id, mp=None, stored_digest=None):
+    """
+    Fetch financial interests for a specific MP from Alþingi XML API
+    
+    Args:
+        mp: The MP object, if already loaded
+        stored_digest: Digest of the interests XML last saved for this MP;
+            looked up here if not given
+    
+    Returns:
+        'created', 'updated' or 'unchanged', or None on failure
+    """
     print(f'\nFetching interests for MP ID {mp_id}...')
     
     # Get the MP object
-    try:
-        mp = MP.objects.get(althingi_id=mp_id)
-    except MP.DoesNotExist:
-        print(f'Error: MP with ID {mp_id} does not exist')
-        return
+    if mp is None:
+        try:
+            mp = MP.objects.get(althingi_id=mp_id)
+        except MP.DoesNotExist:
+            print(f'Error: MP with ID {mp_id} does not exist')
+            return None
     
     # URL for interests for this MP
     url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/hagsmunir/?nr={mp_id}'
     source_url = f'https://www.althingi.is/altext/hagsmunir/?faerslunr={mp_id}'
     
     try:
-        response = requests.get(url)
+        response = althingi.get(url)
         if response.status_code != 200:
             print(f'Error fetching interests: HTTP {response.status_code}')
             return
@@ -92,6 +104,14 @@ def fetch_mp_interests(mp_id):
         # Parse XML content
         root = ET.fromstring(response.content)
         
+        # Skip the write if the source XML is unchanged
+        digest = althingi.source_digest(root)
+        if stored_digest is None:
+            stored_digest = MPInterest.objects.filter(mp=mp).values_list('source_digest', flat=True).first()
+        if stored_digest == digest:
+            print(f'  = Interests unchanged for MP: {mp.full_name}')
+            return 'unchanged'
+        
         # Extract data using helper function
         board_positions = clean_text(get_text_from_element(root, 'launuðstjórnarseta'))
         paid_work = clean_text(get_text_from_element(root, 'launaðstarf'))
@@ -132,7 +152,8 @@ def fetch_mp_interests(mp_id):
                     'former_employer_agreements': former_employer_agreements,
                     'future_employer_agreements': future_employer_agreements,
                     'other_positions': other_positions,
-                    'source_url': source_url
+                    'source_url': source_url,
+                    'source_digest': digest
                 }
             )
             
@@ -148,6 +169,8 @@ def fetch_mp_interests(mp_id):
                 print(f'    - Business Activities: {business_activities[:80]}...')
             if board_positions:
                 print(f'    - Board Positions: {board_positions[:80]}...')
+        
+        return 'created' if created else 'updated'
     
     except requests.RequestException as e:
         print(f'Error fetching interests: {str(e)}')
@@ -157,21 +180,48 @@ def fetch_mp_interests(mp_id):
         print(f'Unexpected error: {str(e)}')
 
 
-def fetch_all_mp_interests():
-    """Fetch interests for all active MPs"""
+def fetch_all_mp_interests(checkpoint=None):
+    """
+    Fetch interests for all active MPs
+    
+    Args:
+        checkpoint: Optional RunCheckpoint; MPs up to its 'mp' cursor
+            (althingi_id) are skipped and the cursor advances per MP, up to
+            the first MP whose interests could not be fetched or saved
+    """
     print('Fetching interests for all active MPs...')
     
-    mps = MP.objects.filter(active=True)
-    total_mps = mps.count()
+    mps = list(MP.objects.filter(active=True).order_by('althingi_id'))
+    total_mps = len(mps)
     
     print(f'Found {total_mps} active MPs')
     
+    resume_after = checkpoint.get('mp') if checkpoint else None
+    if resume_after is not None:
+        mps = [mp for mp in mps if mp.althingi_id > resume_after]
+        print(f'Resuming after MP {resume_after} ({len(mps)} left)')
+    
+    stored_digests = dict(MPInterest.objects.values_list('mp_id', 'source_digest'))
+    results = {'created': 0, 'updated': 0, 'unchanged': 0}
+    blocked = False
+    
     for idx, mp in enumerate(mps, 1):
-        print(f'\n[{idx}/{total_mps}] Processing MP: {mp.full_name}')
-        fetch_mp_interests(mp.althingi_id)
+        print(f'\n[{idx}/{len(mps)}] Processing MP: {mp.full_name}')
+        result = fetch_mp_interests(mp.althingi_id, mp=mp, stored_digest=stored_digests.get(mp.pk, ''))
+        if result in results:
+            results[result] += 1
+        
+        # Stop at the first MP that failed, so a resumed run retries it
+        blocked = blocked or result is None
+        if checkpoint and not blocked:
+            checkpoint.advance('mp', mp.althingi_id)
+    
+    if checkpoint:
+        checkpoint.save()
     
     print(f'\n=== All Done ===')
     print(f'Processed interests for {total_mps} MPs')
+    print(f'Created: {results["created"]}, updated: {results["updated"]}, unchanged (skipped): {results["unchanged"]}')
 
 
 if __name__ == '__main__':
@@ -181,4 +231,6 @@ if __name__ == '__main__':
         fetch_mp_interests(mp_id)
     else:
         fetch_all_mp_interests()
-
+    
+    # Serve the new data from the API
+    caching.bump_data_version()
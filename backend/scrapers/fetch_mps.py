@@ -3,7 +3,6 @@ Fetch MPs (Members of Parliament) from Alþingi API
 Simple script to fetch and save MP data
 """
 
-import requests
 import xml.etree.ElementTree as ET
 import re
 from datetime import datetime
@@ -13,14 +12,21 @@ import django
 from django.utils.text import slugify
 from django.db import transaction
 import html
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 django.setup()
 
-from parliament.models import MP, PoliticalParty, ParliamentSession, Speech
-from parliament.utils import get_or_create_session
+from parliament import althingi, caching
+from parliament.models import MP, PoliticalParty, ParliamentSession
+from parliament.utils import get_or_create_session, touch_bills
+from analytics.session_stats import refresh_session_stats
+
+# MP profiles rarely change, so a run over several sessions reuses documents
+# fetched within this window instead of requesting them again
+PROFILE_MAX_AGE = 6 * 60 * 60
 
 
 def parse_date(date_string):
@@ -40,8 +46,152 @@ def parse_date(date_string):
         return None
 
 
-def fetch_mps(session_number):
-    """Fetch MPs from Alþingi XML API"""
+def fetch_mp_documents(althingi_id):
+    """
+    Fetch the detail, biography and seat documents of one MP
+    
+    Returns:
+        tuple: (detail_root, lifshlaup_root, thingseta_root), each None if unavailable
+    """
+    detail_root = None
+    lifshlaup_root = None
+    thingseta_root = None
+    
+    mp_detail_url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/?nr={althingi_id}'
+    mp_detail_response = althingi.get(mp_detail_url, max_age=PROFILE_MAX_AGE)
+    if mp_detail_response.status_code == 200:
+        detail_root = ET.fromstring(mp_detail_response.content)
+        
+        lifshlaup_url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/lifshlaup/?nr={althingi_id}'
+        try:
+            lifshlaup_response = althingi.get(lifshlaup_url, max_age=PROFILE_MAX_AGE)
+            if lifshlaup_response.status_code == 200:
+                lifshlaup_root = ET.fromstring(lifshlaup_response.content)
+        except Exception as e:
+            print(f'  Warning: Error fetching biography for MP {althingi_id}: {str(e)}')
+    
+    mp_thingseta_url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/thingseta/?nr={althingi_id}'
+    mp_thingseta_response = althingi.get(mp_thingseta_url, max_age=PROFILE_MAX_AGE)
+    if mp_thingseta_response.status_code == 200:
+        thingseta_root = ET.fromstring(mp_thingseta_response.content)
+    
+    return detail_root, lifshlaup_root, thingseta_root
+
+
+def parse_seats(thingseta_root):
+    """Return (latest, first) seat elements, or (None, None)"""
+    if thingseta_root is None:
+        return None, None
+    thingseta_entries = thingseta_root.findall('.//þingsetur/þingseta')
+    if not thingseta_entries:
+        return None, None
+    latest_thingseta = max(thingseta_entries, key=lambda x: int(x.find('þing').text))
+    first_thingseta = min(thingseta_entries, key=lambda x: int(x.find('þing').text))
+    return latest_thingseta, first_thingseta
+
+
+def parse_mp_profile(name, detail_root, lifshlaup_root, latest_thingseta, first_thingseta):
+    """Build the MP field values from its source documents"""
+    birth_date = None
+    email = None
+    website = ''
+    bio = ''
+    facebook_url = ''
+    twitter_url = ''
+    
+    if detail_root is not None:
+        # Get birth date
+        birth_date_elem = detail_root.find('.//fæðingardagur')
+        if birth_date_elem is not None and birth_date_elem.text:
+            birth_date = parse_date(birth_date_elem.text)
+        
+        # Get email from text content
+        text_content = ' '.join(detail_root.itertext())
+        text_content = html.unescape(text_content)
+        email_pattern = r'([\w\.]+)\s+althingi\.is'
+        email_match = re.search(email_pattern, text_content)
+        if email_match:
+            email = f"{email_match.group(1)}@althingi.is"
+        
+        # Get website
+        website_elem = detail_root.find('.//vefsíða')
+        if website_elem is not None and website_elem.text:
+            website = website_elem.text.strip()
+        
+        # Get social media URLs
+        facebook_pattern = r'https?://(?:www\.)?facebook\.com/[^"\s]+'
+        twitter_pattern = r'https?://(?:www\.)?twitter\.com/[^"\s]+'
+        
+        facebook_match = re.search(facebook_pattern, text_content)
+        if facebook_match:
+            facebook_url = facebook_match.group(0)
+        
+        twitter_match = re.search(twitter_pattern, text_content)
+        if twitter_match:
+            twitter_url = twitter_match.group(0)
+    
+    if lifshlaup_root is not None:
+        bio_text = ' '.join(lifshlaup_root.itertext()).strip()
+        # Decode HTML entities like &ndash; &mdash; &amp; etc.
+        bio_text = html.unescape(bio_text)
+        # Clean up URLs and whitespace
+        bio_text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', bio_text)
+        bio_text = re.sub(r'\s+', ' ', bio_text)
+        bio = bio_text.strip()
+    
+    # Split name into first and last name
+    name_parts = name.split()
+    first_name = " ".join(name_parts[:-1]) if len(name_parts) > 1 else name
+    last_name = name_parts[-1] if len(name_parts) > 1 else ""
+    
+    constituency = ''
+    first_elected = None
+    current_position_started = None
+    
+    if latest_thingseta is not None:
+        # Get constituency
+        constituency_elem = latest_thingseta.find('kjördæmi')
+        if constituency_elem is not None:
+            constituency = ''.join(constituency_elem.itertext()).strip()
+            constituency = html.unescape(constituency)
+        
+        # Get first elected date
+        first_date_elem = first_thingseta.find('tímabil/inn')
+        if first_date_elem is not None and first_date_elem.text:
+            first_elected = parse_date(first_date_elem.text.split()[0])
+        
+        # Get current position start date
+        current_date_elem = latest_thingseta.find('tímabil/inn')
+        if current_date_elem is not None and current_date_elem.text:
+            current_position_started = parse_date(current_date_elem.text.split()[0])
+    
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'constituency': constituency,
+        'email': email,
+        'website': website,
+        'facebook_url': facebook_url,
+        'twitter_url': twitter_url,
+        'bio': bio,
+        'birthdate': birth_date,
+        'first_elected': first_elected,
+        'current_position_started': current_position_started,
+    }
+
+
+def fetch_mps(session_number, workers=althingi.DEFAULT_WORKERS):
+    """
+    Fetch MPs from Alþingi XML API
+    
+    The detail, biography and seat documents of all MPs are fetched
+    concurrently. MPs whose documents are unchanged since the last run are
+    only linked to the session, not parsed or rewritten.
+    
+    Args:
+        session_number: Parliament session number
+        workers: Number of MPs to fetch concurrently
+    """
     print(f'Fetching MPs for session {session_number}...')
     
     # Get or create session (will update active status automatically)
@@ -50,12 +200,13 @@ def fetch_mps(session_number):
     url = f'https://www.althingi.is/altext/xml/thingmenn/?lthing={session_number}'
     
     try:
-        response = requests.get(url)
+        response = althingi.get(url)
         if response.status_code != 200:
             print(f'Error fetching MPs: HTTP {response.status_code}')
             return
         
         root = ET.fromstring(response.content)
+        mp_elements = root.findall(".//þingmaður")
         
         # Get all MPs currently linked to this session
         current_session_mps = set(session.members.values_list('althingi_id', flat=True))
@@ -63,200 +214,134 @@ def fetch_mps(session_number):
         # Track which MPs are in the API response for this session
         mps_in_api_response = set()
         
+        # Preload digests, slugs and parties once instead of querying per MP
+        stored_digests = {}
+        mp_slugs = {}
+        for mp_id, digest, slug in MP.objects.values_list('althingi_id', 'source_digest', 'slug'):
+            stored_digests[mp_id] = digest
+            mp_slugs[mp_id] = slug
+        slug_owners = {slug: mp_id for mp_id, slug in mp_slugs.items()}
+        party_map = dict(PoliticalParty.objects.exclude(althingi_id=None).values_list('althingi_id', 'pk'))
+        
+        # Unchanged MPs that still need to be linked to this session
+        to_link = []
+        
         mps_created = 0
         mps_updated = 0
+        mps_unchanged = 0
+        changed_mps = []
         
-        for mp_element in root.findall(".//þingmaður"):
+        def load(mp_element):
             try:
-                althingi_id = int(mp_element.get("id"))
-                name = mp_element.find("nafn").text.strip()
-                
-                # Track that this MP is in the API response
-                mps_in_api_response.add(althingi_id)
-                
-                # Generate image URL
-                image_url = f'https://www.althingi.is/myndir/mynd/thingmenn/{althingi_id}/org/mynd.jpg'
-                
-                # Fetch detailed MP info
-                mp_detail_url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/?nr={althingi_id}'
-                mp_detail_response = requests.get(mp_detail_url)
-                
-                birth_date = None
-                email = None
-                website = ''
-                bio = ''
-                facebook_url = ''
-                twitter_url = ''
-                
-                if mp_detail_response.status_code == 200:
-                    detail_root = ET.fromstring(mp_detail_response.content)
-                    
-                    # Get birth date
-                    birth_date_elem = detail_root.find('.//fæðingardagur')
-                    if birth_date_elem is not None and birth_date_elem.text:
-                        birth_date = parse_date(birth_date_elem.text)
+                return fetch_mp_documents(int(mp_element.get("id"))), None
+            except Exception as e:
+                return None, e
+        
+        print(f'Fetching profiles for {len(mp_elements)} MPs ({workers} workers)...')
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for mp_element, (documents, error) in zip(mp_elements, executor.map(load, mp_elements)):
+                althingi_id = None
+                try:
+                    althingi_id = int(mp_element.get("id"))
+                    name = mp_element.find("nafn").text.strip()
                     
-                    # Get email from text content
-                    text_content = ' '.join(detail_root.itertext())
-                    text_content = html.unescape(text_content)
-                    email_pattern = r'([\w\.]+)\s+althingi\.is'
-                    email_match = re.search(email_pattern, text_content)
-                    if email_match:
-                        email = f"{email_match.group(1)}@althingi.is"
+                    # Track that this MP is in the API response
+                    mps_in_api_response.add(althingi_id)
                     
-                    # Get website
-                    website_elem = detail_root.find('.//vefsíða')
-                    if website_elem is not None and website_elem.text:
-                        website = website_elem.text.strip()
+                    if error is not None:
+                        raise error
+                    detail_root, lifshlaup_root, thingseta_root = documents
                     
-                    # Get social media URLs
-                    facebook_pattern = r'https?://(?:www\.)?facebook\.com/[^"\s]+'
-                    twitter_pattern = r'https?://(?:www\.)?twitter\.com/[^"\s]+'
+                    # Get party from the latest parliamentary seat
+                    latest_thingseta, first_thingseta = parse_seats(thingseta_root)
+                    party_pk = None
+                    if latest_thingseta is not None:
+                        party_elem = latest_thingseta.find('þingflokkur')
+                        party_id = party_elem.get('id') if party_elem is not None else None
+                        if party_id:
+                            party_pk = party_map.get(party_id)
+                            if party_pk is None:
+                                print(f'  Warning: Party with ID {party_id} not found for MP {name}')
                     
-                    facebook_match = re.search(facebook_pattern, text_content)
-                    if facebook_match:
-                        facebook_url = facebook_match.group(0)
+                    # Skip the write if the source XML is unchanged
+                    digest = althingi.source_digest(
+                        mp_element, detail_root, lifshlaup_root, thingseta_root, party_pk
+                    )
+                    if stored_digests.get(althingi_id) == digest:
+                        if althingi_id not in current_session_mps:
+                            to_link.append(althingi_id)
+                        mps_unchanged += 1
+                        continue
                     
-                    twitter_match = re.search(twitter_pattern, text_content)
-                    if twitter_match:
-                        twitter_url = twitter_match.group(0)
+                    defaults = parse_mp_profile(name, detail_root, lifshlaup_root, latest_thingseta, first_thingseta)
                     
-                    # Fetch biography
-                    lifshlaup_url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/lifshlaup/?nr={althingi_id}'
-                    try:
-                        lifshlaup_response = requests.get(lifshlaup_url)
-                        if lifshlaup_response.status_code == 200:
-                            lifshlaup_root = ET.fromstring(lifshlaup_response.content)
-                            bio_text = ' '.join(lifshlaup_root.itertext()).strip()
-                            # Decode HTML entities like &ndash; &mdash; &amp; etc.
-                            bio_text = html.unescape(bio_text)
-                            # Clean up URLs and whitespace
-                            bio_text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', bio_text)
-                            bio_text = re.sub(r'\s+', ' ', bio_text)
-                            bio = bio_text.strip()
-                    except Exception as e:
-                        print(f'  Warning: Error fetching biography for MP {althingi_id}: {str(e)}')
-                
-                # Split name into first and last name
-                name_parts = name.split()
-                first_name = " ".join(name_parts[:-1]) if len(name_parts) > 1 else name
-                last_name = name_parts[-1] if len(name_parts) > 1 else ""
-                
-                # Fetch MP's party and constituency info
-                mp_thingseta_url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/thingseta/?nr={althingi_id}'
-                mp_thingseta_response = requests.get(mp_thingseta_url)
-                
-                party = None
-                constituency = ''
-                first_elected = None
-                current_position_started = None
-                
-                if mp_thingseta_response.status_code == 200:
-                    thingseta_root = ET.fromstring(mp_thingseta_response.content)
-                    thingseta_entries = thingseta_root.findall('.//þingsetur/þingseta')
+                    # Create unique slug
+                    base_slug = slugify(f"{defaults['first_name']}-{defaults['last_name']}")
+                    slug = base_slug
+                    counter = 1
+                    while slug_owners.get(slug, althingi_id) != althingi_id:
+                        slug = f"{base_slug}-{counter}"
+                        counter += 1
                     
-                    if thingseta_entries:
-                        # Get latest parliamentary seat
-                        latest_thingseta = max(thingseta_entries, key=lambda x: int(x.find('þing').text))
-                        
-                        # Get party
-                        party_elem = latest_thingseta.find('þingflokkur')
-                        if party_elem is not None:
-                            party_id = party_elem.get('id')
-                            if party_id:
-                                try:
-                                    party = PoliticalParty.objects.get(althingi_id=party_id)
-                                except PoliticalParty.DoesNotExist:
-                                    print(f'  Warning: Party with ID {party_id} not found for MP {name}')
-                        
-                        # Get constituency
-                        constituency_elem = latest_thingseta.find('kjördæmi')
-                        if constituency_elem is not None:
-                            constituency = ''.join(constituency_elem.itertext()).strip()
-                            constituency = html.unescape(constituency)
+                    # Create or update the MP
+                    with transaction.atomic():
+                        mp, created = MP.objects.update_or_create(
+                            althingi_id=althingi_id,
+                            defaults={
+                                **defaults,
+                                'slug': slug,
+                                'party_id': party_pk,
+                                'active': True,
+                                'image_url': f'https://www.althingi.is/myndir/mynd/thingmenn/{althingi_id}/org/mynd.jpg',
+                                'source_digest': digest
+                            }
+                        )
                         
-                        # Get first elected date
-                        first_thingseta = min(thingseta_entries, key=lambda x: int(x.find('þing').text))
-                        first_date_elem = first_thingseta.find('tímabil/inn')
-                        if first_date_elem is not None and first_date_elem.text:
-                            first_elected = parse_date(first_date_elem.text.split()[0])
-                        
-                        # Get current position start date
-                        current_date_elem = latest_thingseta.find('tímabil/inn')
-                        if current_date_elem is not None and current_date_elem.text:
-                            current_position_started = parse_date(current_date_elem.text.split()[0])
-                
-                # Create unique slug
-                base_slug = slugify(f"{first_name}-{last_name}")
-                slug = base_slug
-                counter = 1
-                while MP.objects.filter(slug=slug).exclude(althingi_id=althingi_id).exists():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-                
-                # Calculate speech count
-                speech_count = Speech.objects.filter(mp_althingi_id=althingi_id).count()
-                
-                # Create or update the MP
-                with transaction.atomic():
-                    mp, created = MP.objects.update_or_create(
-                        althingi_id=althingi_id,
-                        defaults={
-                            'first_name': first_name,
-                            'last_name': last_name,
-                            'slug': slug,
-                            'party': party,
-                            'constituency': constituency,
-                            'email': email,
-                            'website': website,
-                            'facebook_url': facebook_url,
-                            'twitter_url': twitter_url,
-                            'bio': bio,
-                            'birthdate': birth_date,
-                            'active': True,
-                            'first_elected': first_elected,
-                            'current_position_started': current_position_started,
-                            'speech_count': speech_count,
-                            'bills_sponsored': 0,
-                            'bills_cosponsored': 0,
-                            'image_url': image_url
-                        }
-                    )
+                        # Add this MP to the session
+                        if althingi_id not in current_session_mps:
+                            mp.sessions.add(session)
                     
-                    # Add this MP to the session
-                    if session not in mp.sessions.all():
-                        mp.sessions.add(session)
+                    old_slug = mp_slugs.get(althingi_id)
+                    if old_slug != slug:
+                        slug_owners.pop(old_slug, None)
+                        slug_owners[slug] = althingi_id
+                        mp_slugs[althingi_id] = slug
                     
                     if created:
                         mps_created += 1
                         print(f'✓ Created MP: {name} (added to session {session_number})')
                     else:
                         mps_updated += 1
+                        changed_mps.append(mp.pk)
                         print(f'✓ Updated MP: {name} (added to session {session_number})')
-            
-            except Exception as e:
-                print(f'✗ Error processing MP {althingi_id}: {str(e)}')
-                continue
+                
+                except Exception as e:
+                    print(f'✗ Error processing MP {althingi_id}: {str(e)}')
+                    continue
+        
+        # Bills embed their sponsors and voters, so their ETags follow MP changes
+        if changed_mps:
+            touch_bills(mp_ids=changed_mps)
+        
+        # Link unchanged MPs to the session in one statement
+        if to_link:
+            session.members.add(*MP.objects.filter(althingi_id__in=to_link).values_list('pk', flat=True))
         
         # Remove MPs from this session if they're no longer in the API response
         mps_to_remove = current_session_mps - mps_in_api_response
         if mps_to_remove:
-            removed_count = 0
-            for mp_id in mps_to_remove:
-                try:
-                    mp = MP.objects.get(althingi_id=mp_id)
-                    mp.sessions.remove(session)
-                    removed_count += 1
-                    print(f'✓ Removed MP {mp.full_name} (ID: {mp_id}) from session {session_number} (not in API response)')
-                except MP.DoesNotExist:
-                    pass
-            print(f'Removed {removed_count} MP(s) from session {session_number} (no longer in session)')
+            removed = list(MP.objects.filter(althingi_id__in=mps_to_remove))
+            session.members.remove(*removed)
+            for mp in removed:
+                print(f'✓ Removed MP {mp.full_name} (ID: {mp.althingi_id}) from session {session_number} (not in API response)')
+            print(f'Removed {len(removed)} MP(s) from session {session_number} (no longer in session)')
         
         print(f'\n=== Summary ===')
         print(f'MPs created: {mps_created}')
         print(f'MPs updated: {mps_updated}')
+        print(f'MPs unchanged (skipped): {mps_unchanged}')
         print(f'MPs in session: {len(mps_in_api_response)}')
-        print(f'Total processed: {mps_created + mps_updated}')
+        print(f'Total processed: {mps_created + mps_updated + mps_unchanged}')
     
     except Exception as e:
         print(f'Error fetching MPs: {str(e)}')
@@ -272,4 +357,7 @@ if __name__ == '__main__':
     
     session = int(sys.argv[1])
     fetch_mps(session)
-
+    
+    # Refresh the dashboard rollups and serve the new data from the API
+    refresh_session_stats([session])
+    caching.bump_data_version()
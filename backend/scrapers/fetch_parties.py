@@ -21,7 +21,10 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 import django
 django.setup()
 
+from parliament import althingi, caching
 from parliament.models import PoliticalParty
+from parliament.utils import touch_bills
+from analytics.session_stats import refresh_session_stats
 
 
 def fetch_parties(session_number):
@@ -31,7 +34,7 @@ def fetch_parties(session_number):
     url = f'https://www.althingi.is/altext/xml/thingflokkar/?lthing={session_number}'
     
     try:
-        response = requests.get(url)
+        response = althingi.get(url)
         if response.status_code != 200:
             print(f'Error fetching parties: HTTP {response.status_code}')
             return
@@ -40,6 +43,11 @@ def fetch_parties(session_number):
         
         parties_created = 0
         parties_updated = 0
+        changed_parties = []
+        stored = {
+            party['althingi_id']: party
+            for party in PoliticalParty.objects.values('pk', 'althingi_id', 'name', 'abbreviation', 'description', 'color')
+        }
         
         # Process each party
         for party in root.findall('þingflokkur'):
@@ -71,16 +79,21 @@ def fetch_parties(session_number):
                 color = color_map.get(party_id, '#777777')  # Default to gray
                 
                 # Create or update the party
+                defaults = {
+                    'name': name,
+                    'abbreviation': short_abbr,
+                    'description': description,
+                    'color': color
+                }
                 party_obj, created = PoliticalParty.objects.update_or_create(
                     althingi_id=party_id,
-                    defaults={
-                        'name': name,
-                        'abbreviation': short_abbr,
-                        'description': description,
-                        'color': color
-                    }
+                    defaults=defaults
                 )
                 
+                previous = stored.get(party_id)
+                if previous and any(previous[field] != value for field, value in defaults.items()):
+                    changed_parties.append(party_obj.pk)
+                
                 if created:
                     parties_created += 1
                     print(f'✓ Created party: {name} ({short_abbr})')
@@ -92,6 +105,10 @@ def fetch_parties(session_number):
                 print(f'✗ Error processing party {party_id}: {str(e)}')
                 continue
         
+        # Bills embed the parties of their sponsors and voters
+        if changed_parties:
+            touch_bills(party_ids=changed_parties)
+        
         print(f'\n=== Summary ===')
         print(f'Parties created: {parties_created}')
         print(f'Parties updated: {parties_updated}')
@@ -115,4 +132,7 @@ if __name__ == '__main__':
     
     session = int(sys.argv[1])
     fetch_parties(session)
-
+    
+    # Refresh the dashboard rollups and serve the new data from the API
+    refresh_session_stats([session])
+    caching.bump_data_version()
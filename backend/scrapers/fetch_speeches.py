@@ -5,9 +5,10 @@ Simple script to fetch and save MP speech data
 
 import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import sys
+import time
 import django
 from django.db import transaction, models
 from django.utils import timezone
@@ -17,7 +18,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 django.setup()
 
+from parliament import althingi, caching
 from parliament.models import MP, Bill, Speech, ParliamentSession
+from parliament.stats import refresh_mp_statistics
 from parliament.utils import get_or_create_session
 
 
@@ -38,181 +41,306 @@ def parse_date(date_string):
         return None
 
 
-def fetch_mp_speeches(mp_id, session_number):
-    """Fetch speeches for a specific MP from Alþingi XML API"""
+# Fields refreshed when a speech already exists for (mp, start_time)
+SPEECH_UPDATE_FIELDS = [
+    'session', 'date', 'bill', 'mp_althingi_id', 'althingi_bill_id', 'title',
+    'speech_type', 'end_time', 'duration', 'audio_url', 'xml_url', 'html_url',
+]
+
+SPEECH_BATCH_SIZE = 500
+
+# Speeches this long before the cursor are read again on each run
+RESCAN_WINDOW = timedelta(days=14)
+
+
+def parse_speech(speech_elem, default_session=None):
+    """
+    Extract speech fields from a <ræða> element.
+    
+    Handles both an MP's speech document (thingmadur/raedur) and the
+    session-wide speech list (raedulisti), which names the speaker in
+    <ræðumaður id="..."> and the session on the <mál> element.
+    
+    Returns:
+        dict of speech fields, or None if the speech has no date or start time
+    """
+    bill_elem = speech_elem.find('mál')
+    
+    # Get parliament session for this speech
+    session_number = default_session
+    session_elem = speech_elem.find('löggjafarþing')
+    if session_elem is not None and session_elem.text:
+        session_number = int(session_elem.text)
+    elif bill_elem is not None and bill_elem.get('löggjafarþing'):
+        session_number = int(bill_elem.get('löggjafarþing'))
+    
+    if session_number is None:
+        return None
+    
+    # Get speech date
+    date_elem = speech_elem.find('dagur')
+    if date_elem is None or not date_elem.text:
+        return None
+    
+    speech_date = parse_date(date_elem.text)
+    if not speech_date:
+        return None
+    
+    # Get speech type
+    speech_type_elem = speech_elem.find('tegundræðu')
+    speech_type = speech_type_elem.text if speech_type_elem is not None and speech_type_elem.text else ''
+    
+    # Get times
+    start_time_elem = speech_elem.find('ræðahófst')
+    end_time_elem = speech_elem.find('ræðulauk')
+    
+    start_time = None
+    end_time = None
+    duration = None
+    
+    if start_time_elem is not None and start_time_elem.text:
+        try:
+            naive_start_time = datetime.fromisoformat(start_time_elem.text)
+            start_time = timezone.make_aware(naive_start_time, timezone=timezone.get_current_timezone())
+        except ValueError:
+            pass
+    
+    if end_time_elem is not None and end_time_elem.text:
+        try:
+            naive_end_time = datetime.fromisoformat(end_time_elem.text)
+            end_time = timezone.make_aware(naive_end_time, timezone=timezone.get_current_timezone())
+            
+            if start_time and end_time:
+                duration = (end_time - start_time).total_seconds()
+        except ValueError:
+            pass
+    
+    if not start_time:
+        return None
+    
+    # Get bill information
+    bill_id = None
+    title = ''
+    
+    if bill_elem is not None:
+        bill_id_elem = bill_elem.find('málsnúmer')
+        bill_title_elem = bill_elem.find('málsheiti')
+        bill_id_text = bill_id_elem.text if bill_id_elem is not None else bill_elem.get('málsnúmer')
+        
+        if bill_id_text:
+            try:
+                bill_id = int(bill_id_text)
+            except ValueError:
+                pass
+        
+        if bill_title_elem is not None and bill_title_elem.text:
+            title = bill_title_elem.text.strip()
+    
+    # Get URLs
+    audio_url = ''
+    xml_url = ''
+    html_url = ''
+    
+    slodirs_elem = speech_elem.find('slóðir')
+    if slodirs_elem is not None:
+        audio_elem = slodirs_elem.find('hljóð')
+        if audio_elem is not None and audio_elem.text:
+            audio_url = audio_elem.text
+        
+        xml_elem = slodirs_elem.find('xml')
+        if xml_elem is not None and xml_elem.text:
+            xml_url = xml_elem.text
+        
+        html_elem = slodirs_elem.find('html')
+        if html_elem is not None and html_elem.text:
+            html_url = html_elem.text
+    
+    # Get the speaker (only present in the session-wide speech list)
+    speaker_elem = speech_elem.find('ræðumaður')
+    speaker_id = speaker_elem.get('id') if speaker_elem is not None else None
+    
+    return {
+        'session_number': session_number,
+        'mp_althingi_id': int(speaker_id) if speaker_id else None,
+        'date': speech_date,
+        'start_time': start_time,
+        'end_time': end_time,
+        'duration': duration,
+        'speech_type': speech_type,
+        'althingi_bill_id': bill_id,
+        'title': title[:255],
+        'audio_url': audio_url,
+        'xml_url': xml_url,
+        'html_url': html_url,
+    }
+
+
+def load_bill_map(session_ids):
+    """Preload a (althingi_id, session_id) -> bill pk map for the given sessions"""
+    return {
+        (althingi_id, session_id): pk
+        for pk, althingi_id, session_id in Bill.objects.filter(session_id__in=session_ids).values_list(
+            'pk', 'althingi_id', 'session_id'
+        )
+    }
+
+
+def upsert_speeches(rows, sessions, batch_size=SPEECH_BATCH_SIZE, bill_map=None):
+    """
+    Write parsed speeches in batches.
+    
+    Uses bulk_create(update_conflicts=True) against the unique (mp, start_time)
+    key, so each batch is a single INSERT ... ON CONFLICT DO UPDATE.
+    
+    Args:
+        rows: Parsed speech dicts from parse_speech, with 'mp_id' set to the MP's pk
+        sessions: session_number -> ParliamentSession map for the rows
+        bill_map: Preloaded load_bill_map result (loaded for `sessions` if None)
+    
+    Returns:
+        tuple: (created, updated)
+    """
+    if not rows:
+        return 0, 0
+    
+    if bill_map is None:
+        bill_map = load_bill_map([session.pk for session in sessions.values()])
+    
+    speeches = {}
+    for row in rows:
+        session = sessions[row['session_number']]
+        speeches[(row['mp_id'], row['start_time'])] = Speech(
+            mp_id=row['mp_id'],
+            session=session,
+            date=row['date'],
+            start_time=row['start_time'],
+            bill_id=bill_map.get((row['althingi_bill_id'], session.pk)),
+            mp_althingi_id=row['mp_althingi_id'],
+            althingi_bill_id=row['althingi_bill_id'],
+            title=row['title'],
+            speech_type=row['speech_type'],
+            end_time=row['end_time'],
+            duration=row['duration'],
+            audio_url=row['audio_url'],
+            xml_url=row['xml_url'],
+            html_url=row['html_url'],
+        )
+    
+    keys = list(speeches)
+    created = 0
+    
+    with transaction.atomic():
+        for i in range(0, len(keys), batch_size):
+            batch_keys = keys[i:i + batch_size]
+            existing = set(
+                Speech.objects.filter(
+                    mp_id__in={mp_id for mp_id, _ in batch_keys},
+                    start_time__in=[start_time for _, start_time in batch_keys],
+                ).values_list('mp_id', 'start_time')
+            )
+            created += sum(1 for key in batch_keys if key not in existing)
+            
+            Speech.objects.bulk_create(
+                [speeches[key] for key in batch_keys],
+                update_conflicts=True,
+                unique_fields=['mp', 'start_time'],
+                update_fields=SPEECH_UPDATE_FIELDS,
+            )
+    
+    return created, len(speeches) - created
+
+
+def fetch_mp_speeches(mp_id, session_number, update_statistics=True):
+    """
+    Fetch speeches for a specific MP from Alþingi XML API
+    
+    Args:
+        mp_id: Alþingi ID of the MP
+        session_number: Only ingest speeches from this session. If None,
+            ingest the MP's whole career (every session in the document).
+        update_statistics: If True, recount the MP's speech statistics
+    
+    Returns:
+        bool: True if the MP's speeches were fetched and written
+    """
     print(f'\nFetching speeches for MP ID {mp_id}...')
     
-    # Get or create session (will update active status automatically)
-    session = get_or_create_session(session_number, update_active_status=True)
+    sessions = {}
+    if session_number is not None:
+        # Get or create session (will update active status automatically)
+        sessions[session_number] = get_or_create_session(session_number, update_active_status=True)
     
     # Get the MP object
     try:
         mp = MP.objects.get(althingi_id=mp_id)
     except MP.DoesNotExist:
         print(f'Error: MP with ID {mp_id} does not exist')
-        return
+        return False
     
     # URL for speeches for this MP
     url = f'https://www.althingi.is/altext/xml/thingmenn/thingmadur/raedur/?nr={mp_id}'
     
     try:
-        response = requests.get(url)
+        response = althingi.get(url)
         if response.status_code != 200:
             print(f'Error fetching speeches: HTTP {response.status_code}')
-            return
+            return False
+        
+        started = time.monotonic()
         
-        # Parse XML content
-        root = ET.fromstring(response.content)
+        # A career can run to thousands of speeches; stream them one at a time
+        # and write every SPEECH_BATCH_SIZE rows, so memory does not grow with
+        # the document
+        rows = []
+        totals = {'created': 0, 'updated': 0}
         
-        speeches_created = 0
-        speeches_updated = 0
-        speech_count = 0
+        def flush():
+            # Career backfills touch many sessions; resolve each one once
+            if session_number is None:
+                for number in sorted({row['session_number'] for row in rows} - sessions.keys()):
+                    sessions[number] = get_or_create_session(number, update_active_status=False)
+            created, updated = upsert_speeches(rows, sessions)
+            totals['created'] += created
+            totals['updated'] += updated
+            rows.clear()
         
-        # Find all speech elements
-        for speech_elem in root.findall('.//ræða'):
+        for speech_elem in althingi.iter_elements(response.content, 'ræða'):
             try:
-                # Get parliament session for this speech
-                session_elem = speech_elem.find('löggjafarþing')
-                
-                if session_elem is None or not session_elem.text:
-                    continue
-                
-                # Skip speeches from other sessions
-                if int(session_elem.text) != session_number:
-                    continue
-                
-                # Get speech date
-                date_elem = speech_elem.find('dagur')
-                if date_elem is None or not date_elem.text:
-                    continue
-                
-                speech_date = parse_date(date_elem.text)
-                if not speech_date:
-                    continue
-                
-                # Get speech type
-                speech_type_elem = speech_elem.find('tegundræðu')
-                speech_type = speech_type_elem.text if speech_type_elem is not None and speech_type_elem.text else ''
-                
-                # Get times
-                start_time_elem = speech_elem.find('ræðahófst')
-                end_time_elem = speech_elem.find('ræðulauk')
-                
-                start_time = None
-                end_time = None
-                duration = None
-                
-                if start_time_elem is not None and start_time_elem.text:
-                    try:
-                        naive_start_time = datetime.fromisoformat(start_time_elem.text)
-                        start_time = timezone.make_aware(naive_start_time, timezone=timezone.get_current_timezone())
-                    except ValueError:
-                        pass
-                
-                if end_time_elem is not None and end_time_elem.text:
-                    try:
-                        naive_end_time = datetime.fromisoformat(end_time_elem.text)
-                        end_time = timezone.make_aware(naive_end_time, timezone=timezone.get_current_timezone())
-                        
-                        if start_time and end_time:
-                            duration = (end_time - start_time).total_seconds()
-                    except ValueError:
-                        pass
-                
-                # Get bill information
-                bill_elem = speech_elem.find('mál')
-                bill_id = None
-                bill_obj = None
-                title = ''
-                
-                if bill_elem is not None:
-                    bill_id_elem = bill_elem.find('málsnúmer')
-                    bill_title_elem = bill_elem.find('málsheiti')
-                    
-                    if bill_id_elem is not None and bill_id_elem.text:
-                        try:
-                            bill_id = int(bill_id_elem.text)
-                            
-                            # Try to find the bill
-                            try:
-                                bill_obj = Bill.objects.get(althingi_id=bill_id, session=session)
-                            except Bill.DoesNotExist:
-                                pass
-                        except ValueError:
-                            pass
-                    
-                    if bill_title_elem is not None and bill_title_elem.text:
-                        title = bill_title_elem.text.strip()
-                
-                # Get URLs
-                audio_url = ''
-                xml_url = ''
-                html_url = ''
-                
-                slodirs_elem = speech_elem.find('slóðir')
-                if slodirs_elem is not None:
-                    audio_elem = slodirs_elem.find('hljóð')
-                    if audio_elem is not None and audio_elem.text:
-                        audio_url = audio_elem.text
-                    
-                    xml_elem = slodirs_elem.find('xml')
-                    if xml_elem is not None and xml_elem.text:
-                        xml_url = xml_elem.text
-                    
-                    html_elem = slodirs_elem.find('html')
-                    if html_elem is not None and html_elem.text:
-                        html_url = html_elem.text
-                
-                # Create or update the speech in the database
-                if speech_date and start_time:
-                    with transaction.atomic():
-                        speech, created = Speech.objects.update_or_create(
-                            mp=mp,
-                            session=session,
-                            date=speech_date,
-                            start_time=start_time,
-                            defaults={
-                                'bill': bill_obj,
-                                'mp_althingi_id': mp_id,
-                                'althingi_bill_id': bill_id,
-                                'title': title,
-                                'speech_type': speech_type,
-                                'end_time': end_time,
-                                'duration': duration,
-                                'audio_url': audio_url,
-                                'xml_url': xml_url,
-                                'html_url': html_url
-                            }
-                        )
-                        
-                        if created:
-                            speeches_created += 1
-                            print(f'  ✓ Created speech: {speech_date}, {speech_type}')
-                        else:
-                            speeches_updated += 1
-                            print(f'  ✓ Updated speech: {speech_date}, {speech_type}')
-                        
-                        speech_count += 1
-            
+                row = parse_speech(speech_elem)
             except Exception as e:
                 print(f'  ✗ Error processing speech: {str(e)}')
                 continue
+            
+            if row is None:
+                continue
+            
+            # Skip speeches from other sessions
+            if session_number is not None and row['session_number'] != session_number:
+                continue
+            
+            row['mp_id'] = mp.pk
+            row['mp_althingi_id'] = mp.althingi_id
+            rows.append(row)
+            if len(rows) >= SPEECH_BATCH_SIZE:
+                flush()
         
-        # Calculate total speaking time from all speeches
-        total_speaking_time = Speech.objects.filter(mp_althingi_id=mp_id).aggregate(
-            total_time=models.Sum('duration')
-        )['total_time'] or 0
+        flush()
+        speeches_created, speeches_updated = totals['created'], totals['updated']
+        written = speeches_created + speeches_updated
+        elapsed = time.monotonic() - started
         
-        # Update both speech count and total speaking time
-        mp.speech_count = speech_count
-        mp.total_speaking_time = total_speaking_time
-        mp.save(update_fields=['speech_count', 'total_speaking_time'])
+        if update_statistics:
+            refresh_mp_statistics([mp.pk])
+            mp.refresh_from_db(fields=['speech_count', 'total_speaking_time'])
         
         print(f'\n=== Summary for {mp.full_name} ===')
         print(f'Speeches created: {speeches_created}')
         print(f'Speeches updated: {speeches_updated}')
-        print(f'Total speeches: {speech_count}')
-        print(f'Total speaking time: {total_speaking_time} seconds ({total_speaking_time / 60:.1f} minutes)')
+        print(f'Ingest rate: {written / elapsed if elapsed else 0:.0f} rows/sec ({elapsed:.2f}s)')
+        if update_statistics:
+            print(f'Total speeches: {mp.speech_count}')
+            print(f'Total speaking time: {mp.total_speaking_time} seconds ({mp.total_speaking_time / 60:.1f} minutes)')
+        return True
     
     except requests.RequestException as e:
         print(f'Error fetching speeches: {str(e)}')
@@ -220,20 +348,176 @@ def fetch_mp_speeches(mp_id, session_number):
         print(f'Error parsing XML: {str(e)}')
     except Exception as e:
         print(f'Unexpected error: {str(e)}')
+    return False
 
 
-def fetch_all_mp_speeches(session_number):
-    """Fetch speeches for all active MPs"""
+def fetch_session_speeches(session_number, full=False, update_statistics=True):
+    """
+    Fetch every speech in a session from the session-wide speech list.
+    
+    Makes one request (raedulisti) instead of downloading every MP's whole
+    career, and streams through the document one <ræða> at a time. A local
+    cursor records the latest ingested ræðahófst, so nightly runs only
+    write speeches from RESCAN_WINDOW before it onwards. The window picks
+    up late changes such as an xml_url published after the speech. A speech
+    skipped because its speaker is not in the database yet holds the cursor
+    back for up to RESCAN_WINDOW, so it is ingested once fetch_mps has loaded
+    the MP. Older skipped speeches (e.g. by ministers who are not MPs) are
+    reported as permanently skipped and no longer hold the cursor.
+    
+    Args:
+        session_number: Parliament session number
+        full: If True, ignore the cursor and re-ingest the whole session
+        update_statistics: If True, recount speech statistics of the MPs
+            whose speeches were written
+    """
+    print(f'Fetching speeches for session {session_number}...')
+    
+    # Get or create session (will update active status automatically)
+    session = get_or_create_session(session_number, update_active_status=True)
+    sessions = {session_number: session}
+    
+    cursor_name = f'speeches-{session_number}'
+    cursor = None if full else althingi.read_cursor(cursor_name)
+    cursor_time = None
+    if cursor:
+        cursor_time = timezone.make_aware(datetime.fromisoformat(cursor), timezone=timezone.get_current_timezone())
+        print(f'Resuming from cursor {cursor} (re-scanning the {RESCAN_WINDOW.days} days before it)')
+    rescan_from = cursor_time - RESCAN_WINDOW if cursor_time else None
+    
+    url = f'https://www.althingi.is/altext/xml/raedulisti/?lthing={session_number}'
+    
+    try:
+        response = althingi.get(url)
+        if response.status_code != 200:
+            print(f'Error fetching speech list: HTTP {response.status_code}')
+            return
+        
+        started = time.monotonic()
+        mp_map = dict(MP.objects.values_list('althingi_id', 'pk'))
+        bill_map = load_bill_map([session.pk])
+        
+        # Write every SPEECH_BATCH_SIZE rows, so memory does not grow with
+        # the document
+        rows = []
+        totals = {'created': 0, 'updated': 0}
+        affected_mps = set()
+        
+        def flush():
+            created, updated = upsert_speeches(rows, sessions, bill_map=bill_map)
+            totals['created'] += created
+            totals['updated'] += updated
+            affected_mps.update(row['mp_id'] for row in rows)
+            rows.clear()
+        
+        speeches_seen = 0
+        speeches_before_cursor = 0
+        skipped = []
+        latest_start = cursor_time
+        
+        for speech_elem in althingi.iter_elements(response.content, 'ræða'):
+            try:
+                row = parse_speech(speech_elem, default_session=session_number)
+            except Exception as e:
+                print(f'  ✗ Error processing speech: {str(e)}')
+                row = None
+            
+            if row is None or row['session_number'] != session_number:
+                continue
+            
+            speeches_seen += 1
+            if rescan_from and row['start_time'] < rescan_from:
+                speeches_before_cursor += 1
+                continue
+            
+            mp_pk = mp_map.get(row['mp_althingi_id'])
+            if mp_pk is None:
+                skipped.append((row['start_time'], row['mp_althingi_id']))
+                continue
+            
+            row['mp_id'] = mp_pk
+            rows.append(row)
+            if latest_start is None or row['start_time'] > latest_start:
+                latest_start = row['start_time']
+            if len(rows) >= SPEECH_BATCH_SIZE:
+                flush()
+        
+        flush()
+        speeches_created, speeches_updated = totals['created'], totals['updated']
+        
+        if update_statistics and affected_mps:
+            refresh_mp_statistics(affected_mps)
+        
+        # Stop at the first recently skipped speech, so it is picked up once
+        # its MP is loaded; speeches older than RESCAN_WINDOW are given up on
+        hold_from = latest_start - RESCAN_WINDOW if latest_start else None
+        held = [start for start, _ in skipped if hold_from is None or start >= hold_from]
+        held_mps = {mp_id for start, mp_id in skipped if hold_from is None or start >= hold_from}
+        dropped_mps = {mp_id for start, mp_id in skipped if hold_from is not None and start < hold_from}
+        if held and (latest_start is None or min(held) < latest_start):
+            latest_start = min(held)
+        if latest_start is not None:
+            naive_latest = timezone.make_naive(latest_start, timezone=timezone.get_current_timezone())
+            althingi.write_cursor(cursor_name, naive_latest.isoformat())
+        
+        elapsed = time.monotonic() - started
+        written = speeches_created + speeches_updated
+        
+        print(f'\n=== Summary ===')
+        print(f'Speeches in session list: {speeches_seen}')
+        print(f'Skipped (before cursor window): {speeches_before_cursor}')
+        print(f'Speeches created: {speeches_created}')
+        print(f'Speeches updated: {speeches_updated}')
+        print(f'MPs updated: {len(affected_mps)}')
+        if held_mps:
+            print(f'Warning: Skipped speeches by {len(held_mps)} MP(s) not in the database yet, retried next run: {sorted(held_mps)}')
+        if dropped_mps:
+            print(f'Warning: Permanently skipped speeches by {len(dropped_mps)} speaker(s) not in the database: {sorted(dropped_mps)}')
+        print(f'Ingest rate: {written / elapsed if elapsed else 0:.0f} rows/sec ({elapsed:.2f}s)')
+    
+    except requests.RequestException as e:
+        print(f'Error fetching speech list: {str(e)}')
+    except ET.ParseError as e:
+        print(f'Error parsing XML: {str(e)}')
+
+
+def fetch_all_mp_speeches(session_number, checkpoint=None):
+    """
+    Fetch speeches for all active MPs, one MP document at a time
+    
+    Args:
+        session_number: Parliament session number
+        checkpoint: Optional RunCheckpoint; MPs up to its 'mp' cursor
+            (althingi_id) are skipped and the cursor advances per MP, up to
+            the first MP whose speeches could not be fetched or written
+    """
     print(f'Fetching speeches for all active MPs in session {session_number}...')
     
-    mps = MP.objects.filter(active=True)
-    total_mps = mps.count()
+    mps = list(MP.objects.filter(active=True).order_by('althingi_id'))
+    total_mps = len(mps)
     
     print(f'Found {total_mps} active MPs')
     
+    resume_after = checkpoint.get('mp') if checkpoint else None
+    if resume_after is not None:
+        mps = [mp for mp in mps if mp.althingi_id > resume_after]
+        print(f'Resuming after MP {resume_after} ({len(mps)} left)')
+    
+    blocked = False
     for idx, mp in enumerate(mps, 1):
-        print(f'\n[{idx}/{total_mps}] Processing MP: {mp.full_name}')
-        fetch_mp_speeches(mp.althingi_id, session_number)
+        print(f'\n[{idx}/{len(mps)}] Processing MP: {mp.full_name}')
+        ok = fetch_mp_speeches(mp.althingi_id, session_number, update_statistics=False)
+        
+        # Stop at the first MP that failed, so a resumed run retries it
+        blocked = blocked or not ok
+        if checkpoint and not blocked:
+            checkpoint.advance('mp', mp.althingi_id)
+    
+    if checkpoint:
+        checkpoint.save()
+    
+    # Recount every MP's statistics once, after all documents are in
+    refresh_mp_statistics([mp.pk for mp in mps])
     
     print(f'\n=== All Done ===')
     print(f'Processed speeches for {total_mps} MPs')
@@ -243,17 +527,35 @@ if __name__ == '__main__':
     # Get session number from command line (required)
     if len(sys.argv) < 2:
         print('Error: Session number is required')
-        print('Usage: python fetch_speeches.py <session_number> [mp_id]')
+        print('Usage: python fetch_speeches.py <session_number> [mp_id] [--full] [--per-mp]')
+        print('       python fetch_speeches.py --career <mp_id>')
         print('Example: python fetch_speeches.py 157')
+        print('Example: python fetch_speeches.py 157 --full')
         print('Example: python fetch_speeches.py 157 1234')
+        print('Example: python fetch_speeches.py --career 1234')
         sys.exit(1)
     
+    # Backfill every session of one MP's career
+    if sys.argv[1] == '--career':
+        if len(sys.argv) < 3:
+            print('Error: MP ID is required with --career')
+            sys.exit(1)
+        fetch_mp_speeches(int(sys.argv[2]), None)
+        caching.bump_data_version()
+        sys.exit(0)
+    
     session = int(sys.argv[1])
     
+    args = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+    
     # Check if a specific MP ID is provided
-    if len(sys.argv) > 2:
-        mp_id = int(sys.argv[2])
+    if args:
+        mp_id = int(args[0])
         fetch_mp_speeches(mp_id, session)
-    else:
+    elif '--per-mp' in sys.argv:
         fetch_all_mp_speeches(session)
-
+    else:
+        fetch_session_speeches(session, full='--full' in sys.argv)
+    
+    # Serve the new data from the API
+    caching.bump_data_version()
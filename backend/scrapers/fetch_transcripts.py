@@ -0,0 +1,164 @@
+"""
+Fetch speech transcripts from Alþingi API
+Downloads the XML transcript of each stored speech and saves its plain text in Speech.text
+
+Usage:
+    python fetch_transcripts.py [session_number] [--workers N] [--rate N] [--limit N] [--force]
+
+Examples:
+    python fetch_transcripts.py 157
+    python fetch_transcripts.py 157 --workers 4 --rate 5
+    python fetch_transcripts.py --limit 1000
+
+Only speeches without text are fetched, so a re-run picks up where the last
+one stopped and retries transcripts that were not published yet.
+"""
+
+import requests
+import xml.etree.ElementTree as ET
+import os
+import sys
+import django
+from django.db import transaction
+
+# Setup Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
+django.setup()
+
+from parliament import althingi, caching
+from parliament.models import Speech
+from parliament.pipeline import Pipeline
+from scrapers.fetch_bills import parse_int_option
+
+
+def fetch_transcript_document(xml_url):
+    """Download a transcript, returning None if it is not available"""
+    try:
+        response = althingi.get(xml_url)
+    except requests.RequestException as e:
+        print(f'  ✗ Error fetching transcript {xml_url}: {str(e)}')
+        return None
+    
+    # Transcripts of recent speeches are published a while after the speech
+    if response.status_code != 200:
+        return None
+    return response.content
+
+
+def extract_transcript_text(content):
+    """
+    Extract the plain text of a transcript document.
+    
+    Each <mgr> paragraph of <ræðutexti> becomes one paragraph of text, with
+    its whitespace collapsed. Documents without paragraphs fall back to all
+    the text of <ræðutexti>.
+    
+    Returns:
+        str: The transcript text ('' if the document has none)
+    
+    Raises:
+        xml.etree.ElementTree.ParseError: on malformed XML
+    """
+    root = ET.fromstring(content)
+    body = root if root.tag == 'ræðutexti' else root.find('.//ræðutexti')
+    if body is None:
+        return ''
+    
+    paragraphs = [' '.join(''.join(mgr.itertext()).split()) for mgr in body.iter('mgr')]
+    if not paragraphs:
+        paragraphs = [' '.join(''.join(body.itertext()).split())]
+    
+    return '\n\n'.join(paragraph for paragraph in paragraphs if paragraph)
+
+
+def fetch_transcripts(session_number=None, workers=althingi.DEFAULT_WORKERS, limit=None, force=False):
+    """
+    Download and store the transcripts of speeches that have no text yet.
+    
+    Runs as a fetch -> parse -> write pipeline: transcripts are downloaded
+    by `workers` threads through the shared rate limit, their text is
+    extracted by separate threads and written here in batches.
+    
+    Args:
+        session_number: Only fetch speeches of this session (default: all)
+        workers: Number of transcripts to download concurrently
+        limit: Fetch at most this many transcripts
+        force: Re-fetch transcripts of speeches that already have text
+    
+    Returns:
+        int: Number of speeches whose text was saved
+    """
+    label = f'session {session_number}' if session_number else 'all sessions'
+    print(f'Fetching speech transcripts for {label}...')
+    
+    speeches = Speech.objects.exclude(xml_url='')
+    if session_number is not None:
+        speeches = speeches.filter(session__session_number=session_number)
+    if not force:
+        speeches = speeches.filter(text='')
+    speeches = speeches.order_by('pk').values_list('pk', 'xml_url')
+    if limit:
+        speeches = speeches[:limit]
+    speeches = list(speeches)
+    
+    print(f'Found {len(speeches)} speeches without a transcript')
+    if not speeches:
+        return 0
+    
+    progress = {'saved': 0, 'missing': 0}
+    
+    def parse(item, content):
+        if content is None:
+            return None
+        return extract_transcript_text(content)
+    
+    def write(batch):
+        changed = [Speech(pk=pk, text=text) for (pk, _), text in batch if text]
+        progress['missing'] += len(batch) - len(changed)
+        if changed:
+            with transaction.atomic():
+                Speech.objects.bulk_update(changed, ['text'])
+        progress['saved'] += len(changed)
+        print(f'  {progress["saved"] + progress["missing"]}/{len(speeches)} transcripts processed')
+    
+    pipeline = Pipeline(
+        'Speech transcripts',
+        fetch=lambda item: fetch_transcript_document(item[1]),
+        parse=parse,
+        write=write,
+        fetch_workers=workers,
+        batch_size=100,
+    )
+    pipeline.run(speeches)
+    
+    print(f'\n=== Summary ===')
+    print(f'Transcripts saved: {progress["saved"]}')
+    print(f'Not available yet: {progress["missing"]}')
+    pipeline.print_report()
+    
+    return progress['saved']
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        sys.exit(0)
+    
+    positional = [
+        arg for i, arg in enumerate(args)
+        if not arg.startswith('-') and (i == 0 or args[i - 1] not in ('--workers', '-w', '--rate', '-r', '--limit'))
+    ]
+    session = int(positional[0]) if positional else None
+    workers = parse_int_option(args, ['--workers', '-w'], althingi.DEFAULT_WORKERS)
+    althingi.set_rate_limit(parse_int_option(args, ['--rate', '-r'], althingi.DEFAULT_REQUESTS_PER_SECOND))
+    fetch_transcripts(
+        session,
+        workers=workers,
+        limit=parse_int_option(args, ['--limit'], None),
+        force='--force' in args,
+    )
+    
+    # Serve the new data from the API
+    caching.bump_data_version()
@@ -5,245 +5,500 @@ Simple script to fetch and save voting records for bills
 
 import requests
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
 import os
 import sys
 import django
 from django.db import transaction
+from django.utils import timezone
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politico.settings')
 django.setup()
 
-from parliament.models import Bill, MP, Vote, ParliamentSession
+from parliament import althingi, caching
+from parliament.pipeline import Pipeline
+from parliament.models import Bill, MP, Vote, VotingRound
 from parliament.utils import get_or_create_session
+from analytics.session_stats import refresh_session_stats
 
 
-def make_request(url, max_retries=3, timeout=10):
-    """Make a request with timeout and retry logic"""
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()
-            return response
-        except (requests.RequestException, requests.Timeout) as e:
-            if attempt < max_retries - 1:
-                print(f'  Warning: Request failed ({attempt+1}/{max_retries}): {str(e)}')
-                time.sleep(2)
-            else:
-                print(f'  Error: Request failed after {max_retries} retries: {str(e)}')
-                return None
-    return None
-
-
-def fetch_bill_voting_records(session, bill_number, force=False):
-    """Fetch voting records for a specific bill"""
-    print(f'\nFetching voting records for bill {bill_number}...')
+def make_request(url, timeout=10):
+    """Make a request through the shared client (which retries), returning None on failure"""
+    try:
+        response = althingi.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response
+    except requests.RequestException as e:
+        print(f'  Error: Request failed: {str(e)}')
+        return None
+
+
+# Map Althingi vote values to our model's values
+VOTE_MAPPING = {
+    'já': 'yes',
+    'nei': 'no',
+    'greiðir ekki atkvæði': 'abstain',
+    'fjarverandi': 'absent',
+    'boðaði fjarvist': 'absent'
+}
+
+# Vote value -> VotingRound tally field
+VOTE_COUNT_FIELDS = {
+    'yes': 'yes_count',
+    'no': 'no_count',
+    'abstain': 'abstain_count',
+    'absent': 'absent_count',
+}
+
+ROUND_UPDATE_FIELDS = [
+    'bill', 'session', 'vote_date', 'time', 'vote_type', 'result',
+    'yes_count', 'no_count', 'abstain_count', 'absent_count',
+]
+
+
+def load_mp_map():
+    """Preload an althingi_id -> MP pk map for resolving voters"""
+    return dict(MP.objects.values_list('althingi_id', 'pk'))
+
+
+def element_text(root, path):
+    elem = root.find(path)
+    return elem.text.strip() if elem is not None and elem.text else ''
+
+
+def fetch_voting_round_document(voting_id):
+    """Download the XML of one voting round, or None if it could not be fetched"""
+    url = f'https://www.althingi.is/altext/xml/atkvaedagreidslur/atkvaedagreidsla/?numer={voting_id}'
     
+    response = make_request(url)
+    if not response:
+        print(f'  Error: Failed to fetch voting details for ID {voting_id}')
+        return None
+    return response.content
+
+
+def parse_voting_round(voting_id, content):
+    """
+    Parse the XML of one voting round.
+    
+    Returns:
+        dict: Round fields plus a list of (althingi MP id, name, vote) tuples,
+        or None if the XML is invalid or has no date
+    """
     try:
-        # Get the bill details
-        bill_details_url = f'https://www.althingi.is/altext/xml/thingmalalisti/thingmal/?lthing={session.session_number}&malnr={bill_number}'
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        print(f'  Error: XML parsing error for voting ID {voting_id}: {str(e)}')
+        return None
+    
+    time_text = element_text(root, './/tími')
+    if not time_text:
+        print(f'  Warning: Could not find date for voting session {voting_id}')
+        return None
+    
+    try:
+        vote_time = timezone.make_aware(datetime.fromisoformat(time_text), timezone=timezone.get_current_timezone())
+    except ValueError:
+        vote_time = None
+    
+    votes = []
+    for mp_elem in root.findall('.//þingmaður'):
+        mp_id = mp_elem.get('id')
+        vote_elem = mp_elem.find('atkvæði')
+        if not mp_id or vote_elem is None or not vote_elem.text:
+            continue
+        name_elem = mp_elem.find('nafn')
+        name = name_elem.text if name_elem is not None else "Unknown"
+        votes.append((int(mp_id), name, VOTE_MAPPING.get(vote_elem.text.lower(), 'abstain')))
+    
+    return {
+        'voting_id': voting_id,
+        'vote_date': datetime.strptime(time_text.split('T')[0], '%Y-%m-%d').date(),
+        'time': vote_time,
+        'vote_type': element_text(root, './/tegund')[:255],
+        'result': element_text(root, './/niðurstaða')[:100],
+        'votes': votes,
+    }
+
+
+def fetch_voting_round(voting_id):
+    """Fetch and parse the details of one voting round"""
+    content = fetch_voting_round_document(voting_id)
+    if content is None:
+        return None
+    return parse_voting_round(voting_id, content)
+
+
+def save_voting_rounds(bill, session, rounds, mp_map):
+    """
+    Upsert a bill's voting rounds and their votes in bulk.
+    
+    Tallies are counted from the round's full vote list and stored on the
+    round. Votes are then diffed against the stored votes of those rounds.
+    
+    Returns:
+        tuple: (rounds changed, votes created, votes updated, votes deleted),
+        where a round is changed if it is new or any of its fields differ
+    """
+    round_fields = ['bill_id', 'session_id'] + ROUND_UPDATE_FIELDS[2:]
+    stored_rounds = {
+        row[0]: row[1:]
+        for row in VotingRound.objects.filter(
+            althingi_voting_id__in=[r['voting_id'] for r in rounds]
+        ).values_list('althingi_voting_id', *round_fields)
+    }
+    
+    round_objs = []
+    incoming = {}
+    for round_data in rounds:
+        counts = {field: 0 for field in VOTE_COUNT_FIELDS.values()}
+        for _, _, vote_value in round_data['votes']:
+            counts[VOTE_COUNT_FIELDS[vote_value]] += 1
         
-        bill_response = make_request(bill_details_url)
-        if not bill_response:
-            print(f'  Error: Failed to fetch details for bill {bill_number}')
-            return
+        round_objs.append(VotingRound(
+            bill=bill,
+            session=session,
+            althingi_voting_id=round_data['voting_id'],
+            vote_date=round_data['vote_date'],
+            time=round_data['time'],
+            vote_type=round_data['vote_type'],
+            result=round_data['result'],
+            **counts
+        ))
+    
+    with transaction.atomic():
+        VotingRound.objects.bulk_create(
+            round_objs,
+            update_conflicts=True,
+            unique_fields=['althingi_voting_id'],
+            update_fields=ROUND_UPDATE_FIELDS,
+        )
+        round_map = dict(
+            VotingRound.objects.filter(
+                althingi_voting_id__in=[r['voting_id'] for r in rounds]
+            ).values_list('althingi_voting_id', 'pk')
+        )
         
-        root = ET.fromstring(bill_response.content)
+        for round_data in rounds:
+            round_pk = round_map[round_data['voting_id']]
+            for mp_id, name, vote_value in round_data['votes']:
+                mp_pk = mp_map.get(mp_id)
+                if mp_pk is None:
+                    print(f'  Warning: MP with ID {mp_id} ({name}) not found')
+                    continue
+                incoming[(round_pk, mp_pk)] = (vote_value, round_data['vote_date'], round_data['voting_id'])
         
-        # Get or create the bill
-        bill_title_elem = root.find('.//málsheiti')
-        if bill_title_elem is None:
-            print(f'  Error: Could not find title for bill {bill_number}')
-            return
+        rounds_changed = sum(
+            stored_rounds.get(round_obj.althingi_voting_id) != tuple(getattr(round_obj, field) for field in round_fields)
+            for round_obj in round_objs
+        )
+        return (rounds_changed,) + sync_votes(bill, session, list(round_map.values()), incoming)
+
+
+def sync_votes(bill, session, round_ids, incoming):
+    """
+    Bring the stored votes of some voting rounds in line with incoming votes.
+    
+    Diffs against the stored votes and applies only the changes with one
+    bulk insert, one bulk update and one delete.
+    
+    Args:
+        round_ids: VotingRound pks the incoming votes cover
+        incoming: (round pk, MP pk) -> (vote, vote_date, althingi_voting_id)
+    
+    Returns:
+        tuple: (created, updated, deleted)
+    """
+    existing = {
+        (round_id, mp_id): (pk, (vote, stored_date, althingi_voting_id))
+        for pk, round_id, mp_id, vote, stored_date, althingi_voting_id in Vote.objects.filter(
+            voting_round_id__in=round_ids
+        ).values_list('pk', 'voting_round_id', 'mp_id', 'vote', 'vote_date', 'althingi_voting_id')
+    }
+    
+    to_create = []
+    to_update = []
+    for (round_id, mp_id), values in incoming.items():
+        vote_value, vote_date, voting_id = values
+        if (round_id, mp_id) not in existing:
+            to_create.append(Vote(
+                bill=bill,
+                mp_id=mp_id,
+                voting_round_id=round_id,
+                vote=vote_value,
+                vote_date=vote_date,
+                session=session,
+                althingi_voting_id=voting_id
+            ))
+            continue
         
-        bill_title = bill_title_elem.text
-        bill_obj, created = Bill.objects.get_or_create(
+        pk, stored = existing[(round_id, mp_id)]
+        if stored != values:
+            to_update.append(Vote(pk=pk, vote=vote_value, vote_date=vote_date, althingi_voting_id=voting_id))
+    
+    to_delete = [pk for key, (pk, _) in existing.items() if key not in incoming]
+    
+    with transaction.atomic():
+        if to_create:
+            Vote.objects.bulk_create(to_create)
+        if to_update:
+            Vote.objects.bulk_update(to_update, ['vote', 'vote_date', 'althingi_voting_id'])
+        if to_delete:
+            Vote.objects.filter(pk__in=to_delete).delete()
+    
+    return len(to_create), len(to_update), len(to_delete)
+
+
+def fetch_bill_vote_documents(session_number, bill_number, stored_ids=None, workers=1):
+    """
+    Download a bill's XML and the XML of its voting rounds that are not stored yet.
+    
+    Only network work happens here (plus reading the voting ids from the
+    bill XML); the round documents are parsed by parse_bill_votes.
+    
+    Args:
+        stored_ids: althingi_voting_ids to skip (None fetches every round)
+        workers: Number of voting rounds to fetch concurrently
+    
+    Returns:
+        dict with 'bill_number', 'title', 'voting_ids' and 'round_documents'
+        [(voting_id, XML or None)], or None if the bill could not be fetched
+    """
+    bill_details_url = f'https://www.althingi.is/altext/xml/thingmalalisti/thingmal/?lthing={session_number}&malnr={bill_number}'
+    
+    bill_response = make_request(bill_details_url)
+    if not bill_response:
+        print(f'  Error: Failed to fetch details for bill {bill_number}')
+        return None
+    
+    root = ET.fromstring(bill_response.content)
+    bill_title_elem = root.find('.//málsheiti')
+    
+    # Find all voting records for this bill, in the order they were held
+    voting_ids = [
+        record.get('atkvæðagreiðslunúmer')
+        for record in root.findall('.//atkvæðagreiðsla')
+        if record.get('atkvæðagreiðslunúmer')
+    ]
+    to_fetch = [voting_id for voting_id in voting_ids if not stored_ids or voting_id not in stored_ids]
+    
+    if workers > 1 and len(to_fetch) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            contents = list(executor.map(fetch_voting_round_document, to_fetch))
+    else:
+        contents = [fetch_voting_round_document(voting_id) for voting_id in to_fetch]
+    
+    return {
+        'bill_number': bill_number,
+        'title': bill_title_elem.text if bill_title_elem is not None else None,
+        'voting_ids': voting_ids,
+        'round_documents': list(zip(to_fetch, contents)),
+    }
+
+
+def parse_bill_votes(bill_votes):
+    """Parse the round documents from fetch_bill_vote_documents into 'rounds'"""
+    rounds = []
+    for voting_id, content in bill_votes['round_documents']:
+        if content is None:
+            continue
+        round_data = parse_voting_round(voting_id, content)
+        if round_data is not None:
+            rounds.append(round_data)
+    return {**bill_votes, 'rounds': rounds}
+
+
+def save_bill_votes(session, bill_votes, mp_map, bill_obj=None):
+    """
+    Save a bill's parsed voting rounds and update the bill's status.
+    
+    Args:
+        bill_votes: Output of parse_bill_votes
+        bill_obj: The bill, if already loaded (fetched or created otherwise)
+    """
+    bill_number = bill_votes['bill_number']
+    
+    if bill_votes['title'] is None:
+        print(f'  Error: Could not find title for bill {bill_number}')
+        return
+    
+    # Get or create the bill
+    if bill_obj is None:
+        bill_obj, _ = Bill.objects.get_or_create(
             althingi_id=bill_number,
             session=session,
             defaults={
-                'title': bill_title,
+                'title': bill_votes['title'],
                 'slug': f'{session.session_number}-{bill_number}',
                 'introduced_date': datetime.now().date(),
             }
         )
-        
-        # Find all voting records for this bill
-        voting_records = root.findall('.//atkvæðagreiðsla')
-        if not voting_records:
-            print(f'  No voting records found for bill {bill_number}')
-            return
-        
-        # Only process the LAST voting record (final vote)
-        # This is the final vote when the bill is passed or rejected
-        last_voting_record = voting_records[-1]
-        voting_id = last_voting_record.get('atkvæðagreiðslunúmer')
-        
-        if not voting_id:
-            print(f'  Error: Could not find voting ID for final vote')
-            return
-        
-        print(f'  Processing final vote (ID: {voting_id}, total votes available: {len(voting_records)})')
-        
-        votes_created_total = 0
-        
-        # Fetch the actual voting details
-        voting_details_url = f'https://www.althingi.is/altext/xml/atkvaedagreidslur/atkvaedagreidsla/?numer={voting_id}'
-        
-        voting_details_response = make_request(voting_details_url)
-        if not voting_details_response:
-            print(f'  Error: Failed to fetch voting details for ID {voting_id}')
-            return
-        
-        voting_root = ET.fromstring(voting_details_response.content)
-        
-        # Get voting date
-        date_elem = voting_root.find('.//tími')
-        if date_elem is None or not date_elem.text:
-            print(f'  Warning: Could not find date for voting session {voting_id}')
-            return
-        
-        vote_date = datetime.strptime(date_elem.text.split('T')[0], '%Y-%m-%d').date()
-        
-        # Check if we already have this voting session
-        if not force and Vote.objects.filter(bill=bill_obj, althingi_voting_id=voting_id).exists():
-            print(f'  Skipping: Voting records for ID {voting_id} already exist (use force=True to update)')
+    
+    voting_ids = bill_votes['voting_ids']
+    if not voting_ids:
+        print(f'  No voting records found for bill {bill_number}')
+        return
+    
+    if not bill_votes['round_documents']:
+        print(f'  Skipping: All {len(voting_ids)} voting rounds already exist (use force=True to update)')
+        return
+    
+    print(f'  Processing {len(bill_votes["round_documents"])} of {len(voting_ids)} voting rounds')
+    
+    rounds = bill_votes['rounds']
+    if not rounds:
+        return
+    
+    rounds_changed, created, updated, deleted = save_voting_rounds(bill_obj, session, rounds, mp_map)
+    
+    # The last round held decides the bill's status
+    old_status = bill_obj.status
+    last_round = rounds[-1]
+    if last_round['voting_id'] == voting_ids[-1] and last_round['result']:
+        if 'samþykkt' in last_round['result'].lower():
+            bill_obj.status = 'passed'
+        elif 'fellt' in last_round['result'].lower():
+            bill_obj.status = 'rejected'
+    
+    # The bill detail includes its votes, so last_update (and its ETag) moves with them
+    if bill_obj.status != old_status or rounds_changed or created or updated or deleted:
+        bill_obj.save(update_fields=['status', 'last_update'])
+    
+    print(f'  Summary: {len(rounds)} rounds, {created} votes created, {updated} updated, '
+          f'{deleted} removed for bill {bill_number}')
+
+
+def fetch_bill_voting_records(session, bill_number, force=False, mp_map=None, workers=althingi.DEFAULT_WORKERS):
+    """
+    Fetch every voting round for a specific bill
+    
+    Args:
+        force: Re-fetch rounds that are already stored
+        mp_map: Preloaded althingi_id -> MP pk map (loaded here if not given)
+        workers: Number of voting rounds to fetch concurrently
+    """
+    print(f'\nFetching voting records for bill {bill_number}...')
+    
+    if mp_map is None:
+        mp_map = load_mp_map()
+    
+    stored_ids = None
+    if not force:
+        stored_ids = set(VotingRound.objects.filter(
+            session=session, bill__althingi_id=bill_number
+        ).values_list('althingi_voting_id', flat=True))
+    
+    try:
+        bill_votes = fetch_bill_vote_documents(session.session_number, bill_number, stored_ids, workers)
+        if bill_votes is None:
             return
-        
-        # Extract the result
-        result = 'unknown'
-        result_elem = voting_root.find('.//niðurstaða')
-        if result_elem is not None and result_elem.text:
-            if 'samþykkt' in result_elem.text.lower():
-                result = 'passed'
-                bill_obj.status = 'passed'
-            elif 'fellt' in result_elem.text.lower():
-                result = 'rejected'
-                bill_obj.status = 'rejected'
-            bill_obj.save()
-        
-        # Process individual votes
-        with transaction.atomic():
-            # Delete existing votes for this bill if updating
-            Vote.objects.filter(bill=bill_obj).delete()
-            
-            # Find all MP votes
-            mp_votes = voting_root.findall('.//þingmaður')
-            
-            votes_created = 0
-            for mp_elem in mp_votes:
-                mp_id = mp_elem.get('id')
-                vote_elem = mp_elem.find('atkvæði')
-                
-                if not mp_id or vote_elem is None:
-                    continue
-                
-                vote_value = vote_elem.text
-                if not vote_value:
-                    continue
-                
-                # Map Althingi vote values to our model's values
-                vote_mapping = {
-                    'já': 'yes',
-                    'nei': 'no',
-                    'greiðir ekki atkvæði': 'abstain',
-                    'fjarverandi': 'absent',
-                    'boðaði fjarvist': 'absent'
-                }
-                
-                vote_value = vote_mapping.get(vote_value.lower(), 'abstain')
-                
-                try:
-                    mp = MP.objects.get(althingi_id=mp_id)
-                    Vote.objects.create(
-                        bill=bill_obj,
-                        mp=mp,
-                        vote=vote_value.lower(),
-                        vote_date=vote_date,
-                        session=session,
-                        althingi_voting_id=voting_id
-                    )
-                    votes_created += 1
-                except MP.DoesNotExist:
-                    name_elem = mp_elem.find('nafn')
-                    name = name_elem.text if name_elem is not None else "Unknown"
-                    print(f'  Warning: MP with ID {mp_id} ({name}) not found')
-            
-            votes_created_total = votes_created
-            print(f'  ✓ Created {votes_created} votes for final vote on {vote_date}')
-        
-        print(f'  Summary: {votes_created_total} votes created for bill {bill_number} (voting ID: {voting_id})')
-        
+        save_bill_votes(session, parse_bill_votes(bill_votes), mp_map)
+    
     except ET.ParseError as e:
         print(f'  Error: XML parsing error: {str(e)}')
     except Exception as e:
         print(f'  Error: Unexpected error: {str(e)}')
 
 
-def fetch_all_voting_records(session_number, force=False):
-    """Fetch voting records for all bills in a session"""
+def fetch_all_voting_records(session_number, force=False, checkpoint=None, workers=althingi.DEFAULT_WORKERS):
+    """
+    Fetch voting records for all bills in a session
+    
+    Runs as a fetch -> parse -> write pipeline: bill and round XML is
+    downloaded by `workers` threads, parsed by separate threads, and written
+    here in bill number order, one transaction per batch of bills.
+    
+    Within a bill only voting rounds that are not stored yet are fetched
+    (unless force), so the checkpoint only needs to track the last bill.
+    
+    Args:
+        session_number: Parliament session number
+        force: If True, refetch voting rounds that are already stored
+        checkpoint: Optional RunCheckpoint; bills up to its 'bill' cursor
+            are skipped and the cursor advances as batches are committed
+        workers: Number of bills to download concurrently
+    """
     print(f'Fetching voting records for session {session_number}...')
     
     # Get or create session (will update active status automatically)
     session = get_or_create_session(session_number, update_active_status=True)
     
     # Get the list of bills for this session
-    url = f'https://www.althingi.is/altext/xml/thingmalalisti/?lthing={session_number}'
+    bills = althingi.fetch_bill_index(session_number)
+    if bills is None:
+        print('Error: Failed to fetch bill list')
+        return
     
-    try:
-        response = make_request(url)
-        if not response:
-            print('Error: Failed to fetch bill list')
-            return
-        
-        root = ET.fromstring(response.content)
-        bills = root.findall('.//mál')
-        
-        print(f'Found {len(bills)} bills')
-        
-        bills_processed = 0
-        for bill in bills:
-            try:
-                # Extract bill number from URL
-                html_elem = bill.find('html')
-                if html_elem is None or not html_elem.text:
-                    continue
-                
-                import re
-                url_match = re.search(r'mnr=(\d+)', html_elem.text)
-                if not url_match:
+    print(f'Found {len(bills)} bills')
+    
+    bills = sorted(bills, key=lambda item: item[0])
+    resume_after = checkpoint.get('bill') if checkpoint else None
+    if resume_after is not None:
+        bills = [(bill_id, bill) for bill_id, bill in bills if bill_id > resume_after]
+        print(f'Resuming after bill {resume_after} ({len(bills)} left)')
+    
+    # Only the titles are needed from here on; let the bill elements go
+    titles = {}
+    for bill_id, bill in bills:
+        title_elem = bill.find('málsheiti')
+        titles[bill_id] = title_elem.text if title_elem is not None and title_elem.text else "Unknown title"
+    bills = list(titles)
+    
+    # Preload everything the writer needs, so the workers never touch the database
+    mp_map = load_mp_map()
+    stored_ids = None
+    if not force:
+        stored_ids = set(VotingRound.objects.filter(session=session).values_list('althingi_voting_id', flat=True))
+    bill_objs = {
+        bill.althingi_id: bill
+        for bill in Bill.objects.filter(session=session).only('pk', 'althingi_id', 'status', 'session_id')
+    }
+    
+    progress = {'done': 0, 'processed': 0, 'blocked': False}
+    
+    def write(batch):
+        saved = []
+        with transaction.atomic():
+            for bill_id, bill_votes in batch:
+                progress['done'] += 1
+                print(f'\n[{progress["done"]}/{len(bills)}] Processing bill {bill_id}: {titles[bill_id][:60]}...')
+                if bill_votes is None:
+                    saved.append((bill_id, False))
                     continue
-                
-                bill_id = url_match.group(1)
-                
-                # Get the bill title
-                title_elem = bill.find('málsheiti')
-                title = title_elem.text if title_elem is not None else "Unknown title"
-                
-                print(f'\n[{bills_processed + 1}/{len(bills)}] Processing bill {bill_id}: {title[:60]}...')
-                
-                # Process the bill
-                fetch_bill_voting_records(session, bill_id, force)
-                bills_processed += 1
-                
-                # Add delay between bills
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f'  Error processing bill: {str(e)}')
-                continue
-        
-        print(f'\n=== Summary ===')
-        print(f'Bills processed: {bills_processed}')
+                try:
+                    with transaction.atomic():
+                        save_bill_votes(session, bill_votes, mp_map, bill_objs.get(bill_id))
+                    progress['processed'] += 1
+                    saved.append((bill_id, True))
+                except Exception as e:
+                    print(f'  Error processing bill: {str(e)}')
+                    saved.append((bill_id, False))
         
-    except requests.RequestException as e:
-        print(f'Error fetching bill list: {str(e)}')
-    except ET.ParseError as e:
-        print(f'Error parsing XML: {str(e)}')
-    except Exception as e:
-        print(f'Unexpected error: {str(e)}')
+        # Stop at the first bill that was not saved, so a resumed run retries it
+        if checkpoint:
+            for bill_id, ok in saved:
+                progress['blocked'] = progress['blocked'] or not ok
+                if not progress['blocked']:
+                    checkpoint.advance('bill', bill_id)
+    
+    pipeline = Pipeline(
+        'Voting records',
+        fetch=lambda bill_id: fetch_bill_vote_documents(session_number, bill_id, stored_ids),
+        parse=lambda bill_id, bill_votes: parse_bill_votes(bill_votes) if bill_votes else None,
+        write=write,
+        fetch_workers=workers,
+    )
+    pipeline.run(bills)
+    
+    if checkpoint:
+        checkpoint.save()
+    
+    print(f'\n=== Summary ===')
+    print(f'Bills processed: {progress["processed"]}')
+    pipeline.print_report()
 
 
 if __name__ == '__main__':
@@ -264,4 +519,7 @@ if __name__ == '__main__':
         fetch_bill_voting_records(session_obj, bill_number, force=True)
     else:
         fetch_all_voting_records(session, force=False)
-
+    
+    # Refresh the dashboard rollups and serve the new data from the API
+    refresh_session_stats([session])
+    caching.bump_data_version()
@@ -0,0 +1,403 @@
+"""
+Local stand-in for the Alþingi XML API
+Serves synthetic (or archived) XML so the scrapers can be run and benchmarked offline
+
+Point the scrapers at it with ALTHINGI_API_ROOT:
+
+    python scrapers/standin_server.py --port 8765 --latency 50 --error-rate 0.01
+    ALTHINGI_API_ROOT=http://127.0.0.1:8765 python scrapers/fetch_bills.py 157
+
+Usage:
+    python standin_server.py [--port N] [--session N] [--mps N] [--bills N] [--speeches N]
+                             [--latency MS] [--error-rate P] [--archive DIR] [--seed N]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+# No django.setup() needed - only the archive reader is used from parliament
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parliament.althingi import ALTHINGI_ORIGIN, ResponseArchive
+
+
+FIRST_NAMES = ['Anna', 'Bjarni', 'Guðrún', 'Jón', 'Katrín', 'Sigurður', 'Helga', 'Ólafur', 'Þórdís', 'Einar']
+LAST_NAMES = ['Jónsdóttir', 'Benediktsson', 'Sigurðardóttir', 'Gunnarsson', 'Ólafsdóttir', 'Magnússon']
+BILL_STATUSES = ['Bíður 1. umræðu', 'Í nefnd', 'Bíður 2. umræðu', 'Samþykkt sem lög frá Alþingi']
+VOTE_VALUES = ['já', 'já', 'já', 'nei', 'greiðir ekki atkvæði', 'fjarverandi']
+INTEREST_FIELDS = ['launuðstjórnarseta', 'launaðstarf', 'tekjumyndandistarfsemi', 'gjafir', 'ferðir', 'fasteignir']
+
+
+def xml_document(body):
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n{body}'.encode('utf-8')
+
+
+class SyntheticAlthingi:
+    """
+    Deterministic synthetic data for one session, rendered as Alþingi XML.
+
+    The same arguments always produce the same documents, so repeated
+    benchmark runs are comparable.
+    """
+
+    def __init__(self, session_number=157, parties=6, mps=63, bills=200, rounds_per_bill=2,
+                 speeches=3000, topics=12, seed=0):
+        self.session_number = session_number
+        self.start_date = date(2025, 9, 9)
+        rng = random.Random(seed)
+
+        self.party_ids = list(range(1, parties + 1))
+        self.mp_ids = list(range(1000, 1000 + mps))
+        self.mp_party = {mp_id: rng.choice(self.party_ids) for mp_id in self.mp_ids}
+        self.mp_names = {
+            mp_id: f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {mp_id}' for mp_id in self.mp_ids
+        }
+
+        self.bill_numbers = list(range(1, bills + 1))
+        self.bill_sponsors = {
+            n: rng.sample(self.mp_ids, min(len(self.mp_ids), rng.randint(1, 4))) for n in self.bill_numbers
+        }
+        self.bill_status = {n: rng.choice(BILL_STATUSES) for n in self.bill_numbers}
+        self.bill_rounds = {}
+        voting_id = 70000
+        for n in self.bill_numbers:
+            rounds = []
+            for _ in range(rng.randint(0, rounds_per_bill)):
+                voting_id += 1
+                rounds.append(voting_id)
+            self.bill_rounds[n] = rounds
+        self.round_bill = {v: n for n, rounds in self.bill_rounds.items() for v in rounds}
+        self.round_seed = seed
+
+        self.topic_ids = list(range(1, topics + 1))
+        self.topic_bills = {t: [n for n in self.bill_numbers if n % len(self.topic_ids) == t - 1] for t in self.topic_ids}
+
+        self.speeches = []
+        for i in range(speeches):
+            started = datetime.combine(self.start_date, datetime.min.time()) + timedelta(minutes=7 * i)
+            self.speeches.append({
+                'mp_id': rng.choice(self.mp_ids),
+                'bill_number': rng.choice(self.bill_numbers),
+                'start': started,
+                'end': started + timedelta(seconds=rng.randint(60, 900)),
+                'type': rng.choice(['ræða', 'andsvar', 'svar']),
+            })
+
+    def _date(self, offset_days=0):
+        return (self.start_date + timedelta(days=offset_days)).strftime('%d.%m.%Y')
+
+    def _bill_title(self, bill_number):
+        return f'Frumvarp til laga um mál {bill_number}'
+
+    def sessions(self, query):
+        return xml_document(
+            f'<löggjafarþing><þing númer="{self.session_number}">'
+            f'<þingsetning>{self._date()}</þingsetning></þing></löggjafarþing>'
+        )
+
+    def current_session(self, query):
+        return xml_document(f'<löggjafarþing><þing númer="{self.session_number}"/></löggjafarþing>')
+
+    def parties(self, query):
+        items = ''.join(
+            f'<þingflokkur id="{p}"><heiti>Þingflokkur {p}</heiti>'
+            f'<skammstafanir><stuttskammstöfun>F{p}</stuttskammstöfun></skammstafanir></þingflokkur>'
+            for p in self.party_ids
+        )
+        return xml_document(f'<þingflokkar>{items}</þingflokkar>')
+
+    def mps(self, query):
+        items = ''.join(
+            f'<þingmaður id="{mp_id}"><nafn>{escape(self.mp_names[mp_id])}</nafn></þingmaður>'
+            for mp_id in self.mp_ids
+        )
+        return xml_document(f'<þingmannalisti>{items}</þingmannalisti>')
+
+    def mp_detail(self, query):
+        mp_id = int(query['nr'])
+        if mp_id not in self.mp_party:
+            return None
+        return xml_document(
+            f'<þingmaður id="{mp_id}"><nafn>{escape(self.mp_names[mp_id])}</nafn>'
+            f'<fæðingardagur>01.01.{1950 + mp_id % 50}</fæðingardagur>'
+            f'<netfang><nafn>mp{mp_id}</nafn><lén>althingi.is</lén></netfang></þingmaður>'
+        )
+
+    def mp_biography(self, query):
+        mp_id = int(query['nr'])
+        return xml_document(f'<þingmaður id="{mp_id}"><lífshlaup>Þingmaður {mp_id} frá {self._date()}.</lífshlaup></þingmaður>')
+
+    def mp_seats(self, query):
+        mp_id = int(query['nr'])
+        party_id = self.mp_party.get(mp_id)
+        if party_id is None:
+            return None
+        return xml_document(
+            f'<þingmaður id="{mp_id}"><þingsetur><þingseta><þing>{self.session_number}</þing>'
+            f'<þingflokkur id="{party_id}">Þingflokkur {party_id}</þingflokkur>'
+            f'<kjördæmi id="{mp_id % 6 + 1}">Kjördæmi {mp_id % 6 + 1}</kjördæmi>'
+            f'<tímabil><inn>{self._date()}</inn></tímabil></þingseta></þingsetur></þingmaður>'
+        )
+
+    def mp_interests(self, query):
+        mp_id = int(query['nr'])
+        fields = ''.join(
+            f'<{field}><svar>{"Engin" if (mp_id + i) % 3 else f"Skráning {mp_id}"}</svar></{field}>'
+            for i, field in enumerate(INTEREST_FIELDS)
+        )
+        return xml_document(f'<hagsmunaskráning>{fields}</hagsmunaskráning>')
+
+    def _speech(self, speech, with_speaker):
+        speaker = f'<ræðumaður id="{speech["mp_id"]}"><nafn>{escape(self.mp_names[speech["mp_id"]])}</nafn></ræðumaður>' if with_speaker else ''
+        return (
+            f'<ræða>{speaker}<löggjafarþing>{self.session_number}</löggjafarþing>'
+            f'<dagur>{speech["start"].strftime("%d.%m.%Y")}</dagur>'
+            f'<ræðahófst>{speech["start"].isoformat()}</ræðahófst><ræðulauk>{speech["end"].isoformat()}</ræðulauk>'
+            f'<tegundræðu>{speech["type"]}</tegundræðu>'
+            f'<mál löggjafarþing="{self.session_number}" málsnúmer="{speech["bill_number"]}">'
+            f'<málsnúmer>{speech["bill_number"]}</málsnúmer><málsheiti>{self._bill_title(speech["bill_number"])}</málsheiti></mál>'
+            f'<slóðir><xml>{ALTHINGI_ORIGIN}/altext/xml/raedur/?start={speech["start"].isoformat()}</xml></slóðir></ræða>'
+        )
+
+    def mp_speeches(self, query):
+        mp_id = int(query['nr'])
+        items = ''.join(self._speech(s, False) for s in self.speeches if s['mp_id'] == mp_id)
+        return xml_document(f'<ræðurþingmanns>{items}</ræðurþingmanns>')
+
+    def speech_list(self, query):
+        items = ''.join(self._speech(s, True) for s in self.speeches)
+        return xml_document(f'<ræðulisti>{items}</ræðulisti>')
+
+    def transcript(self, query):
+        started = datetime.fromisoformat(query['start'])
+        rng = random.Random(f'{self.round_seed}-{query["start"]}')
+        words = ['forseti', 'frumvarp', 'nefnd', 'ráðherra', 'lög', 'umræða', 'virðulegi', 'málið', 'þingið', 'tillaga']
+        paragraphs = ''.join(
+            f'<mgr>{" ".join(rng.choice(words) for _ in range(rng.randint(20, 80)))}.</mgr>'
+            for _ in range(rng.randint(2, 8))
+        )
+        return xml_document(
+            f'<ræða><umsýsla><lið>{started.strftime("%d.%m.%Y")}</lið></umsýsla>'
+            f'<ræðutexti><mgr>Virðulegi forseti.</mgr>{paragraphs}</ræðutexti></ræða>'
+        )
+
+    def bill_list(self, query):
+        items = ''.join(
+            f'<mál málsnúmer="{n}" þingnúmer="{self.session_number}"><málsheiti>{self._bill_title(n)}</málsheiti>'
+            f'<html>https://www.althingi.is/thingstorf/thingmalalistar-eftir-thingum/ferill/?ltg={self.session_number}&amp;mnr={n}</html></mál>'
+            for n in self.bill_numbers
+        )
+        return xml_document(f'<málaskrá>{items}</málaskrá>')
+
+    def _round_time(self, voting_id):
+        return datetime.combine(self.start_date, datetime.min.time()) + timedelta(hours=voting_id - 70000)
+
+    def bill(self, query):
+        n = int(query['malnr'])
+        if n not in self.bill_sponsors:
+            return xml_document('<þingmál/>')
+        rounds = ''.join(
+            f'<atkvæðagreiðsla atkvæðagreiðslunúmer="{v}"><tími>{self._round_time(v).isoformat()}</tími></atkvæðagreiðsla>'
+            for v in self.bill_rounds[n]
+        )
+        return xml_document(
+            f'<þingmál><mál málsnúmer="{n}"><málsheiti>{self._bill_title(n)}</málsheiti>'
+            f'<málstegund><heiti>Frumvarp til laga</heiti></málstegund><staðamáls>{self.bill_status[n]}</staðamáls></mál>'
+            f'<þingskjöl><þingskjal skjalsnúmer="{1000 + n}"><útbýting>{self.start_date.isoformat()} 12:00</útbýting>'
+            f'<skjalategund>{"stjórnarfrumvarp" if n % 2 else "frumvarp"}</skjalategund></þingskjal></þingskjöl>'
+            f'<atkvæðagreiðslur>{rounds}</atkvæðagreiðslur></þingmál>'
+        )
+
+    def bill_document(self, query):
+        n = int(query['skjalnr']) - 1000
+        sponsors = ''.join(f'<flutningsmaður id="{mp_id}"/>' for mp_id in self.bill_sponsors.get(n, []))
+        return xml_document(f'<þingskjal><þingskjal><flutningsmenn>{sponsors}</flutningsmenn></þingskjal></þingskjal>')
+
+    def voting_round(self, query):
+        voting_id = int(query['numer'])
+        if voting_id not in self.round_bill:
+            return None
+        rng = random.Random(f'{self.round_seed}-{voting_id}')
+        voters = ''.join(
+            f'<þingmaður id="{mp_id}"><nafn>{escape(self.mp_names[mp_id])}</nafn><atkvæði>{rng.choice(VOTE_VALUES)}</atkvæði></þingmaður>'
+            for mp_id in self.mp_ids
+        )
+        return xml_document(
+            f'<atkvæðagreiðsla atkvæðagreiðslunúmer="{voting_id}"><tími>{self._round_time(voting_id).isoformat()}</tími>'
+            f'<tegund>Frumvarpið í heild</tegund><niðurstaða>samþykkt</niðurstaða>'
+            f'<atkvæðaskrá>{voters}</atkvæðaskrá></atkvæðagreiðsla>'
+        )
+
+    def topics(self, query):
+        items = ''.join(
+            f'<efnisflokkur id="{t}"><heiti>Efnisflokkur {t}</heiti><lýsing>Lýsing {t}</lýsing></efnisflokkur>'
+            for t in self.topic_ids
+        )
+        return xml_document(f'<efnisflokkar><yfirflokkur id="1"><heiti>Yfirflokkur</heiti>{items}</yfirflokkur></efnisflokkar>')
+
+    def topic_bills_list(self, query):
+        t = int(query['efnisflokkur'])
+        bills = ''.join(
+            f'<mál málsnúmer="{n}" þingnúmer="{self.session_number}"/>' for n in self.topic_bills.get(t, [])
+        )
+        return xml_document(
+            f'<efnisflokkar><yfirflokkur id="1"><efnisflokkur id="{t}"><málalisti>{bills}</málalisti>'
+            f'</efnisflokkur></yfirflokkur></efnisflokkar>'
+        )
+
+    ROUTES = {
+        '/altext/xml/loggjafarthing/': 'sessions',
+        '/altext/xml/loggjafarthing/yfirstandandi/': 'current_session',
+        '/altext/xml/thingflokkar/': 'parties',
+        '/altext/xml/thingmenn/': 'mps',
+        '/altext/xml/thingmenn/thingmadur/': 'mp_detail',
+        '/altext/xml/thingmenn/thingmadur/lifshlaup/': 'mp_biography',
+        '/altext/xml/thingmenn/thingmadur/thingseta/': 'mp_seats',
+        '/altext/xml/thingmenn/thingmadur/hagsmunir/': 'mp_interests',
+        '/altext/xml/thingmenn/thingmadur/raedur/': 'mp_speeches',
+        '/altext/xml/raedulisti/': 'speech_list',
+        '/altext/xml/raedur/': 'transcript',
+        '/altext/xml/thingmalalisti/': 'bill_list',
+        '/altext/xml/thingmalalisti/thingmal/': 'bill',
+        '/altext/xml/thingskjol/thingskjal/': 'bill_document',
+        '/altext/xml/atkvaedagreidslur/atkvaedagreidsla/': 'voting_round',
+        '/altext/xml/efnisflokkar/': 'topics',
+        '/altext/xml/efnisflokkar/efnisflokkur/': 'topic_bills_list',
+    }
+
+    def document(self, path, query):
+        """Return the XML for a request path and query dict, or None if there is none."""
+        handler = self.ROUTES.get(path)
+        if handler is None:
+            return None
+        try:
+            return getattr(self, handler)(query)
+        except (KeyError, ValueError):
+            return None
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    HTTP server answering Alþingi API paths from synthetic data or an archive.
+
+    Args:
+        data: SyntheticAlthingi used for paths not found in the archive
+        archive: Optional ResponseArchive of recorded documents, served first
+        latency: Seconds added to every response
+        error_rate: Fraction of requests answered with a 503
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, data=None, archive=None, latency=0.0, error_rate=0.0, seed=0):
+        super().__init__(address, StandinHandler)
+        self.data = data
+        self.archive = archive
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def root(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.errors += 1
+                return True
+        return False
+
+    def lookup(self, raw_path):
+        if self.archive is not None:
+            body = self.archive.lookup(ALTHINGI_ORIGIN + raw_path)
+            if body is not None:
+                return body
+        if self.data is not None:
+            parts = urlsplit(raw_path)
+            query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            return self.data.document(parts.path, query)
+        return None
+
+    def start(self):
+        """Serve in a daemon thread and return self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.should_fail():
+            self._send(503, b'Service Unavailable')
+            return
+
+        body = server.lookup(self.path)
+        if body is None:
+            self._send(404, b'Not Found')
+        else:
+            self._send(200, body, 'text/xml; charset=utf-8')
+
+    def _send(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_option(argv, name, default, cast=int):
+    """Read `--name VALUE` from argv"""
+    if name in argv:
+        index = argv.index(name)
+        if index + 1 < len(argv):
+            return cast(argv[index + 1])
+    return default
+
+
+if __name__ == '__main__':
+    argv = sys.argv[1:]
+    if '--help' in argv or '-h' in argv:
+        print(__doc__)
+        sys.exit(0)
+
+    data = SyntheticAlthingi(
+        session_number=parse_option(argv, '--session', 157),
+        mps=parse_option(argv, '--mps', 63),
+        bills=parse_option(argv, '--bills', 200),
+        speeches=parse_option(argv, '--speeches', 3000),
+        seed=parse_option(argv, '--seed', 0),
+    )
+    archive_dir = parse_option(argv, '--archive', None, str)
+    server = StandinServer(
+        ('127.0.0.1', parse_option(argv, '--port', 8765)),
+        data=data,
+        archive=ResponseArchive(archive_dir) if archive_dir else None,
+        latency=parse_option(argv, '--latency', 0, float) / 1000,
+        error_rate=parse_option(argv, '--error-rate', 0.0, float),
+    )
+    print(f'Serving the Alþingi stand-in on {server.root} (Ctrl+C to stop)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass